@@ -1,11 +1,12 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
-from auth import create_authenticator
-import yaml
+from auth import create_authenticator, get_user_manager
+from session_tokens import LOGOUT_HELP, forget_session, get_session_tokens, remember_session, restore_session
+from portfolio import MONEY_COLUMNS, Portfolio, make_stock
+from charts import dividend_heatmap, dividend_stacked_bar
 
-# 인증 관리자 생성
-authenticator, user_manager = create_authenticator()
+# 사용자 관리자 (프로세스 단위로 캐시, 로그인 화면에서만 config.yaml 변경 확인)
+user_manager = get_user_manager(reload=False)
 
 # 앱 제목 설정
 st.title('배당 손익 계산기')
@@ -20,8 +21,17 @@ if 'name' not in st.session_state:
 if 'logout' not in st.session_state:
     st.session_state.logout = False
 
+# URL의 서명 토큰으로 로그인 상태 복원 (인증 관리자를 만들지 않고 사용자 레코드의 세션 세대만 확인)
+claims = restore_session(get_session_tokens(), user_manager.get_session_generation)
+if claims is not None and st.session_state.authentication_status is not True:
+    st.session_state.authentication_status = True
+    st.session_state.username = claims['u']
+    st.session_state.name = claims['n']
+
 # 로그인 섹션
 if st.session_state.authentication_status is not True:
+    user_manager.reload_if_changed()
+    authenticator, user_manager = create_authenticator(user_manager)
     tab1, tab2 = st.tabs(["로그인", "회원가입"])
     
     with tab1:
@@ -38,6 +48,7 @@ if st.session_state.authentication_status is not True:
             st.session_state.authentication_status = authentication_status
             st.session_state.username = username
             st.session_state.name = name
+            remember_session(get_session_tokens(), username, name, user_manager.get_session_generation(username))
             st.experimental_rerun()
     
     with tab2:
@@ -68,8 +79,13 @@ if st.session_state.authentication_status is not True:
 else:
     st.write(f'{st.session_state.name}님 환영합니다!')
     
-    # 로그아웃 버튼
-    if authenticator.logout('로그아웃', 'main', key='unique_key'):
+    # 로그아웃 버튼 (streamlit-authenticator 쿠키도 지워야 하므로 누른 경우에만 인증 관리자 생성)
+    if st.button('로그아웃', key='unique_key', help=LOGOUT_HELP):
+        authenticator, _ = create_authenticator(user_manager)
+        authenticator.cookie_manager.delete(authenticator.cookie_name)
+        # 세션 세대를 올려 복사해 둔 URL의 토큰도 쓸 수 없게 함
+        user_manager.bump_session_generation(st.session_state.username)
+        forget_session()
         st.session_state.authentication_status = None
         st.session_state.username = None
         st.session_state.name = None
@@ -81,6 +97,7 @@ else:
     # 세션 상태 초기화
     if 'stocks' not in st.session_state:
         # 사용자의 저장된 종목 정보 로드
+        user_manager.reload_if_changed()
         st.session_state.stocks = user_manager.get_user_stocks(st.session_state.username)
     
     # 종목 추가 폼
@@ -126,26 +143,8 @@ else:
             elif current_price <= 0:
                 st.error('현재 주가는 0보다 커야 합니다.')
             else:
-                # 계산 수행
-                total_investment = quantity * purchase_price
-                current_value = quantity * current_price
-                total_dividend = sum(monthly_dividends.values())
-                actual_profit_loss = current_value + total_dividend - total_investment
-                profit_rate = (actual_profit_loss / total_investment * 100) if total_investment > 0 else 0
-                
-                # 종목 정보 저장
-                stock_info = {
-                    '종목명': stock_name,
-                    '보유 수량': quantity,
-                    '매수 단가': purchase_price,
-                    '현재 주가': current_price,
-                    '총 투자금': total_investment,
-                    '현재 평가금': current_value,
-                    '누적 배당금': total_dividend,
-                    '실제 손익': actual_profit_loss,
-                    '수익률 (%)': profit_rate,
-                    '월별 배당금': monthly_dividends
-                }
+                # 종목 정보 저장 (입력 값만 저장, 파생 값은 포트폴리오에서 계산)
+                stock_info = make_stock(stock_name, quantity, purchase_price, current_price, monthly_dividends)
                 
                 # 세션에 종목 추가
                 st.session_state.stocks.append(stock_info)
@@ -171,32 +170,23 @@ else:
     if st.session_state.stocks:
         st.subheader('종목별 손익 현황')
         
-        # 테이블용 데이터 준비
-        table_data = []
-        for stock in st.session_state.stocks:
-            row = {
-                '종목명': stock['종목명'],
-                '보유 수량': stock['보유 수량'],
-                '매수 단가': f"{stock['매수 단가']:,.2f}",
-                '현재 주가': f"{stock['현재 주가']:,.2f}",
-                '총 투자금': f"{stock['총 투자금']:,.2f}",
-                '현재 평가금': f"{stock['현재 평가금']:,.2f}",
-                '누적 배당금': f"{stock['누적 배당금']:,.2f}",
-                '실제 손익': f"{stock['실제 손익']:,.2f}",
-                '수익률 (%)': f"{stock['수익률 (%)']:,.2f}%"
-            }
-            table_data.append(row)
-        
-        # 데이터프레임 생성 및 표시
-        df = pd.DataFrame(table_data)
+        # 테이블용 데이터 준비 (파생 값과 합계를 한 번에 계산)
+        portfolio = Portfolio.from_stocks(st.session_state.stocks)
+        df = portfolio.frame()
+        for column in MONEY_COLUMNS:
+            df[column] = [f"{value:,.2f}" for value in df[column]]
+        df['수익률 (%)'] = [f"{value:,.2f}%" for value in df['수익률 (%)']]
+        
+        # 데이터프레임 표시
         st.dataframe(df, use_container_width=True)
         
         # 전체 합계 계산
-        total_investment = sum(stock['총 투자금'] for stock in st.session_state.stocks)
-        total_current_value = sum(stock['현재 평가금'] for stock in st.session_state.stocks)
-        total_dividend = sum(stock['누적 배당금'] for stock in st.session_state.stocks)
-        total_profit_loss = sum(stock['실제 손익'] for stock in st.session_state.stocks)
-        total_profit_rate = (total_profit_loss / total_investment * 100) if total_investment > 0 else 0
+        totals = portfolio.totals()
+        total_investment = totals['총 투자금']
+        total_current_value = totals['현재 평가금']
+        total_dividend = totals['누적 배당금']
+        total_profit_loss = totals['실제 손익']
+        total_profit_rate = totals['수익률 (%)']
         
         # 합계 테이블 표시
         st.subheader('전체 합계')
@@ -213,20 +203,19 @@ else:
         summary_df = pd.DataFrame(summary_data)
         st.dataframe(summary_df, use_container_width=True)
         
-        # 종목별 월간 배당금 상세 내역
-        st.subheader('종목별 월간 배당금 상세')
+        # 종목별 월간 배당금 (전체 종목을 차트 하나로 표시)
+        st.subheader('종목별 월간 배당금')
         
-        for i, stock in enumerate(st.session_state.stocks):
-            st.write(f"{i+1}. {stock['종목명']}")
-            
-            monthly_data = {'월': list(stock['월별 배당금'].keys()),
-                           '배당금': [f"{amount:,.2f}" for amount in stock['월별 배당금'].values()]}
-            monthly_df = pd.DataFrame(monthly_data)
-            
-            # 월별 배당금 차트 표시
-            st.bar_chart(data=pd.DataFrame({
-                '월': monthly_data['월'],
-                '배당금': list(stock['월별 배당금'].values())
-            }).set_index('월'))
+        col1, col2 = st.columns([1, 2])
+        with col1:
+            chart_type = st.radio('차트 형식', ['히트맵', '누적 막대'], horizontal=True)
+        with col2:
+            # 연간 배당금 상위 종목만 따로 표시하고 나머지는 '기타'로 합산
+            top_n = st.slider('표시할 종목 수 (연간 배당금 상위)', min_value=1,
+                              max_value=len(portfolio), value=min(20, len(portfolio))) if len(portfolio) > 1 else 1
+        
+        pivot = portfolio.dividend_pivot(top_n)
+        chart = dividend_heatmap(pivot) if chart_type == '히트맵' else dividend_stacked_bar(pivot)
+        st.altair_chart(chart, use_container_width=True)
     else:
         st.info('종목을 추가하면 여기에 결과가 표시됩니다.') 
\ No newline at end of file
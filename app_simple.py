@@ -1,20 +1,155 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
-from simple_auth import SimpleUserManager, login_user, logout_user, register_form
+from datetime import date
+from simple_auth import get_user_manager, get_save_queue, login_user, logout_user, register_form, restore_login
+from session_tokens import LOGOUT_HELP
 import os
 
-# 사용자 관리자 생성
-user_manager = SimpleUserManager()
+# 사용자 관리자 (프로세스 단위로 캐시, 로그인/종목 로드 직전에만 파일 변경 확인)
+user_manager = get_user_manager(reload=False)
+# 종목 저장 대기열 (사용자별로 모아서 백그라운드 저장)
+save_queue = get_save_queue()
+
+@st.cache_resource
+def get_render_cache():
+    # 대시보드/상세 정보 표 캐시 (프로세스 단위로 모든 세션이 공유)
+    return RenderCache(maxsize=128)
+
+@st.cache_resource
+def get_fx_provider():
+    # 환율 데이터 (YIELDNOTE_FX_SOURCE: .csv/.db 날짜별 환율 표 또는 .json 피드 파일, 없으면 수동 입력만 사용)
+    source = os.environ.get('YIELDNOTE_FX_SOURCE')
+    return make_provider(source) if source else None
+
+@st.cache_resource
+def get_price_store():
+    # 시세 저장소 (YIELDNOTE_PRICE_STORE: 디렉토리, 없으면 현재 주가는 직접 입력만 사용)
+    directory = os.environ.get('YIELDNOTE_PRICE_STORE')
+    return PriceStore(directory) if directory else None
+
+def calculate_totals(portfolio):
+    # 포트폴리오 합계 계산 (SQLite 저장소는 저장 대기 중인 변경이 없을 때 SQL 집계로 계산)
+    # USD가 아닌 종목이 있으면 None (뷰 모델이 종목별로 환산한 뒤 합산)
+    if portfolio.single_currency != 'USD':
+        return None
+    if hasattr(user_manager, 'get_portfolio_totals') and not save_queue.has_pending(st.session_state.username):
+        totals = user_manager.get_portfolio_totals(st.session_state.username)
+    else:
+        totals = portfolio.totals()
+    return (totals['총 투자금'], totals['현재 평가금'], totals['누적 배당금'],
+            totals['실제 손익'], totals['수익률 (%)'])
+
+def current_portfolio():
+    # 종목 목록 버전이 바뀐 경우에만 포트폴리오를 다시 만들고, 그 외 rerun은 세션에 보관한 것을 재사용
+    portfolio = st.session_state.get('portfolio')
+    if portfolio is None or portfolio.version != st.session_state.stocks_version:
+        portfolio = Portfolio.from_holdings(st.session_state.stocks, version=st.session_state.stocks_version)
+        st.session_state.portfolio = portfolio
+    return portfolio
+
+def current_rates():
+    # 교차 환율 (달러-원 환율 입력이나 환율 데이터가 바뀐 경우에만 다시 만듦)
+    fx_version = fx_provider.version if fx_provider is not None else None
+    key = (st.session_state.exchange_rate, fx_version)
+    if st.session_state.get('cross_rates_key') != key:
+        st.session_state.cross_rates = CrossRates.from_provider(fx_provider, st.session_state.exchange_rate)
+        st.session_state.cross_rates_key = key
+    return st.session_state.cross_rates
+
+def trade_rates(portfolio):
+    # 표시 통화별 종목 매수일 환율 조회 함수 (매수일이 있는 종목이 없거나 환율 데이터가 없으면 None)
+    if fx_provider is None or np.isnat(portfolio.purchase_dates).all():
+        return None
+    return lambda target: trade_date_rates(fx_provider, portfolio.currencies, portfolio.purchase_dates, target)
+
+def current_view(portfolio):
+    # 포트폴리오 지문과 환율이 같으면 이전에 계산한 화면 값을 재사용 (모든 세션이 공유)
+    rates = current_rates()
+    fx_version = fx_provider.version if fx_provider is not None else None
+    return render_cache.get_or_build(
+        (portfolio.fingerprint, rates.key, fx_version),
+        lambda: PortfolioView(portfolio, rates, calculate_totals(portfolio), trade_rates(portfolio))
+    )
+
+def schedule_inputs(schedule, key):
+    # 배당 일정 입력 (주당 배당금이 0이거나 기준 배당락일이 없으면 None)
+    schedule = schedule or {}
+    with st.expander('배당 일정 (선택)', expanded=bool(schedule)):
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            per_share = st.number_input('주당 배당금', min_value=0.0, value=schedule.get('주당 배당금', 0.0),
+                                        step=0.01, key=f'{key}_per_share')
+        with col2:
+            frequencies = list(SCHEDULE_FREQUENCIES)
+            frequency = st.selectbox('배당 주기', frequencies, index=frequencies.index(schedule.get('주기', '분기')),
+                                     key=f'{key}_frequency')
+        with col3:
+            ex_date = st.date_input('기준 배당락일', value=date.fromisoformat(schedule['배당락일']) if schedule else None,
+                                    min_value=date(1990, 1, 1), key=f'{key}_ex_date')
+        with col4:
+            pay_lag = st.number_input('지급일 간격 (일)', min_value=0, max_value=120,
+                                      value=schedule.get('지급일 간격', DEFAULT_PAY_LAG), step=1, key=f'{key}_pay_lag')
+        st.caption("일정을 입력하고 월별 배당금을 모두 0으로 두면 올해 일정(주당 배당금 × 보유 수량)으로 채웁니다.")
+        # 특별 배당이나 배당금 변경처럼 일정과 다른 실제 지급은 배당 내역으로 기록
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            event_ex_date = st.date_input('배당 내역 배당락일', value=None, min_value=date(1990, 1, 1),
+                                          key=f'{key}_event_ex_date')
+        with col2:
+            event_per_share = st.number_input('배당 내역 주당 배당금', min_value=0.0, value=0.0, step=0.01,
+                                              key=f'{key}_event_per_share')
+        with col3:
+            event_pay_date = st.date_input('배당 내역 지급일', value=None, min_value=date(1990, 1, 1),
+                                           key=f'{key}_event_pay_date')
+        events = schedule.get('배당 내역', [])
+        if events:
+            st.caption(f"배당 내역 {len(events)}건 ({events[0]['배당락일']} ~ {events[-1]['배당락일']}): "
+                       "이 기간은 내역을, 그 밖의 기간은 반복 일정을 씁니다.")
+    if per_share <= 0 or ex_date is None:
+        return None
+    updated = make_schedule(per_share, frequency, ex_date.isoformat(), pay_lag, events)
+    if event_ex_date is not None and event_per_share > 0:
+        updated = add_dividend_event(updated, event_ex_date.isoformat(), event_per_share,
+                                     event_pay_date.isoformat() if event_pay_date else None)
+    return updated
+
+def scheduled_dividends(dividends, schedule, quantity, purchase_date):
+    # 월별 배당금 입력이 비어 있고 배당 일정이 있으면 올해 일정으로 채움
+    if schedule is None or any(dividends):
+        return dividends
+    filled = schedule_monthly_dividends(schedule, quantity, date.today().year, purchase_date)
+    return [filled[month] for month in MONTHS]
+
+def uploaded_import(uploaded, default_currency):
+    # 같은 파일과 기본 통화면 이전 가져오기 결과를 재사용 (rerun마다 파일을 다시 읽지 않음)
+    key = (uploaded.file_id, default_currency)
+    if st.session_state.get('import_key') != key:
+        st.session_state.import_result = import_holdings(uploaded, uploaded.name, default_currency)
+        st.session_state.import_key = key
+    return st.session_state.import_result
+
+def sync_store_prices():
+    # 시세 저장소가 갱신되었으면 세션 종목의 현재 주가도 최신 종가로 맞춤
+    # (세션이 나중에 저장할 때 일괄 갱신된 주가를 이전 값으로 덮어쓰지 않도록)
+    if price_store is None:
+        return
+    price_store.reload_if_changed()
+    if st.session_state.get('price_version') == price_store.version:
+        return
+    st.session_state.price_version = price_store.version
+    if apply_prices(st.session_state.stocks, price_store):
+        st.session_state.stocks_version += 1
+
+# save_stocks() 성공 메시지에 붙이는 안내 (대기열에 넣은 것이지 아직 저장된 것은 아님)
+QUEUED_NOTICE = "변경 내용은 저장 대기열에 들어갔으며 잠시 후 저장됩니다."
+
+def save_stocks():
+    # 종목 목록을 바꾼 뒤 호출: 버전을 올리고 저장 대기열에 넣음 (True는 대기열에 들어갔다는 뜻)
+    st.session_state.stocks_version += 1
+    return save_queue.save_user_stocks(st.session_state.username, holdings_to_dicts(st.session_state.stocks))
 
 # 앱 제목 설정
 st.title('배당 손익 계산기')
 
-# 추가: 앱 로드 시 데이터 파일 존재 여부 확인
-if not os.path.exists('./users.json'):
-    st.warning("사용자 데이터 파일이 누락되었습니다. 백업에서 복원을 시도합니다.")
-    # SimpleUserManager 초기화 과정에서 자동으로 복원 시도
-
 # 인증 관련 상태 초기화
 if 'authenticated' not in st.session_state:
     st.session_state.authenticated = False
@@ -22,16 +157,24 @@ if 'username' not in st.session_state:
     st.session_state.username = None
 if 'name' not in st.session_state:
     st.session_state.name = None
-# 환율 상태 초기화
-if 'exchange_rate' not in st.session_state:
-    st.session_state.exchange_rate = 1350.0  # 기본 환율 설정
+# URL의 서명 토큰으로 로그인 상태 복원 (새로고침해도 사용자 레코드의 세션 세대만 확인)
+restore_login(user_manager)
 
 # 로그인 섹션
 if not st.session_state.authenticated:
+    # 추가: 로그인 화면에서 데이터 파일 존재 여부 확인
+    if not os.path.exists('./users.json'):
+        st.warning("사용자 데이터 파일이 누락되었습니다. 백업에서 복원을 시도합니다.")
+        # SimpleUserManager 초기화 과정에서 자동으로 복원 시도
+    
+    if 'logout_notice' in st.session_state:
+        st.error(st.session_state.pop('logout_notice'))
+    
     tab1, tab2 = st.tabs(["로그인", "회원가입"])
     
     with tab1:
         st.subheader('로그인')
+        user_manager.reload_if_changed()
         login_successful = login_user(user_manager)
         
         if login_successful:
@@ -43,11 +186,41 @@ if not st.session_state.authenticated:
 
 # 로그인 성공 시 앱 메인 화면
 else:
+    # 계산/화면 모듈과 환율/시세 데이터는 로그인한 뒤에만 불러옴 (로그인 화면은 Streamlit과 사용자 저장소만 사용)
+    import numpy as np
+    from portfolio import MONTHS, Portfolio
+    from stock_schema import Holding, holdings_from_dicts, holdings_to_dicts
+    from render_cache import RenderCache
+    from currency import CURRENCIES, CURRENCY_FORMATS, CrossRates
+    from view_model import PortfolioView, currency_views
+    from fx import make_provider, trade_date_rates
+    from price_store import PriceStore, apply_prices
+    from projection import MAX_YEARS, scenario_choices
+    from holding_import import import_holdings
+    from ledger import COST_METHODS, TRANSACTION_TYPES, Ledger
+    from dividend_calendar import (DEFAULT_PAY_LAG, SCHEDULE_FREQUENCIES, add_dividend_event, make_schedule,
+                                   schedule_monthly_dividends)
+    from pagination import PAGE_SIZES, paginate
+    
+    render_cache = get_render_cache()
+    fx_provider = get_fx_provider()
+    price_store = get_price_store()
+    
+    # 환율 상태 초기화
+    if 'exchange_rate' not in st.session_state:
+        # 기본 환율 설정 (환율 데이터가 있으면 현재 환율 사용)
+        spot_rate = fx_provider.spot('USD', 'KRW') if fx_provider is not None else None
+        st.session_state.exchange_rate = float(spot_rate) if spot_rate else 1350.0
+    
     st.write(f'{st.session_state.name}님 환영합니다!')
     
     # 로그아웃 버튼
-    if st.button('로그아웃'):
-        logout_user()
+    if st.button('로그아웃', help=LOGOUT_HELP):
+        # 대기 중인 종목 저장을 먼저 반영 (실패하면 로그인 화면에 알림)
+        if not save_queue.flush(st.session_state.username):
+            st.session_state.logout_notice = ("종목 정보를 저장하지 못했습니다. 다시 로그인해 종목이 저장되었는지 "
+                                              "확인해주세요.")
+        logout_user(user_manager)
         st.rerun()
     
     st.write('종목별 투자 정보와 월별 배당금을 입력하여 손익을 계산해보세요.')
@@ -64,19 +237,40 @@ else:
     with col2:
         st.info(f"1 USD = {st.session_state.exchange_rate:.1f} KRW")
     
+    # 표시 통화 (USD와 함께 표시할 보조 통화, 바꿔도 종목별 환산은 다시 하지 않음)
+    display_currency = st.selectbox('보조 표시 통화', [code for code in CURRENCIES if code != 'USD'],
+                                    key='display_currency')
+    currencies = ('USD', display_currency)
+    
     # 세션 상태 초기화
     if 'stocks' not in st.session_state:
-        # 사용자의 저장된 종목 정보 로드
-        st.session_state.stocks = user_manager.get_user_stocks(st.session_state.username)
-        # 기존 데이터의 보유 수량을 실수형으로 변환
-        for stock in st.session_state.stocks:
-            stock['보유 수량'] = float(stock['보유 수량'])
+        # 사용자의 저장된 종목 정보 로드 (세션에는 Holding 레코드로 보관)
+        user_manager.reload_if_changed()
+        st.session_state.stocks = holdings_from_dicts(save_queue.get_user_stocks(st.session_state.username))
+        st.session_state.stocks_version = st.session_state.get('stocks_version', 0) + 1
+    
+    sync_store_prices()
+    
+    # 포트폴리오 (종목 목록이 바뀐 경우에만 다시 계산, 모든 탭에서 공유)
+    portfolio = current_portfolio()
     
     # 데이터 백업 기능 (수동)
     with st.expander("데이터 관리"):
         if st.button("데이터 백업 생성"):
-            user_manager._backup_config()
+            save_queue.flush()
+            user_manager.backup()
             st.success("데이터 백업이 생성되었습니다.")
+        
+        # 저장 대기열 지표
+        metrics = save_queue.metrics()
+        st.caption(f"저장 대기 {metrics['pending']}건 · 저장 요청 {metrics['enqueued']}건 → 실제 저장 {metrics['flushed']}건 "
+                   f"(병합 비율 {metrics['coalescing_ratio']:.1f}배) · "
+                   f"저장 지연 평균 {metrics['avg_flush_ms']:.1f}ms / p95 {metrics['p95_flush_ms']:.1f}ms")
+        
+        # 화면 표 캐시 지표
+        cache_metrics = render_cache.metrics()
+        st.caption(f"표 캐시 {cache_metrics['size']}/{cache_metrics['maxsize']}개 · 적중 {cache_metrics['hits']}회 / "
+                   f"미적중 {cache_metrics['misses']}회 (적중률 {cache_metrics['hit_ratio']:.0%})")
     
     # 메뉴 탭 추가
     tab1, tab2, tab3 = st.tabs(["📊 대시보드", "➕ 종목 관리", "📋 상세 정보"])
@@ -88,180 +282,138 @@ else:
         else:
             st.subheader('포트폴리오 요약')
             
-            # 포트폴리오 요약 계산
-            total_investment = sum(stock['총 투자금'] for stock in st.session_state.stocks)
-            total_current_value = sum(stock['현재 평가금'] for stock in st.session_state.stocks)
-            total_dividend = sum(stock['누적 배당금'] for stock in st.session_state.stocks)
-            total_profit_loss = sum(stock['실제 손익'] for stock in st.session_state.stocks)
-            total_profit_rate = (total_profit_loss / total_investment * 100) if total_investment > 0 else 0
-            
-            # 원화로 환산
-            total_investment_krw = total_investment * st.session_state.exchange_rate
-            total_current_value_krw = total_current_value * st.session_state.exchange_rate
-            total_dividend_krw = total_dividend * st.session_state.exchange_rate
-            total_profit_loss_krw = total_profit_loss * st.session_state.exchange_rate
+            # 화면 값 (종목 목록이나 환율이 바뀐 경우에만 다시 계산, 통화 표시 방식은 열 선택)
+            view = current_view(portfolio)
             
             # 주요 지표 표시 (표 형태로)
             st.markdown("### 📈 주요 지표")
-            
-            summary_data = {
-                '항목': ['총 투자금', '총 평가금', '총 배당금', '총 손익', '총 수익률'],
-                'USD': [
-                    f"${total_investment:,.2f}",
-                    f"${total_current_value:,.2f}",
-                    f"${total_dividend:,.2f}",
-                    f"${total_profit_loss:,.2f}",
-                    f"{total_profit_rate:,.2f}%"
-                ],
-                'KRW': [
-                    f"₩{total_investment_krw:,.0f}",
-                    f"₩{total_current_value_krw:,.0f}",
-                    f"₩{total_dividend_krw:,.0f}",
-                    f"₩{total_profit_loss_krw:,.0f}",
-                    f"{total_profit_rate:,.2f}%"  # 수익률은 % 단위로 동일
-                ]
-            }
-            summary_df = pd.DataFrame(summary_data)
-            st.table(summary_df)
+            st.table(view.summary_table(currencies=currencies))
             
             st.markdown("---")
             
             # 종목별 수익률 비교 (표 형태로)
             st.markdown("### 📊 종목별 수익률 비교")
             
-            profit_data = []
-            for stock in st.session_state.stocks:
-                # 원화로 환산
-                investment_krw = stock['총 투자금'] * st.session_state.exchange_rate
-                value_krw = stock['현재 평가금'] * st.session_state.exchange_rate
-                dividend_krw = stock['누적 배당금'] * st.session_state.exchange_rate
-                profit_loss_krw = stock['실제 손익'] * st.session_state.exchange_rate
-                
-                profit_data.append({
-                    '종목명': stock['종목명'],
-                    '투자금 (USD)': f"${stock['총 투자금']:,.2f}",
-                    '투자금 (KRW)': f"₩{investment_krw:,.0f}",
-                    '평가금 (USD)': f"${stock['현재 평가금']:,.2f}",
-                    '평가금 (KRW)': f"₩{value_krw:,.0f}",
-                    '배당금 (USD)': f"${stock['누적 배당금']:,.2f}",
-                    '배당금 (KRW)': f"₩{dividend_krw:,.0f}",
-                    '수익/손실 (USD)': f"${stock['실제 손익']:,.2f}",
-                    '수익/손실 (KRW)': f"₩{profit_loss_krw:,.0f}",
-                    '수익률': f"{stock['수익률 (%)']:,.2f}%"
-                })
-            
-            profit_df = pd.DataFrame(profit_data)
-            # 수익률 기준으로 내림차순 정렬
-            profit_df['수익률_정렬용'] = [stock['수익률 (%)'] for stock in st.session_state.stocks]
-            profit_df = profit_df.sort_values('수익률_정렬용', ascending=False).drop('수익률_정렬용', axis=1)
-            
             # USD/KRW 보기 선택 옵션
-            currency_view = st.radio("통화 표시 방식", ["모두 표시", "USD만 표시", "KRW만 표시"], horizontal=True)
-            
-            if currency_view == "USD만 표시":
-                columns_to_show = ['종목명', '투자금 (USD)', '평가금 (USD)', '배당금 (USD)', '수익/손실 (USD)', '수익률']
-                profit_df_view = profit_df[columns_to_show]
-            elif currency_view == "KRW만 표시":
-                columns_to_show = ['종목명', '투자금 (KRW)', '평가금 (KRW)', '배당금 (KRW)', '수익/손실 (KRW)', '수익률']
-                profit_df_view = profit_df[columns_to_show]
-            else:
-                profit_df_view = profit_df
+            currency_view = st.radio("통화 표시 방식", currency_views(currencies), horizontal=True)
             
-            st.table(profit_df_view)
+            st.table(view.profit_table(currency_view, currencies))
             
             st.markdown("---")
             
             # 포트폴리오 구성 비중 (표 형태로)
             st.markdown("### 🥧 포트폴리오 구성 비중")
-            
-            # 투자금 및 평가금 기준 비중 데이터 준비
-            composition_data = []
-            for stock in st.session_state.stocks:
-                invest_pct = (stock['총 투자금'] / total_investment * 100) if total_investment > 0 else 0
-                value_pct = (stock['현재 평가금'] / total_current_value * 100) if total_current_value > 0 else 0
-                
-                # 원화로 환산
-                investment_krw = stock['총 투자금'] * st.session_state.exchange_rate
-                value_krw = stock['현재 평가금'] * st.session_state.exchange_rate
-                
-                composition_data.append({
-                    '종목명': stock['종목명'],
-                    '투자금 (USD)': f"${stock['총 투자금']:,.2f}",
-                    '투자금 (KRW)': f"₩{investment_krw:,.0f}",
-                    '투자 비중': f"{invest_pct:.2f}%",
-                    '평가금 (USD)': f"${stock['현재 평가금']:,.2f}",
-                    '평가금 (KRW)': f"₩{value_krw:,.0f}",
-                    '평가 비중': f"{value_pct:.2f}%"
-                })
-            
-            composition_df = pd.DataFrame(composition_data)
-            # 투자 비중 기준으로 내림차순 정렬
-            composition_df['투자비중_정렬용'] = [(stock['총 투자금'] / total_investment * 100) if total_investment > 0 else 0 
-                                        for stock in st.session_state.stocks]
-            composition_df = composition_df.sort_values('투자비중_정렬용', ascending=False).drop('투자비중_정렬용', axis=1)
-            
-            # USD/KRW 보기 선택 옵션에 따라 표시
-            if currency_view == "USD만 표시":
-                columns_to_show = ['종목명', '투자금 (USD)', '투자 비중', '평가금 (USD)', '평가 비중']
-                composition_df_view = composition_df[columns_to_show]
-            elif currency_view == "KRW만 표시":
-                columns_to_show = ['종목명', '투자금 (KRW)', '투자 비중', '평가금 (KRW)', '평가 비중']
-                composition_df_view = composition_df[columns_to_show]
-            else:
-                composition_df_view = composition_df
-                
-            st.table(composition_df_view)
+            st.table(view.composition_table(currency_view, currencies))
             
             st.markdown("---")
             
             # 월별 배당금 현황 (표 형태로)
             st.markdown("### 💰 월별 배당금 현황")
             
-            # 모든 종목의 월별 배당금 합산
-            monthly_sums = {month: 0 for month in ['1월', '2월', '3월', '4월', '5월', '6월', '7월', '8월', '9월', '10월', '11월', '12월']}
-            
-            for stock in st.session_state.stocks:
-                for month, amount in stock['월별 배당금'].items():
-                    monthly_sums[month] += amount
-            
-            monthly_data = {
-                '월': list(monthly_sums.keys()),
-                '배당금 (USD)': [f"${amount:,.2f}" for amount in monthly_sums.values()],
-                '배당금 (KRW)': [f"₩{amount * st.session_state.exchange_rate:,.0f}" for amount in monthly_sums.values()]
-            }
-            monthly_df = pd.DataFrame(monthly_data)
-            
-            # 배당금이 있는 월만 표시
-            monthly_df['배당금_정렬용'] = list(monthly_sums.values())
-            monthly_df_filtered = monthly_df[monthly_df['배당금_정렬용'] > 0].drop('배당금_정렬용', axis=1)
-            
-            if not monthly_df_filtered.empty:
-                # USD/KRW 보기 선택 옵션에 따라 표시
-                if currency_view == "USD만 표시":
-                    columns_to_show = ['월', '배당금 (USD)']
-                    monthly_df_view = monthly_df_filtered[columns_to_show]
-                elif currency_view == "KRW만 표시":
-                    columns_to_show = ['월', '배당금 (KRW)']
-                    monthly_df_view = monthly_df_filtered[columns_to_show]
-                else:
-                    monthly_df_view = monthly_df_filtered
-                    
-                st.table(monthly_df_view)
+            monthly_df = view.monthly_table(currency_view, currencies)
+            if monthly_df is not None:
+                st.table(monthly_df)
                 
                 # 배당금 흐름 요약 텍스트
-                max_month = monthly_df.loc[monthly_df['배당금_정렬용'].idxmax(), '월']
-                max_amount = monthly_df['배당금_정렬용'].max()
-                annual_dividend = sum(monthly_sums.values())
-                
-                st.markdown(f"**배당금 요약:**")
-                st.markdown(f"- 연간 총 배당금: **${annual_dividend:,.2f}** (₩{annual_dividend * st.session_state.exchange_rate:,.0f})")
-                st.markdown(f"- 배당금이 가장 많은 달: **{max_month}** (${max_amount:,.2f} / ₩{max_amount * st.session_state.exchange_rate:,.0f})")
-                st.markdown(f"- 월 평균 배당금: **${(annual_dividend/12):,.2f}** (₩{(annual_dividend/12) * st.session_state.exchange_rate:,.0f})")
+                for line in view.monthly_summary(currencies):
+                    st.markdown(line)
             else:
                 st.info("아직 입력된 배당금이 없습니다.")
+            
+            if monthly_df is not None:
+                st.markdown("---")
+                
+                # 배당 수입 예측 (입력한 배당금/배당 일정과 성장률 가정으로 앞으로의 연간 배당 수입 계산)
+                st.markdown("### 🔮 배당 수입 예측")
+                with st.expander("예측 조건"):
+                    col1, col2, col3 = st.columns(3)
+                    with col1:
+                        projection_years = st.slider('예측 기간 (년)', min_value=1, max_value=MAX_YEARS, value=10,
+                                                     key='projection_years')
+                        drip = st.checkbox('배당금 재투자 (DRIP)', key='projection_drip')
+                    with col2:
+                        dividend_growth = st.number_input('연 배당 성장률 (%)', min_value=-50.0, max_value=50.0,
+                                                          value=5.0, step=0.5, key='projection_dividend_growth')
+                        price_growth = st.number_input('연 주가 상승률 (%)', min_value=-50.0, max_value=50.0,
+                                                       value=5.0, step=0.5, key='projection_price_growth')
+                    with col3:
+                        monte_carlo = st.checkbox('몬테카를로 시나리오', key='projection_monte_carlo')
+                        # 재투자 예측은 종목 수 × 기간에 비례해 느려지므로 시나리오 수 선택지를 줄임
+                        choices = scenario_choices(len(view.portfolio), projection_years, drip)
+                        scenarios = st.selectbox('시나리오 수', choices, key='projection_scenarios',
+                                                 disabled=not monte_carlo)
+                        volatility = st.number_input('연 주가 변동성 (%)', min_value=0.0, max_value=100.0, value=20.0,
+                                                     step=1.0, key='projection_volatility', disabled=not monte_carlo)
+                assumptions = {
+                    'years': projection_years, 'drip': drip,
+                    'dividend_growth': dividend_growth / 100, 'price_growth': price_growth / 100
+                }
+                if monte_carlo:
+                    # 배당 성장률 변동성은 주가 변동성의 1/4로 가정
+                    assumptions.update(scenarios=scenarios, price_volatility=volatility / 100,
+                                       dividend_volatility=volatility / 400)
+                start_month = str(np.datetime64(date.today(), 'M') + 1)
+                projection_frame = view.projection_frame(start_month, currencies[0], **assumptions)
+                st.line_chart(projection_frame[[column for column in projection_frame.columns
+                                                if column.startswith('배당 수입')]])
+                st.dataframe(view.projection_table(start_month, currencies[0], **assumptions),
+                             use_container_width=True)
     
     # 종목 관리 탭   
     with tab2:
+        # 증권사 내보내기 파일 일괄 가져오기 (검증한 종목을 한 번에 세션에 넣고 한 번만 저장)
+        if 'import_round' not in st.session_state:
+            st.session_state.import_round = 0
+        with st.expander('📥 CSV/엑셀 일괄 가져오기', expanded='import_notice' in st.session_state):
+            if 'import_notice' in st.session_state:
+                notice_type, notice = st.session_state.pop('import_notice')
+                getattr(st, notice_type)(notice)
+            st.caption("종목명, 보유 수량, 매수 단가, 현재 주가 열은 필수이며 통화, 매수일, 1월~12월 배당금, "
+                       "주당 배당금/배당 주기/배당락일/지급일 간격 열은 선택입니다. (영문 열 이름도 인식)")
+            col1, col2 = st.columns([3, 1])
+            with col1:
+                uploaded = st.file_uploader('증권사 내보내기 파일', type=['csv', 'xlsx'],
+                                            key=f'import_file_{st.session_state.import_round}')
+            with col2:
+                import_currency = st.selectbox('통화가 없는 행의 통화', CURRENCIES, key='import_currency')
+            if uploaded is not None:
+                try:
+                    result = uploaded_import(uploaded, import_currency)
+                except ValueError as e:
+                    result = None
+                    st.error(f"파일을 읽을 수 없습니다: {e}")
+                if result is not None:
+                    st.write(f"전체 {result.total_rows:,}행 중 **{len(result):,}종목**을 가져올 수 있습니다.")
+                    if result.error_count:
+                        st.warning(f"{result.error_count:,}행은 입력 값이 잘못되어 건너뜁니다."
+                                   + (f" (처음 {len(result.errors)}행만 표시)" if result.error_count > len(result.errors)
+                                      else ""))
+                        st.dataframe(result.error_frame(), hide_index=True, use_container_width=True)
+                    if len(result):
+                        # 파생 값은 가져올 종목 전체를 포트폴리오 벡터 연산으로 한 번에 계산
+                        preview = result.portfolio().frame().head(20)
+                        preview.insert(1, '통화', result.rows.currencies[:20])
+                        st.dataframe(preview, hide_index=True, use_container_width=True)
+                        import_mode = st.radio('가져오기 방식', ['기존 종목에 추가', '기존 종목을 모두 바꾸기'],
+                                               horizontal=True, key='import_mode')
+                        if st.button(f'{len(result):,}종목 가져오기', type='primary'):
+                            holdings = result.holdings()
+                            if import_mode == '기존 종목을 모두 바꾸기':
+                                st.session_state.stocks = holdings
+                                st.session_state.editing_stock_idx = None
+                            else:
+                                st.session_state.stocks.extend(holdings)
+                            # 종목 수와 관계없이 저장은 한 번
+                            if save_stocks():
+                                st.session_state.import_notice = ('success', f"{len(holdings):,}종목을 가져왔습니다. {QUEUED_NOTICE}")
+                            else:
+                                st.session_state.import_notice = ('error', "종목을 가져왔지만 저장 대기열에 넣지 못했습니다. 다시 시도해주세요.")
+                            # 업로드 위젯을 비워 같은 파일을 두 번 가져오지 않도록 함
+                            st.session_state.import_round += 1
+                            st.session_state.pop('import_key', None)
+                            st.session_state.pop('import_result', None)
+                            st.rerun()
+        
         # 종목 추가 폼
         with st.form('add_stock_form'):
             st.subheader('종목 정보 입력')
@@ -269,15 +421,19 @@ else:
             
             with col1:
                 stock_name = st.text_input('종목명', placeholder='예: 리얼티인컴')
+                stock_currency = st.selectbox('통화', CURRENCIES, index=0)
                 quantity = st.number_input('보유 수량', min_value=0.0, value=0.0, step=0.01)
-                purchase_price = st.number_input('매수 단가 (USD)', min_value=0.0, value=0.0, step=0.01)
+                purchase_price = st.number_input('매수 단가 (종목 통화)', min_value=0.0, value=0.0, step=0.01)
             
             with col2:
-                current_price = st.number_input('현재 주가 (USD)', min_value=0.0, value=0.0, step=0.01)
-                st.write(f"매수 단가 (KRW): ₩{purchase_price * st.session_state.exchange_rate:,.0f}")
-                st.write(f"현재 주가 (KRW): ₩{current_price * st.session_state.exchange_rate:,.0f}")
+                current_price = st.number_input('현재 주가 (종목 통화)', min_value=0.0, value=0.0, step=0.01)
+                purchase_date = st.date_input('매수일 (선택)', value=None, min_value=date(1990, 1, 1),
+                                              max_value=date.today())
+                krw_rate = current_rates().rate(stock_currency, 'KRW')
+                st.write(f"매수 단가 (KRW): ₩{purchase_price * krw_rate:,.0f}")
+                st.write(f"현재 주가 (KRW): ₩{current_price * krw_rate:,.0f}")
             
-            st.subheader('월별 배당금 (USD)')
+            st.subheader('월별 배당금 (종목 통화)')
             
             # 한 줄에 4개 열로 배치
             col1, col2, col3, col4 = st.columns(4)
@@ -295,6 +451,8 @@ else:
                         key=f"dividend_{month}"
                     )
             
+            schedule = schedule_inputs(None, 'schedule')
+            
             submit_button = st.form_submit_button('종목 추가')
             
             if submit_button:
@@ -307,56 +465,43 @@ else:
                 elif current_price <= 0:
                     st.error('현재 주가는 0보다 커야 합니다.')
                 else:
-                    # 계산 수행
-                    total_investment = quantity * purchase_price
-                    current_value = quantity * current_price
-                    total_dividend = sum(monthly_dividends.values())
-                    actual_profit_loss = current_value + total_dividend - total_investment
-                    profit_rate = (actual_profit_loss / total_investment * 100) if total_investment > 0 else 0
-                    
-                    # 종목 정보 저장
-                    stock_info = {
-                        '종목명': stock_name,
-                        '보유 수량': quantity,
-                        '매수 단가': purchase_price,
-                        '현재 주가': current_price,
-                        '총 투자금': total_investment,
-                        '현재 평가금': current_value,
-                        '누적 배당금': total_dividend,
-                        '실제 손익': actual_profit_loss,
-                        '수익률 (%)': profit_rate,
-                        '월별 배당금': monthly_dividends
-                    }
+                    # 종목 정보 저장 (입력 값만 저장, 파생 값은 포트폴리오에서 계산)
+                    purchase_day = purchase_date.isoformat() if purchase_date else None
+                    dividends = scheduled_dividends([monthly_dividends[month] for month in MONTHS], schedule,
+                                                    quantity, purchase_day)
+                    stock_info = Holding(stock_name, quantity, purchase_price, current_price, dividends,
+                                         purchase_day, stock_currency, schedule)
                     
                     # 세션에 종목 추가
                     st.session_state.stocks.append(stock_info)
                     # 사용자 정보에 저장
-                    success = user_manager.save_user_stocks(st.session_state.username, st.session_state.stocks)
+                    success = save_stocks()
+                    portfolio = current_portfolio()
                     if success:
-                        st.success(f"{stock_name} 종목이 추가되었습니다.")
+                        st.success(f"{stock_name} 종목이 추가되었습니다. {QUEUED_NOTICE}")
                     else:
                         st.error("종목 추가 중 오류가 발생했습니다. 다시 시도해주세요.")
         
         # 종목 삭제 기능
         if st.session_state.stocks:
             st.subheader('종목 삭제')
-            delete_options = [f"{i+1}. {stock['종목명']}" for i, stock in enumerate(st.session_state.stocks)]
+            delete_options = [f"{i+1}. {stock.name}" for i, stock in enumerate(st.session_state.stocks)]
             delete_index = st.selectbox('삭제할 종목 선택', options=delete_options, index=0)
             
             if st.button('선택 종목 삭제'):
                 idx = int(delete_index.split('.')[0]) - 1
                 removed_stock = st.session_state.stocks.pop(idx)
                 # 사용자 정보에 저장
-                success = user_manager.save_user_stocks(st.session_state.username, st.session_state.stocks)
+                success = save_stocks()
                 if success:
-                    st.success(f"{removed_stock['종목명']} 종목이 삭제되었습니다.")
+                    st.success(f"{removed_stock.name} 종목이 삭제되었습니다. {QUEUED_NOTICE}")
                 else:
                     st.error("종목 삭제 중 오류가 발생했습니다. 다시 시도해주세요.")
                 st.rerun()
             
             # 종목 수정 기능
             st.subheader('종목 수정')
-            edit_options = [f"{i+1}. {stock['종목명']}" for i, stock in enumerate(st.session_state.stocks)]
+            edit_options = [f"{i+1}. {stock.name}" for i, stock in enumerate(st.session_state.stocks)]
             
             # 종목 선택 및 수정 준비
             if 'editing_stock_idx' not in st.session_state:
@@ -375,29 +520,42 @@ else:
                 stock = st.session_state.stocks[idx]
                 
                 with st.form('edit_stock_form'):
-                    st.subheader(f"'{stock['종목명']}' 종목 정보 수정")
+                    st.subheader(f"'{stock.name}' 종목 정보 수정")
                     col1, col2 = st.columns(2)
                     
                     with col1:
-                        updated_name = st.text_input('종목명', value=stock['종목명'])
+                        updated_name = st.text_input('종목명', value=stock.name)
+                        updated_currency = st.selectbox('통화', CURRENCIES, index=CURRENCIES.index(stock.currency),
+                                                        key='edit_currency')
+                        # 거래 내역이 있는 종목은 보유 수량/매수 단가를 거래 내역에서 계산하므로 수정 불가
                         updated_quantity = st.number_input('보유 수량', 
                                                         min_value=0.0, 
-                                                        value=float(stock['보유 수량']), 
-                                                        step=0.01)
-                        updated_purchase_price = st.number_input('매수 단가 (USD)', 
+                                                        value=stock.quantity, 
+                                                        step=0.01,
+                                                        disabled=stock.ledger is not None)
+                        updated_purchase_price = st.number_input('매수 단가 (종목 통화)', 
                                                               min_value=0.0, 
-                                                              value=float(stock['매수 단가']), 
-                                                              step=0.01)
+                                                              value=stock.purchase_price, 
+                                                              step=0.01,
+                                                              disabled=stock.ledger is not None)
+                        if stock.ledger is not None:
+                            st.caption("보유 수량과 매수 단가는 아래 '거래 내역'에서 계산합니다.")
                     
                     with col2:
-                        updated_current_price = st.number_input('현재 주가 (USD)', 
+                        updated_current_price = st.number_input('현재 주가 (종목 통화)', 
                                                              min_value=0.0, 
-                                                             value=float(stock['현재 주가']), 
+                                                             value=stock.current_price, 
                                                              step=0.01)
-                        st.write(f"매수 단가 (KRW): ₩{updated_purchase_price * st.session_state.exchange_rate:,.0f}")
-                        st.write(f"현재 주가 (KRW): ₩{updated_current_price * st.session_state.exchange_rate:,.0f}")
+                        updated_purchase_date = st.date_input(
+                            '매수일 (선택)',
+                            value=date.fromisoformat(stock.purchase_date) if stock.purchase_date else None,
+                            min_value=date(1990, 1, 1), max_value=date.today(), key='edit_purchase_date'
+                        )
+                        krw_rate = current_rates().rate(updated_currency, 'KRW')
+                        st.write(f"매수 단가 (KRW): ₩{updated_purchase_price * krw_rate:,.0f}")
+                        st.write(f"현재 주가 (KRW): ₩{updated_current_price * krw_rate:,.0f}")
                     
-                    st.subheader('월별 배당금 (USD)')
+                    st.subheader('월별 배당금 (종목 통화)')
                     
                     # 한 줄에 4개 열로 배치
                     col1, col2, col3, col4 = st.columns(4)
@@ -407,7 +565,7 @@ else:
                     
                     for i, month in enumerate(months):
                         with [col1, col2, col3, col4][i % 4]:
-                            default_value = stock['월별 배당금'].get(month, 0.0)
+                            default_value = stock.dividends[i]
                             updated_monthly_dividends[month] = st.number_input(
                                 month, 
                                 min_value=0.0,
@@ -416,46 +574,38 @@ else:
                                 key=f"edit_dividend_{month}"
                             )
                     
+                    updated_schedule = schedule_inputs(stock.schedule, 'edit_schedule')
+                    
                     update_button = st.form_submit_button('수정 완료')
                     cancel_button = st.form_submit_button('취소')
                     
                     if update_button:
                         if not updated_name:
                             st.error('종목명을 입력해주세요.')
-                        elif updated_quantity <= 0:
+                        elif stock.ledger is None and updated_quantity <= 0:
                             st.error('보유 수량은 0보다 커야 합니다.')
-                        elif updated_purchase_price <= 0:
+                        elif stock.ledger is None and updated_purchase_price <= 0:
                             st.error('매수 단가는 0보다 커야 합니다.')
                         elif updated_current_price <= 0:
                             st.error('현재 주가는 0보다 커야 합니다.')
                         else:
-                            # 계산 수행
-                            total_investment = updated_quantity * updated_purchase_price
-                            current_value = updated_quantity * updated_current_price
-                            total_dividend = sum(updated_monthly_dividends.values())
-                            actual_profit_loss = current_value + total_dividend - total_investment
-                            profit_rate = (actual_profit_loss / total_investment * 100) if total_investment > 0 else 0
-                            
-                            # 종목 정보 업데이트
-                            updated_stock = {
-                                '종목명': updated_name,
-                                '보유 수량': updated_quantity,
-                                '매수 단가': updated_purchase_price,
-                                '현재 주가': updated_current_price,
-                                '총 투자금': total_investment,
-                                '현재 평가금': current_value,
-                                '누적 배당금': total_dividend,
-                                '실제 손익': actual_profit_loss,
-                                '수익률 (%)': profit_rate,
-                                '월별 배당금': updated_monthly_dividends
-                            }
+                            # 종목 정보 업데이트 (입력 값만 저장)
+                            updated_purchase_day = updated_purchase_date.isoformat() if updated_purchase_date else None
+                            updated_dividends = scheduled_dividends(
+                                [updated_monthly_dividends[month] for month in MONTHS], updated_schedule,
+                                updated_quantity, updated_purchase_day
+                            )
+                            updated_stock = Holding(updated_name, updated_quantity, updated_purchase_price,
+                                                    updated_current_price, updated_dividends,
+                                                    updated_purchase_day, updated_currency, updated_schedule,
+                                                    stock.ledger)
                             
                             # 세션에 종목 업데이트
                             st.session_state.stocks[idx] = updated_stock
                             # 사용자 정보에 저장
-                            success = user_manager.save_user_stocks(st.session_state.username, st.session_state.stocks)
+                            success = save_stocks()
                             if success:
-                                st.success(f"{updated_name} 종목 정보가 업데이트되었습니다.")
+                                st.success(f"{updated_name} 종목 정보가 업데이트되었습니다. {QUEUED_NOTICE}")
                             else:
                                 st.error("종목 정보 업데이트 중 오류가 발생했습니다. 다시 시도해주세요.")
                             # 수정 모드 종료
@@ -465,180 +615,118 @@ else:
                     if cancel_button:
                         st.session_state.editing_stock_idx = None
                         st.rerun()
+            
+            # 거래 내역 (매수/매도/분할을 기록하면 보유 수량과 매수 단가를 누적 취득가로 계산)
+            st.subheader('거래 내역')
+            ledger_options = [f"{i+1}. {stock.name}" for i, stock in enumerate(st.session_state.stocks)]
+            ledger_index = st.selectbox('거래 내역을 볼 종목 선택', options=ledger_options, index=0, key='ledger_stock')
+            ledger_idx = int(ledger_index.split('.')[0]) - 1
+            ledger_stock = st.session_state.stocks[ledger_idx]
+            
+            if ledger_stock.ledger is None:
+                st.caption("거래 내역을 시작하면 현재 보유 수량과 매수 단가를 첫 매수 거래로 기록합니다.")
+                if st.button('거래 내역 시작'):
+                    ledger_stock.ledger = Ledger.from_holding(ledger_stock.quantity, ledger_stock.purchase_price,
+                                                              ledger_stock.purchase_date)
+                    save_stocks()
+                    st.rerun()
+            else:
+                ledger = ledger_stock.ledger
+                cost_method = st.radio('취득가 계산 방식', COST_METHODS, index=COST_METHODS.index(ledger.method),
+                                       horizontal=True, key=f'ledger_method_{ledger_idx}')
+                if cost_method != ledger.method:
+                    # 두 방식의 누적 상태를 함께 갖고 있으므로 다시 계산 없이 매수 단가만 바뀜
+                    ledger.set_method(cost_method)
+                    ledger_stock.sync_ledger()
+                    save_stocks()
+                
+                # 요약은 거래 추가 폼을 처리한 뒤에 채움 (추가한 거래가 바로 반영되도록)
+                ledger_summary = st.container()
+                
+                with st.form('ledger_form', clear_on_submit=True):
+                    col1, col2, col3, col4 = st.columns(4)
+                    with col1:
+                        transaction_type = st.selectbox('거래 유형', TRANSACTION_TYPES)
+                    with col2:
+                        transaction_date = st.date_input('거래일', value=date.today(), min_value=date(1990, 1, 1),
+                                                         max_value=date.today())
+                    with col3:
+                        transaction_quantity = st.number_input('수량 (분할은 비율)', min_value=0.0, value=0.0,
+                                                               step=0.01)
+                    with col4:
+                        transaction_price = st.number_input('단가 (종목 통화)', min_value=0.0, value=0.0, step=0.01)
+                    
+                    if st.form_submit_button('거래 추가'):
+                        try:
+                            ledger.add(transaction_type, transaction_date, transaction_quantity, transaction_price)
+                        except ValueError as e:
+                            st.error(str(e))
+                        else:
+                            ledger_stock.sync_ledger()
+                            if save_stocks():
+                                st.success(f"{ledger_stock.name} {transaction_type} 거래가 추가되었습니다. {QUEUED_NOTICE}")
+                            else:
+                                st.error("거래 저장 중 오류가 발생했습니다. 다시 시도해주세요.")
+                
+                symbol, digits = CURRENCY_FORMATS[ledger_stock.currency]
+                with ledger_summary:
+                    col1, col2, col3, col4 = st.columns(4)
+                    with col1:
+                        st.write(f"보유 수량: **{ledger.shares:,.2f}주**")
+                    with col2:
+                        st.write(f"총 투자금: **{symbol}{ledger.cost_basis():,.{digits}f}**")
+                    with col3:
+                        st.write(f"실현 손익: **{symbol}{ledger.realized():,.{digits}f}**")
+                    with col4:
+                        st.write(f"평가 손익: **{symbol}{ledger.unrealized(ledger_stock.current_price):,.{digits}f}**")
+                
+                st.dataframe(ledger.frame(last=20), hide_index=True, use_container_width=True)
+                st.caption(f"전체 {len(ledger):,}건 중 최근 20건")
     
     # 상세 정보 탭
     with tab3:
         # 종목별 결과 테이블 표시
         if st.session_state.stocks:
             # USD/KRW 보기 선택 옵션
-            currency_view_detail = st.radio("통화 표시 방식 (상세)", ["모두 표시", "USD만 표시", "KRW만 표시"], horizontal=True)
+            currency_view_detail = st.radio("통화 표시 방식 (상세)", currency_views(currencies), horizontal=True)
+            view = current_view(portfolio)
             
             st.subheader('종목별 손익 현황')
             
-            # 테이블용 데이터 준비
-            table_data = []
-            for stock in st.session_state.stocks:
-                # 원화로 환산
-                purchase_price_krw = stock['매수 단가'] * st.session_state.exchange_rate
-                current_price_krw = stock['현재 주가'] * st.session_state.exchange_rate
-                total_investment_krw = stock['총 투자금'] * st.session_state.exchange_rate
-                current_value_krw = stock['현재 평가금'] * st.session_state.exchange_rate
-                total_dividend_krw = stock['누적 배당금'] * st.session_state.exchange_rate
-                actual_profit_loss_krw = stock['실제 손익'] * st.session_state.exchange_rate
-                
-                if currency_view_detail == "USD만 표시":
-                    row = {
-                        '종목명': stock['종목명'],
-                        '보유 수량': stock['보유 수량'],
-                        '매수 단가': f"${stock['매수 단가']:,.2f}",
-                        '현재 주가': f"${stock['현재 주가']:,.2f}",
-                        '총 투자금': f"${stock['총 투자금']:,.2f}",
-                        '현재 평가금': f"${stock['현재 평가금']:,.2f}",
-                        '누적 배당금': f"${stock['누적 배당금']:,.2f}",
-                        '실제 손익': f"${stock['실제 손익']:,.2f}",
-                        '수익률 (%)': f"{stock['수익률 (%)']:,.2f}%"
-                    }
-                elif currency_view_detail == "KRW만 표시":
-                    row = {
-                        '종목명': stock['종목명'],
-                        '보유 수량': stock['보유 수량'],
-                        '매수 단가': f"₩{purchase_price_krw:,.0f}",
-                        '현재 주가': f"₩{current_price_krw:,.0f}",
-                        '총 투자금': f"₩{total_investment_krw:,.0f}",
-                        '현재 평가금': f"₩{current_value_krw:,.0f}",
-                        '누적 배당금': f"₩{total_dividend_krw:,.0f}",
-                        '실제 손익': f"₩{actual_profit_loss_krw:,.0f}",
-                        '수익률 (%)': f"{stock['수익률 (%)']:,.2f}%"
-                    }
-                else:
-                    row = {
-                        '종목명': stock['종목명'],
-                        '보유 수량': stock['보유 수량'],
-                        '매수 단가 (USD)': f"${stock['매수 단가']:,.2f}",
-                        '매수 단가 (KRW)': f"₩{purchase_price_krw:,.0f}",
-                        '현재 주가 (USD)': f"${stock['현재 주가']:,.2f}",
-                        '현재 주가 (KRW)': f"₩{current_price_krw:,.0f}",
-                        '총 투자금 (USD)': f"${stock['총 투자금']:,.2f}",
-                        '총 투자금 (KRW)': f"₩{total_investment_krw:,.0f}",
-                        '현재 평가금 (USD)': f"${stock['현재 평가금']:,.2f}",
-                        '현재 평가금 (KRW)': f"₩{current_value_krw:,.0f}",
-                        '누적 배당금 (USD)': f"${stock['누적 배당금']:,.2f}",
-                        '누적 배당금 (KRW)': f"₩{total_dividend_krw:,.0f}",
-                        '실제 손익 (USD)': f"${stock['실제 손익']:,.2f}",
-                        '실제 손익 (KRW)': f"₩{actual_profit_loss_krw:,.0f}",
-                        '수익률 (%)': f"{stock['수익률 (%)']:,.2f}%"
-                    }
-                table_data.append(row)
-            
-            # 데이터프레임 생성 및 표시
-            df = pd.DataFrame(table_data)
-            st.table(df)
-            
-            # 전체 합계 계산
-            total_investment = sum(stock['총 투자금'] for stock in st.session_state.stocks)
-            total_current_value = sum(stock['현재 평가금'] for stock in st.session_state.stocks)
-            total_dividend = sum(stock['누적 배당금'] for stock in st.session_state.stocks)
-            total_profit_loss = sum(stock['실제 손익'] for stock in st.session_state.stocks)
-            total_profit_rate = (total_profit_loss / total_investment * 100) if total_investment > 0 else 0
-            
-            # 원화로 환산
-            total_investment_krw = total_investment * st.session_state.exchange_rate
-            total_current_value_krw = total_current_value * st.session_state.exchange_rate
-            total_dividend_krw = total_dividend * st.session_state.exchange_rate
-            total_profit_loss_krw = total_profit_loss * st.session_state.exchange_rate
+            # 데이터프레임 표시
+            st.table(view.detail_table(currency_view_detail, currencies))
             
             # 합계 테이블 표시
             st.subheader('전체 합계')
+            st.table(view.summary_table(currency_view_detail, detail=True, currencies=currencies))
             
-            if currency_view_detail == "USD만 표시":
-                summary_data = {
-                    '항목': ['총 투자금', '총 평가금', '총 누적 배당금', '총 손익', '총 수익률'],
-                    '금액': [
-                        f"${total_investment:,.2f}",
-                        f"${total_current_value:,.2f}",
-                        f"${total_dividend:,.2f}",
-                        f"${total_profit_loss:,.2f}",
-                        f"{total_profit_rate:,.2f}%"
-                    ]
-                }
-            elif currency_view_detail == "KRW만 표시":
-                summary_data = {
-                    '항목': ['총 투자금', '총 평가금', '총 누적 배당금', '총 손익', '총 수익률'],
-                    '금액': [
-                        f"₩{total_investment_krw:,.0f}",
-                        f"₩{total_current_value_krw:,.0f}",
-                        f"₩{total_dividend_krw:,.0f}",
-                        f"₩{total_profit_loss_krw:,.0f}",
-                        f"{total_profit_rate:,.2f}%"
-                    ]
-                }
-            else:
-                summary_data = {
-                    '항목': ['총 투자금', '총 평가금', '총 누적 배당금', '총 손익', '총 수익률'],
-                    'USD': [
-                        f"${total_investment:,.2f}",
-                        f"${total_current_value:,.2f}",
-                        f"${total_dividend:,.2f}",
-                        f"${total_profit_loss:,.2f}",
-                        f"{total_profit_rate:,.2f}%"
-                    ],
-                    'KRW': [
-                        f"₩{total_investment_krw:,.0f}",
-                        f"₩{total_current_value_krw:,.0f}",
-                        f"₩{total_dividend_krw:,.0f}",
-                        f"₩{total_profit_loss_krw:,.0f}",
-                        f"{total_profit_rate:,.2f}%"
-                    ]
-                }
-            
-            summary_df = pd.DataFrame(summary_data)
-            st.table(summary_df)
+            # 배당 일정을 입력한 종목의 연도별/최근 12개월 배당 수입
+            schedule_table = view.schedule_income_table(date.today(), currencies=currencies)
+            if schedule_table is not None:
+                st.subheader('배당 일정 기준 배당 수입')
+                st.table(schedule_table)
             
             # 종목별 월간 배당금 상세 내역
             st.subheader('종목별 월간 배당금 상세')
             
-            for i, stock in enumerate(st.session_state.stocks):
-                st.markdown(f"**{i+1}. {stock['종목명']}**")
-                
-                # 배당금이 있는 월만 표시
-                filtered_months = {month: amount for month, amount in stock['월별 배당금'].items() if amount > 0}
+            # 종목이 적으면 모두 표시하고, 많으면 검색/페이지로 좁힌 뒤 선택한 한 종목의 표만 만듦
+            indices = paginate('detail_dividends', portfolio.names)
+            if len(portfolio) > PAGE_SIZES[0] and indices:
+                detail_options = [f"{i+1}. {portfolio.names[i]}" for i in indices]
+                selected = st.selectbox('종목 선택', detail_options, key='detail_dividends_selected')
+                indices = [indices[detail_options.index(selected)]]
+            for i in indices:
+                st.markdown(f"**{i+1}. {portfolio.names[i]}**")
+                monthly_df, lines = view.stock_dividends(i, currency_view_detail, currencies)
                 
-                if filtered_months:
-                    if currency_view_detail == "USD만 표시":
-                        monthly_data = {
-                            '월': list(filtered_months.keys()),
-                            '배당금 (USD)': [f"${amount:,.2f}" for amount in filtered_months.values()]
-                        }
-                    elif currency_view_detail == "KRW만 표시":
-                        monthly_data = {
-                            '월': list(filtered_months.keys()),
-                            '배당금 (KRW)': [f"₩{amount * st.session_state.exchange_rate:,.0f}" for amount in filtered_months.values()]
-                        }
-                    else:
-                        monthly_data = {
-                            '월': list(filtered_months.keys()),
-                            '배당금 (USD)': [f"${amount:,.2f}" for amount in filtered_months.values()],
-                            '배당금 (KRW)': [f"₩{amount * st.session_state.exchange_rate:,.0f}" for amount in filtered_months.values()]
-                        }
-                    
-                    monthly_df = pd.DataFrame(monthly_data)
+                if monthly_df is not None:
                     st.table(monthly_df)
                     
                     # 배당금 요약 정보
-                    total_stock_dividend = sum(stock['월별 배당금'].values())
-                    total_stock_dividend_krw = total_stock_dividend * st.session_state.exchange_rate
-                    dividend_yield = (total_stock_dividend / stock['총 투자금'] * 100) if stock['총 투자금'] > 0 else 0
-                    
-                    if currency_view_detail == "USD만 표시":
-                        st.markdown(f"- 연간 총 배당금: **${total_stock_dividend:,.2f}**")
-                    elif currency_view_detail == "KRW만 표시":
-                        st.markdown(f"- 연간 총 배당금: **₩{total_stock_dividend_krw:,.0f}**")
-                    else:
-                        st.markdown(f"- 연간 총 배당금: **${total_stock_dividend:,.2f}** (₩{total_stock_dividend_krw:,.0f})")
-                    
-                    st.markdown(f"- 배당 수익률: **{dividend_yield:,.2f}%** (배당금 ÷ 투자금)")
+                    for line in lines:
+                        st.markdown(line)
                 else:
-                    st.info(f"{stock['종목명']}의 배당금 데이터가 없습니다.")
+                    st.info(lines[0])
                 
                 st.markdown("---")
         else:
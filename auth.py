@@ -1,21 +1,42 @@
 import streamlit as st
-import pickle
 import os
-from pathlib import Path
 import yaml
-import bcrypt
-import streamlit_authenticator as stauth
-from datetime import datetime
+from atomic_io import atomic_write_text, file_lock
+from passwords import BcryptHasher
+from session_store import SessionGenerations, sidecar_path
+from stock_schema import compact_stocks
 
 # 사용자 관리를 위한 클래스
 class UserManager:
     def __init__(self, config_path='./config.yaml'):
         self.config_path = config_path
+        # streamlit-authenticator가 config.yaml의 bcrypt 해시로 로그인을 처리하므로 bcrypt 사용
+        self.hasher = BcryptHasher()
+        # 로그아웃마다 바뀌는 세션 세대는 config.yaml과 분리된 작은 파일에 보관
+        self.sessions = SessionGenerations(sidecar_path(config_path))
         # 설정 파일이 없는 경우 기본 설정으로 생성
         if not os.path.exists(config_path):
             self._create_default_config()
         self.config = self._load_config()
+        self._file_signature = self._stat_signature()
         
+    def _stat_signature(self):
+        # 다른 프로세스의 저장 여부를 판단하기 위한 (inode, 수정 시각, 크기)
+        try:
+            stat = os.stat(self.config_path)
+        except OSError:
+            return None
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    
+    def reload_if_changed(self):
+        # 파일이 외부에서 변경된 경우에만 다시 읽음
+        signature = self._stat_signature()
+        if signature is not None and signature == self._file_signature:
+            return False
+        self.config = self._load_config()
+        self._file_signature = self._stat_signature()
+        return True
+    
     def _create_default_config(self):
         # 기본 설정 파일 생성
         default_config = {
@@ -39,22 +60,46 @@ class UserManager:
             }
         }
         
-        with open(self.config_path, 'w') as file:
-            yaml.dump(default_config, file, default_flow_style=False)
+        atomic_write_text(self.config_path, yaml.dump(default_config, default_flow_style=False))
     
     def _load_config(self):
         # 설정 파일 로드
         with open(self.config_path, 'r') as file:
             return yaml.safe_load(file)
     
-    def save_config(self):
-        # 설정 파일 저장
-        with open(self.config_path, 'w') as file:
-            yaml.dump(self.config, file, default_flow_style=False)
+    def save_config(self, usernames=None, created=()):
+        # 설정 파일 저장 (임시 파일 + 이름 변경, 프로세스 간 잠금)
+        with file_lock(self.config_path):
+            if usernames is not None and self._stat_signature() != self._file_signature:
+                # 다른 프로세스가 그 사이 저장했다면 최신 내용에 내 사용자 변경만 병합
+                disk_config = self._load_config()
+                disk_users = disk_config['credentials']['usernames']
+                conflicts = [username for username in created if username in disk_users]
+                for username in usernames:
+                    if username not in conflicts:
+                        disk_users[username] = self.config['credentials']['usernames'][username]
+                self.config = disk_config
+                if conflicts:
+                    self._file_signature = self._stat_signature()
+                    return False
+            atomic_write_text(self.config_path, yaml.dump(self.config, default_flow_style=False))
+            self._file_signature = self._stat_signature()
+        return True
+    
+    def backup(self, backup_path='backup/config_latest.yaml'):
+        # 현재 설정 파일을 백업 폴더에 복사 (수동 백업)
+        try:
+            os.makedirs(os.path.dirname(backup_path), exist_ok=True)
+            with file_lock(self.config_path), open(self.config_path, 'r') as file:
+                atomic_write_text(backup_path, file.read())
+            return True
+        except OSError as e:
+            print(f"백업 중 오류 발생: {e}")
+            return False
     
     def _hash_password(self, password):
         # 비밀번호 해싱
-        return stauth.Hasher([password]).generate()[0]
+        return self.hasher.hash(password)
     
     def register_user(self, username, name, email, password):
         # 사용자 등록
@@ -67,26 +112,74 @@ class UserManager:
             'password': self._hash_password(password),
             'stocks': []
         }
-        self.save_config()
+        if not self.save_config(usernames=[username], created=[username]):
+            # 다른 프로세스가 같은 사용자명을 먼저 등록함
+            return False, "이미 존재하는 사용자명입니다."
         return True, "등록이 완료되었습니다."
     
+    def get_session_generation(self, username):
+        # 세션 토큰 복원 시 조회 (다른 프로세스의 로그아웃도 보이도록 파일 변경 확인 후 조회, 없는 사용자는 None)
+        self.reload_if_changed()
+        return self.sessions.get(username) if username in self.config['credentials']['usernames'] else None
+    
+    def bump_session_generation(self, username):
+        # 로그아웃 시 세션 세대를 올려 그 전에 발급한 세션 토큰을 무효로 만듦 (세대 파일만 다시 씀)
+        self.reload_if_changed()
+        if username not in self.config['credentials']['usernames']:
+            return False
+        self.sessions.bump(username)
+        return True
+    
     def save_user_stocks(self, username, stocks):
         # 사용자의 주식 정보 저장
         if username in self.config['credentials']['usernames']:
-            self.config['credentials']['usernames'][username]['stocks'] = stocks
-            self.save_config()
-            return True
+            self.config['credentials']['usernames'][username]['stocks'] = compact_stocks(stocks)
+            return self.save_config(usernames=[username])
         return False
     
+    def update_current_prices(self, price_lookup):
+        """모든 사용자 종목의 현재 주가를 price_lookup(종목명 목록 -> 주가 배열, NaN은 유지)으로 갱신합니다."""
+        users = self.config['credentials']['usernames']
+        owned = [(username, stock) for username, user in users.items() for stock in user.get('stocks', [])]
+        prices = price_lookup([stock['종목명'] for _, stock in owned])
+        changed_users, changed = set(), 0
+        for (username, stock), price in zip(owned, prices.tolist()):
+            if price == price and price != stock['현재 주가']:
+                stock['현재 주가'] = price
+                changed_users.add(username)
+                changed += 1
+        if changed_users and not self.save_config(usernames=sorted(changed_users)):
+            return 0
+        return changed
+    
     def get_user_stocks(self, username):
         # 사용자의 주식 정보 조회
         if username in self.config['credentials']['usernames']:
-            return self.config['credentials']['usernames'][username].get('stocks', [])
+            return compact_stocks(self.config['credentials']['usernames'][username].get('stocks', []))
         return []
 
-# 인증 관리자 생성
-def create_authenticator():
-    user_manager = UserManager()
+# 프로세스 전체에서 공유하는 사용자 관리자
+@st.cache_resource
+def _shared_user_manager(storage):
+    if storage == 'sqlite':
+        # SQLite 저장소 (DB가 비어 있으면 config.yaml에서 처음 한 번 자동 이전)
+        from sqlite_store import SQLiteUserManager
+        return SQLiteUserManager(legacy_path='./config.yaml', hasher=BcryptHasher())
+    return UserManager()
+
+def get_user_manager(reload=True):
+    """캐시된 사용자 관리자 (reload=False이면 config.yaml 변경 확인도 하지 않음)"""
+    user_manager = _shared_user_manager(os.environ.get('YIELDNOTE_STORAGE', 'yaml'))
+    if reload:
+        user_manager.reload_if_changed()
+    return user_manager
+
+# 인증 관리자 생성 (로그인/로그아웃 화면에서만 필요)
+def create_authenticator(user_manager=None):
+    if user_manager is None:
+        user_manager = get_user_manager()
+    # streamlit-authenticator(bcrypt 포함)는 인증 관리자가 필요할 때만 불러옴 (토큰으로 복원한 세션은 불러오지 않음)
+    import streamlit_authenticator as stauth
     config = user_manager.config
     
     authenticator = stauth.Authenticate(
@@ -0,0 +1,294 @@
+import os
+import sys
+import json
+import hashlib
+import argparse
+from datetime import datetime, timedelta
+from atomic_io import atomic_write_bytes, atomic_write_json, file_lock
+
+SNAPSHOT_FORMAT = '%Y%m%dT%H%M%S%f'
+
+# 보존 정책: (기간, 구간 단위) - 해당 기간 안에서는 구간마다 가장 최근 스냅샷 하나만 유지
+RETENTION_TIERS = [
+    (timedelta(hours=1), None),                  # 최근 1시간: 모두 유지
+    (timedelta(days=1), '%Y%m%d%H'),             # 최근 1일: 시간별
+    (timedelta(days=30), '%Y%m%d'),              # 최근 30일: 일별
+    (timedelta(weeks=12), '%G%V'),               # 최근 12주: 주별
+]
+# 참조되지 않는 레코드 정리 간격 (저장할 때마다가 아니라 이 간격이 지난 뒤 첫 저장 때 한 번)
+GC_INTERVAL = timedelta(days=1)
+
+
+def _entries_digest(entries):
+    # 스냅샷 내용({사용자명: 해시})이 같은지 빠르게 비교하기 위한 해시
+    return hashlib.sha256(json.dumps(entries, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+class BackupStore:
+    """사용자별 레코드를 내용 해시로 중복 없이 저장하는 백업 저장소
+
+    - objects/<해시>.json: 사용자 한 명의 레코드 (같은 내용은 한 번만 저장)
+    - snapshots/<시각>.json: 시점별 {사용자명: 해시} 목록
+    - catalog.json: 스냅샷별 시각, 체크섬, 정상 여부 색인
+    저장할 때 바뀐 사용자 레코드만 새로 쓰고, 보존 정책에 따라 오래된 스냅샷을 정리합니다.
+    바뀐 사용자명을 알려 주면 나머지 사용자는 직전 스냅샷의 해시를 그대로 쓰므로 직렬화/해시 비용이
+    바뀐 사용자 수에만 비례합니다. 참조되지 않는 레코드 정리는 GC_INTERVAL마다 한 번 또는 명령줄에서 합니다.
+    복원은 색인에서 마지막 정상 스냅샷을 바로 찾으므로 디렉토리를 훑지 않습니다.
+    """
+
+    def __init__(self, backup_dir='backup'):
+        self.backup_dir = backup_dir
+        self.objects_dir = os.path.join(backup_dir, 'objects')
+        self.snapshots_dir = os.path.join(backup_dir, 'snapshots')
+        self.catalog_path = os.path.join(backup_dir, 'catalog.json')
+        self.gc_path = os.path.join(backup_dir, 'gc.json')
+        # 마지막으로 쓰거나 읽은 스냅샷 (ID, {사용자명: 해시})
+        self._latest = None
+        os.makedirs(self.objects_dir, exist_ok=True)
+        os.makedirs(self.snapshots_dir, exist_ok=True)
+
+    def _object_path(self, digest):
+        return os.path.join(self.objects_dir, digest[:2], digest + '.json')
+
+    def _snapshot_path(self, snapshot_id):
+        return os.path.join(self.snapshots_dir, snapshot_id + '.json')
+
+    def _put_object(self, record):
+        data = json.dumps(record, ensure_ascii=False, sort_keys=True).encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            atomic_write_bytes(path, data)
+        return digest
+
+    def _get_object(self, digest):
+        with open(self._object_path(digest), 'rb') as file:
+            data = file.read()
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise ValueError(f"백업 데이터가 손상되었습니다: {digest}")
+        return json.loads(data)
+
+    def _read_snapshot(self, snapshot_id, checksum=None):
+        with open(self._snapshot_path(snapshot_id), 'rb') as file:
+            data = file.read()
+        if checksum is not None and hashlib.sha256(data).hexdigest() != checksum:
+            raise ValueError(f"스냅샷이 손상되었습니다: {snapshot_id}")
+        return json.loads(data)
+
+    def _load_catalog(self):
+        """색인을 읽습니다. 색인이 없거나 손상된 경우에만 스냅샷 디렉토리로 다시 만듭니다."""
+        try:
+            with open(self.catalog_path, 'r', encoding='utf-8') as file:
+                return json.load(file)['snapshots']
+        except (OSError, ValueError, KeyError):
+            return self.rebuild_catalog()
+
+    def _save_catalog(self, catalog):
+        atomic_write_json(self.catalog_path, {'snapshots': catalog}, indent=None)
+
+    def rebuild_catalog(self):
+        """스냅샷 파일을 모두 검사해 색인을 새로 만듭니다."""
+        catalog = []
+        snapshot_ids = sorted(f[:-len('.json')] for f in os.listdir(self.snapshots_dir) if f.endswith('.json'))
+        for snapshot_id in snapshot_ids:
+            with open(self._snapshot_path(snapshot_id), 'rb') as file:
+                data = file.read()
+            entry = {'id': snapshot_id, 'checksum': hashlib.sha256(data).hexdigest(), 'valid': True}
+            try:
+                snapshot = json.loads(data)
+                entry['timestamp'] = snapshot['timestamp']
+                entry['users'] = len(snapshot['users'])
+                entry['content'] = _entries_digest(snapshot['users'])
+                entry['valid'] = all(os.path.exists(self._object_path(digest)) for digest in snapshot['users'].values())
+            except (ValueError, KeyError):
+                entry['valid'] = False
+            catalog.append(entry)
+        self._save_catalog(catalog)
+        return catalog
+
+    def list_snapshots(self):
+        """색인에 기록된 스냅샷 정보를 오래된 순으로 반환합니다."""
+        return self._load_catalog()
+
+    def _latest_entries(self, catalog):
+        # 색인의 마지막 정상 스냅샷 {사용자명: 해시} (다른 프로세스가 쓴 스냅샷이면 파일을 한 번 읽음)
+        if not catalog or not catalog[-1]['valid']:
+            return None
+        entry = catalog[-1]
+        if self._latest is None or self._latest[0] != entry['id']:
+            try:
+                self._latest = (entry['id'], self._read_snapshot(entry['id'], entry['checksum'])['users'])
+            except (OSError, ValueError, KeyError):
+                return None
+        return self._latest[1]
+
+    def snapshot(self, users, now=None, changed=None):
+        """현재 사용자 정보를 스냅샷으로 저장하고 스냅샷 ID를 반환합니다.
+
+        changed(바뀐 사용자명 목록)를 주면 그 밖의 사용자는 직전 스냅샷의 레코드 해시를 그대로 씁니다.
+        """
+        now = now or datetime.now()
+        # 여러 프로세스가 동시에 색인을 고치거나 정리하지 않도록 잠금
+        with file_lock(self.catalog_path):
+            catalog = self._load_catalog()
+            previous = self._latest_entries(catalog) if changed is not None else None
+            if previous is None:
+                entries = {username: self._put_object(record) for username, record in users.items()}
+            else:
+                changed = set(changed)
+                entries = {username: previous[username] if username in previous and username not in changed
+                           else self._put_object(record) for username, record in users.items()}
+            content = _entries_digest(entries)
+
+            # 직전 스냅샷과 내용이 같으면 새로 만들지 않음
+            if catalog and catalog[-1].get('content') == content and catalog[-1]['valid']:
+                self._latest = (catalog[-1]['id'], entries)
+                return catalog[-1]['id']
+
+            snapshot_id = now.strftime(SNAPSHOT_FORMAT)
+            data = json.dumps({'timestamp': now.isoformat(), 'users': entries}, ensure_ascii=False).encode('utf-8')
+            atomic_write_bytes(self._snapshot_path(snapshot_id), data)
+            catalog.append({
+                'id': snapshot_id,
+                'timestamp': now.isoformat(),
+                'checksum': hashlib.sha256(data).hexdigest(),
+                'users': len(entries),
+                'content': content,
+                'valid': True
+            })
+            self._save_catalog(catalog)
+            self._latest = (snapshot_id, entries)
+            self.prune(now)
+            if self._gc_due(now):
+                self._collect_garbage(now)
+        return snapshot_id
+
+    def restore(self, at=None, snapshot_id=None):
+        """at 시점(기본: 최신) 이전의 마지막 정상 스냅샷으로 사용자 정보를 복원합니다.
+
+        snapshot_id를 지정하면 해당 스냅샷을 복원합니다. 검증에 실패한 스냅샷은 색인에
+        손상으로 표시하고 그 이전 정상 스냅샷을 시도합니다. 복원할 수 없으면 None을 반환합니다.
+        """
+        catalog = self._load_catalog()
+        limit = at.strftime(SNAPSHOT_FORMAT) if at is not None else None
+        for entry in reversed(catalog):
+            if not entry['valid']:
+                continue
+            if snapshot_id is not None and entry['id'] != snapshot_id:
+                continue
+            if limit is not None and entry['id'] > limit:
+                continue
+            try:
+                entries = self._read_snapshot(entry['id'], entry['checksum'])['users']
+                return {username: self._get_object(digest) for username, digest in entries.items()}
+            except (OSError, ValueError, KeyError):
+                entry['valid'] = False
+                self._save_catalog(catalog)
+        return None
+
+    def prune(self, now=None):
+        """보존 정책에 맞지 않는 스냅샷을 삭제합니다. (레코드는 collect_garbage()가 정리)"""
+        now = now or datetime.now()
+        catalog = self._load_catalog()
+        snapshot_ids = [entry['id'] for entry in catalog]
+        keep = set(snapshot_ids[-1:])
+        seen_buckets = set()
+        for snapshot_id in reversed(snapshot_ids):
+            age = now - datetime.strptime(snapshot_id, SNAPSHOT_FORMAT)
+            for period, bucket_format in RETENTION_TIERS:
+                if age <= period:
+                    if bucket_format is None:
+                        keep.add(snapshot_id)
+                    else:
+                        bucket = (bucket_format, datetime.strptime(snapshot_id, SNAPSHOT_FORMAT).strftime(bucket_format))
+                        if bucket not in seen_buckets:
+                            seen_buckets.add(bucket)
+                            keep.add(snapshot_id)
+                    break
+
+        removed = [snapshot_id for snapshot_id in snapshot_ids if snapshot_id not in keep]
+        if removed:
+            self._save_catalog([entry for entry in catalog if entry['id'] in keep])
+            for snapshot_id in removed:
+                try:
+                    os.remove(self._snapshot_path(snapshot_id))
+                except OSError:
+                    pass
+        return removed
+
+    def _gc_due(self, now):
+        try:
+            with open(self.gc_path, 'r', encoding='utf-8') as file:
+                last = datetime.fromisoformat(json.load(file)['timestamp'])
+        except (OSError, ValueError, KeyError):
+            return True
+        return now - last >= GC_INTERVAL
+
+    def collect_garbage(self, now=None):
+        """남아 있는 스냅샷이 참조하지 않는 레코드를 삭제하고 삭제한 수를 반환합니다.
+
+        모든 스냅샷과 레코드를 훑으므로 저장할 때마다가 아니라 GC_INTERVAL마다 한 번 또는 명령줄에서 실행합니다.
+        """
+        with file_lock(self.catalog_path):
+            return self._collect_garbage(now or datetime.now())
+
+    def _collect_garbage(self, now):
+        # 호출하는 쪽에서 색인 잠금을 잡고 있어야 함
+        referenced = set()
+        for entry in self._load_catalog():
+            try:
+                referenced.update(self._read_snapshot(entry['id'])['users'].values())
+            except (OSError, ValueError, KeyError):
+                continue
+        removed = 0
+        for prefix in os.listdir(self.objects_dir):
+            prefix_dir = os.path.join(self.objects_dir, prefix)
+            for name in os.listdir(prefix_dir):
+                if name[:-len('.json')] not in referenced:
+                    os.remove(os.path.join(prefix_dir, name))
+                    removed += 1
+        atomic_write_json(self.gc_path, {'timestamp': now.isoformat(), 'removed': removed})
+        return removed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="사용자 정보 백업 스냅샷 조회 및 복원")
+    parser.add_argument('--backup-dir', default='backup', help="백업 디렉토리 (기본: backup)")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('list', help="스냅샷 목록 보기")
+    restore_parser = subparsers.add_parser('restore', help="스냅샷을 설정 파일로 복원")
+    restore_parser.add_argument('--id', dest='snapshot_id', help="복원할 스냅샷 ID (기본: 마지막 정상 스냅샷)")
+    restore_parser.add_argument('--at', help="이 시각 이전의 마지막 정상 스냅샷 복원 (예: 2024-01-31T18:00)")
+    restore_parser.add_argument('--config', default='./users.json', help="복원할 설정 파일 (기본: ./users.json)")
+    subparsers.add_parser('rebuild', help="스냅샷 디렉토리를 검사해 색인을 다시 만들기")
+    subparsers.add_parser('gc', help="보존 정책을 적용하고 참조되지 않는 레코드 삭제")
+    args = parser.parse_args(argv)
+
+    store = BackupStore(args.backup_dir)
+    if args.command == 'list':
+        for entry in store.list_snapshots():
+            status = '정상' if entry['valid'] else '손상'
+            print(f"{entry['id']}  {entry.get('timestamp', '-')}  사용자 {entry.get('users', '-')}명  {status}")
+    elif args.command == 'rebuild':
+        catalog = store.rebuild_catalog()
+        print(f"스냅샷 {len(catalog)}개로 색인을 다시 만들었습니다.")
+    elif args.command == 'gc':
+        with file_lock(store.catalog_path):
+            pruned = store.prune()
+            removed = store._collect_garbage(datetime.now())
+        print(f"스냅샷 {len(pruned)}개와 레코드 {removed}개를 삭제했습니다.")
+    else:
+        at = datetime.fromisoformat(args.at) if args.at else None
+        data = store.restore(at=at, snapshot_id=args.snapshot_id)
+        if data is None:
+            print("복원할 수 있는 스냅샷이 없습니다.")
+            return 1
+        with file_lock(args.config):
+            atomic_write_json(args.config, data)
+        print(f"사용자 {len(data)}명의 정보를 {args.config}에 복원했습니다.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
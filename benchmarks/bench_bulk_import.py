@@ -0,0 +1,102 @@
+"""증권사 내보내기 파일 일괄 가져오기 처리량 측정
+
+10,000행 CSV(UTF-8, CP949)를 청크 크기별로 가져오는 시간과 초당 행 수를 측정하고,
+종목 추가 폼처럼 한 종목마다 users.json을 다시 쓰는 방식과 한 번에 저장하는 방식의 저장 시간을 비교합니다.
+openpyxl이 설치되어 있으면 같은 데이터의 XLSX 파일도 측정합니다.
+
+    python benchmarks/bench_bulk_import.py
+"""
+import io
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from holding_import import import_holdings
+from user_store import SimpleUserManager
+from stock_schema import MONTHS, holdings_to_dicts
+
+
+def make_statement(count, seed=0):
+    # 천 단위 구분 기호, 통화 기호, 빈 배당 칸, 잘못된 행(1%)이 섞인 내보내기 파일
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({
+        '종목명': [f'종목{i}' for i in range(count)],
+        '보유수량': rng.integers(1, 5000, count).astype(str),
+        '평균단가': [f'${value:,.2f}' for value in rng.uniform(5, 2000, count)],
+        '현재가': [f'{value:,.2f}' for value in rng.uniform(5, 2000, count)],
+        '통화': rng.choice(['USD', 'KRW', 'JPY', ''], count),
+        '매수일': [f'20{10 + i % 14:02d}-{i % 12 + 1:02d}-{i % 28 + 1:02d}' for i in range(count)]
+    })
+    dividends = np.round(rng.uniform(0, 5, (count, 12)) * (rng.random((count, 12)) < 0.4), 2)
+    for i, month in enumerate(MONTHS):
+        frame[month] = np.where(dividends[:, i] > 0, dividends[:, i].astype(str), '')
+    frame.loc[::100, '보유수량'] = '-1'
+    return frame
+
+
+def timeit(func, repeat=3):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - start) / repeat, result
+
+
+def bench_files(frame):
+    count = len(frame)
+    files = {
+        'CSV (UTF-8)': ('statement.csv', frame.to_csv(index=False).encode('utf-8-sig')),
+        'CSV (CP949)': ('statement.csv', frame.to_csv(index=False).encode('cp949'))
+    }
+    try:
+        buffer = io.BytesIO()
+        frame.to_excel(buffer, index=False)
+        files['XLSX'] = ('statement.xlsx', buffer.getvalue())
+    except ImportError:
+        print("(openpyxl이 없어 XLSX는 건너뜀)")
+
+    print(f"{'형식':>12} {'청크 (행)':>10} {'시간 (ms)':>10} {'행/초':>10} {'가져온 종목':>10} {'오류 행':>8}")
+    for label, (filename, data) in files.items():
+        for chunk_rows in (1000, 5000, 20000):
+            seconds, result = timeit(lambda: import_holdings(io.BytesIO(data), filename, chunk_rows=chunk_rows))
+            print(f"{label:>12} {chunk_rows:>10,} {seconds * 1000:>10.1f} {count / seconds:>10,.0f} "
+                  f"{len(result):>10,} {result.error_count:>8,}")
+    # 파생 값(총 투자금, 손익 등)은 가져온 종목 전체를 Portfolio 벡터 연산으로 한 번에 계산
+    result = import_holdings(io.BytesIO(files['CSV (UTF-8)'][1]), 'statement.csv')
+    seconds, _ = timeit(lambda: result.portfolio().totals())
+    print(f"파생 값 계산 ({len(result):,}종목): {seconds * 1000:.2f} ms")
+    return result
+
+
+def bench_saves(result, counts=(50, 150)):
+    # 종목 추가 폼 방식(종목마다 저장)과 일괄 가져오기(한 번 저장)의 users.json 쓰기 시간
+    workdir = tempfile.mkdtemp()
+    os.chdir(workdir)
+    manager = SimpleUserManager('users.json')
+    manager.register_user('bench', '벤치', 'bench@example.com', 'password')
+    stocks = holdings_to_dicts(result.holdings())
+    print(f"{'종목 수':>8} {'종목마다 저장 (ms)':>18} {'한 번 저장 (ms)':>16}")
+    for count in counts:
+        start = time.perf_counter()
+        for i in range(1, count + 1):
+            manager.save_user_stocks('bench', stocks[:i])
+        per_row = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        manager.save_user_stocks('bench', stocks[:count])
+        single = (time.perf_counter() - start) * 1000
+        print(f"{count:>8} {per_row:>18.1f} {single:>16.1f}")
+
+
+def main():
+    frame = make_statement(10_000)
+    result = bench_files(frame)
+    bench_saves(result)
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,67 @@
+"""명령줄 도구 시작 시간과 전체 사용자 재평가 시간 측정
+
+Streamlit 앱 모듈(simple_auth)을 불러오는 시간과 Streamlit 없는 명령줄 도구(yieldnote.py)로 한 사용자의
+합계를 보는 전체 프로세스 시간을 비교하고, 사용자 수별 revalue 보고서 작성 시간을 측정합니다.
+
+    python benchmarks/bench_cli.py
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO)
+
+from stock_schema import MONTHS
+from user_store import SimpleUserManager
+from yieldnote import load_rates, revalue_report
+
+
+def run(args, repeat=3):
+    # 새 프로세스로 실행한 평균 시간 (초)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        subprocess.run([sys.executable, *args], check=True, stdout=subprocess.DEVNULL, cwd=os.getcwd(),
+                       env=dict(os.environ, PYTHONPATH=REPO))
+    return (time.perf_counter() - start) / repeat
+
+
+def make_users(manager, count, per_user, rng):
+    # 비밀번호 해싱 없이 사용자 레코드를 바로 만들고 한 번에 저장
+    for i in range(count):
+        manager.users[f'user{i}'] = {'name': f'user{i}', 'email': '', 'password': '', 'stocks': [{
+            '종목명': f'T{j}',
+            '보유 수량': float(rng.integers(1, 100)),
+            '매수 단가': float(rng.uniform(10, 200)),
+            '현재 주가': float(rng.uniform(10, 200)),
+            '월별 배당금': {month: float(rng.uniform(0, 2)) for month in MONTHS},
+            '통화': 'KRW' if j % 4 == 0 else 'USD'
+        } for j in range(per_user)]}
+    manager.save_config()
+
+
+def main():
+    os.chdir(tempfile.mkdtemp())
+    manager = SimpleUserManager('users.json')
+    streamlit_s = run(['-c', 'import simple_auth'])
+    cli_s = run([os.path.join(REPO, 'yieldnote.py'), 'summary', 'admin'])
+    print(f"simple_auth 불러오기 (Streamlit 포함): {streamlit_s * 1000:.0f} ms")
+    print(f"yieldnote.py summary 전체 실행: {cli_s * 1000:.0f} ms")
+
+    rng = np.random.default_rng(0)
+    provider, rates = load_rates()
+    print(f"{'사용자 수':>8} {'종목 수':>8} {'재평가 (ms)':>12} {'사용자당 (ms)':>14}")
+    for count in (100, 1000, 5000):
+        make_users(manager, count, 20, rng)
+        start = time.perf_counter()
+        report = revalue_report(manager, provider, rates, 'USD')
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"{len(report):>8,} {int(report['종목 수'].sum()):>8,} {elapsed:>12.0f} {elapsed / len(report):>14.2f}")
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
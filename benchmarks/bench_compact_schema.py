@@ -0,0 +1,50 @@
+"""파생 값 저장 여부에 따른 users.json 크기와 저장/로드 시간 비교
+
+    python benchmarks/bench_compact_schema.py
+"""
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_portfolio import make_stocks
+from portfolio import Portfolio
+from stock_schema import compact_stocks
+
+
+def measure(users, repeat=5):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        text = json.dumps(users, ensure_ascii=False, indent=4)
+    dump_ms = (time.perf_counter() - start) / repeat * 1000
+    start = time.perf_counter()
+    for _ in range(repeat):
+        json.loads(text)
+    load_ms = (time.perf_counter() - start) / repeat * 1000
+    return len(text.encode('utf-8')), dump_ms, load_ms
+
+
+def main():
+    user_count, stocks_per_user = 1000, 30
+    legacy = {f'user{i}': {'name': f'사용자{i}', 'stocks': make_stocks(stocks_per_user)} for i in range(user_count)}
+    compact = {username: {'name': user['name'], 'stocks': compact_stocks(user['stocks'])}
+               for username, user in legacy.items()}
+
+    print(f"사용자 {user_count}명 × 종목 {stocks_per_user}개")
+    print(f"{'형식':>8} {'크기 (KB)':>12} {'저장 (ms)':>12} {'로드 (ms)':>12}")
+    for label, users in (('이전', legacy), ('입력 값만', compact)):
+        size, dump_ms, load_ms = measure(users)
+        print(f"{label:>8} {size / 1024:>12.0f} {dump_ms:>12.1f} {load_ms:>12.1f}")
+
+    # 파생 값은 포트폴리오 버전당 한 번만 계산
+    stocks = compact['user0']['stocks']
+    start = time.perf_counter()
+    for _ in range(1000):
+        Portfolio.from_stocks(stocks).totals()
+    print(f"사용자 1명 파생 값 계산: {(time.perf_counter() - start):.3f} ms/회")
+
+
+if __name__ == '__main__':
+    main()
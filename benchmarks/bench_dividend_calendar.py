@@ -0,0 +1,69 @@
+"""배당 일정 달력의 기간 조회 비용 측정
+
+종목 수 × 10년치 배당 일정을 이벤트로 펼친 뒤, 월별(12개월)/연도별(10년)/최근 12개월 수입을
+전체 이벤트를 날짜 조건으로 거르는 방식(불리언 마스크)과 지급일 색인(np.searchsorted + 누적 합)으로
+계산하는 시간을 비교합니다.
+
+    python benchmarks/bench_dividend_calendar.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dividend_calendar import SCHEDULE_FREQUENCIES, DividendCalendar, make_schedule
+
+
+def make_schedules(count):
+    # 주기와 배당락일을 섞은 종목별 배당 일정
+    frequencies = list(SCHEDULE_FREQUENCIES)
+    return [make_schedule(0.1 + (i % 20) * 0.05, frequencies[i % len(frequencies)],
+                          f'2015-{i % 12 + 1:02d}-{i % 28 + 1:02d}', 10 + i % 30)
+            for i in range(count)]
+
+
+def scan_queries(calendar, shares):
+    # 기존 방식에 해당: 기간마다 전체 이벤트에 날짜 조건을 걸어 합산
+    income = calendar.per_share * shares[calendar.holdings]
+    pay_dates = calendar.pay_dates
+
+    def between(start, end):
+        start, end = np.datetime64(start, 'D'), np.datetime64(end, 'D')
+        return income[(pay_dates >= start) & (pay_dates < end)].sum()
+
+    monthly = [between(f'2024-{m:02d}-01', f'2024-{m + 1:02d}-01' if m < 12 else '2025-01-01')
+               for m in range(1, 13)]
+    yearly = [between(f'{y}-01-01', f'{y + 1}-01-01') for y in range(2015, 2025)]
+    return monthly, yearly, between('2024-07-01', '2025-07-01')
+
+
+def indexed_queries(calendar, shares):
+    return (calendar.monthly_income(shares, 2024), calendar.yearly_income(shares, 2015, 2024),
+            calendar.trailing_income(shares, '2025-06-30'))
+
+
+def timeit(func, *args, repeat=5):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(*args)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    print(f"{'종목 수':>8} {'이벤트 수':>10} {'달력 생성 (ms)':>14} {'전체 검사 (ms)':>14} {'색인 조회 (ms)':>14}")
+    for count in (100, 1000, 10000):
+        schedules = make_schedules(count)
+        start = time.perf_counter()
+        calendar = DividendCalendar.from_schedules(schedules, '2014-01-01', '2026-01-01')
+        build_ms = (time.perf_counter() - start) * 1000
+        shares = np.arange(1, count + 1, dtype=float)
+        indexed_queries(calendar, shares)  # 누적 합은 보유 수량이 바뀔 때만 다시 만듦
+        print(f"{count:>8} {len(calendar):>10,} {build_ms:>14.1f} {timeit(scan_queries, calendar, shares):>14.2f} "
+              f"{timeit(indexed_queries, calendar, shares):>14.3f}")
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,50 @@
+"""월별 배당금 차트 비용 측정: 종목별 차트 N개 vs 전체 종목 차트 하나
+
+차트 명세(Vega-Lite JSON) 크기와 생성 시간을 비교합니다. (브라우저로 보내는 데이터 크기의 근사치)
+
+    python benchmarks/bench_dividend_chart.py
+"""
+import os
+import sys
+import time
+
+import altair as alt
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from charts import dividend_heatmap
+from portfolio import Portfolio
+from bench_portfolio import make_stocks
+
+
+def per_stock_charts(portfolio):
+    # 기존 방식: 종목마다 월별 배당금 막대 차트 하나
+    monthly = portfolio.monthly_frame()
+    return [
+        alt.Chart(monthly.iloc[i].rename('배당금').rename_axis('월').reset_index()).mark_bar()
+        .encode(x='월:N', y='배당금:Q').to_json()
+        for i in range(len(portfolio))
+    ]
+
+
+def single_chart(portfolio, top_n):
+    return [dividend_heatmap(portfolio.dividend_pivot(top_n)).to_json()]
+
+
+def measure(func, *args):
+    start = time.perf_counter()
+    specs = func(*args)
+    return (time.perf_counter() - start) * 1000, sum(len(spec.encode('utf-8')) for spec in specs)
+
+
+def main():
+    print(f"{'종목 수':>8} {'종목별 차트 (ms)':>16} {'크기 (KB)':>10} {'히트맵 상위 20 (ms)':>20} {'크기 (KB)':>10}")
+    for count in (10, 100, 500):
+        portfolio = Portfolio.from_stocks(make_stocks(count))
+        loop_ms, loop_bytes = measure(per_stock_charts, portfolio)
+        single_ms, single_bytes = measure(single_chart, portfolio, 20)
+        print(f"{count:>8} {loop_ms:>16.1f} {loop_bytes / 1024:>10.1f} {single_ms:>20.1f} {single_bytes / 1024:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,54 @@
+"""세션 메모리 사용량 비교: 한글 키 딕셔너리 vs Holding 레코드
+
+    python benchmarks/bench_holding_memory.py [세션 수] [세션당 종목 수]   (기본: 10000 50)
+"""
+import os
+import sys
+import random
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stock_schema import MONTHS, Holding
+
+
+def make_dict_sessions(sessions, holdings, rng):
+    return [
+        [{
+            '종목명': f'종목{j}', '보유 수량': rng.uniform(1, 100),
+            '매수 단가': rng.uniform(10, 200), '현재 주가': rng.uniform(10, 200),
+            '월별 배당금': {month: rng.uniform(0, 2) for month in MONTHS}
+        } for j in range(holdings)]
+        for _ in range(sessions)
+    ]
+
+
+def make_holding_sessions(sessions, holdings, rng):
+    return [
+        [Holding(f'종목{j}', rng.uniform(1, 100), rng.uniform(10, 200), rng.uniform(10, 200),
+                 [rng.uniform(0, 2) for _ in MONTHS]) for j in range(holdings)]
+        for _ in range(sessions)
+    ]
+
+
+def measure(builder, sessions, holdings):
+    tracemalloc.start()
+    data = builder(sessions, holdings, random.Random(0))
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del data
+    return current
+
+
+def main():
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    holdings = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    count = sessions * holdings
+    print(f"세션 {sessions}개 × 종목 {holdings}개 = {count:,}건")
+    for label, builder in (('딕셔너리', make_dict_sessions), ('Holding', make_holding_sessions)):
+        size = measure(builder, sessions, holdings)
+        print(f"{label:>8}: {size / 1024 / 1024:,.1f} MB ({size / count:,.0f} B/건)")
+
+
+if __name__ == '__main__':
+    main()
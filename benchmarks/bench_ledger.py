@@ -0,0 +1,87 @@
+"""거래 내역 누적 취득가 갱신 비용 측정
+
+매수/매도/분할이 섞인 거래를 한 건씩 추가할 때, 거래마다 전체 내역을 다시 계산하는 방식과
+Ledger의 누적 갱신 방식의 총 시간을 비교하고, 저장된 원장을 불러오는 시간(누적 상태 사용 vs 다시 계산)과
+저장 크기를 측정합니다.
+
+    python benchmarks/bench_ledger.py
+"""
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ledger import Ledger
+
+
+def make_transactions(count, seed=0):
+    # 매수 70%, 매도 28%(보유 수량 안에서), 분할 2%인 날짜순 거래
+    rng = np.random.default_rng(seed)
+    start = np.datetime64('2000-01-01')
+    transactions, shares = [], 0.0
+    for i, roll in enumerate(rng.random(count)):
+        day = str(start + i // 5)
+        price = float(rng.uniform(10, 200))
+        if roll < 0.02 and shares > 0:
+            transactions.append(('분할', day, 2.0, 0.0))
+            shares *= 2
+        elif roll < 0.30 and shares > 1:
+            quantity = float(np.floor(rng.uniform(1, shares)))
+            transactions.append(('매도', day, quantity, price))
+            shares -= quantity
+        else:
+            quantity = float(rng.integers(1, 100))
+            transactions.append(('매수', day, quantity, price))
+            shares += quantity
+    return transactions
+
+
+def replay_each(transactions):
+    # 기존 방식에 해당: 거래를 추가할 때마다 처음부터 다시 계산
+    for i in range(1, len(transactions) + 1):
+        ledger = Ledger()
+        ledger.extend(transactions[:i])
+    return ledger
+
+
+def append_each(transactions):
+    ledger = Ledger()
+    for transaction in transactions:
+        ledger.add(*transaction)
+    return ledger
+
+
+def main():
+    print(f"{'거래 수':>8} {'매번 재계산 (ms)':>16} {'누적 갱신 (ms)':>14} {'거래당 (µs)':>12}")
+    for count in (500, 2000, 10000, 50000):
+        transactions = make_transactions(count)
+        replay_ms = '-'
+        if count <= 2000:
+            start = time.perf_counter()
+            replay_each(transactions)
+            replay_ms = f"{(time.perf_counter() - start) * 1000:.1f}"
+        start = time.perf_counter()
+        ledger = append_each(transactions)
+        append_ms = (time.perf_counter() - start) * 1000
+        print(f"{count:>8,} {replay_ms:>16} {append_ms:>14.1f} {append_ms / count * 1000:>12.1f}")
+
+    # 저장/불러오기: 누적 상태를 함께 저장하면 불러올 때 거래를 다시 계산하지 않음
+    text = json.dumps(ledger.to_dict(), ensure_ascii=False)
+    data = json.loads(text)
+    start = time.perf_counter()
+    Ledger.from_dict(data)
+    state_ms = (time.perf_counter() - start) * 1000
+    data['상태'] = None
+    start = time.perf_counter()
+    Ledger.from_dict(data)
+    replay_ms = (time.perf_counter() - start) * 1000
+    print(f"거래 {len(ledger):,}건 저장 크기 {len(text.encode('utf-8')) / 1024:,.0f} KB · "
+          f"불러오기 {state_ms:.1f} ms (누적 상태 사용) / {replay_ms:.1f} ms (다시 계산)")
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
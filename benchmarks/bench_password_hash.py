@@ -0,0 +1,53 @@
+"""비밀번호 해시 비용에 따른 로그인 처리량 측정
+
+scrypt 비용(N = 2 ** cost)별로 해싱 1회 시간, 메모리 사용량, 초당 로그인 수를 측정하고,
+이전 방식(SHA-256)과 검증 캐시(PasswordVerifier)에 걸린 재로그인과 비교합니다.
+
+    python benchmarks/bench_password_hash.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from passwords import LegacySHA256Hasher, PasswordVerifier, ScryptHasher
+
+
+def logins_per_second(verify, duration=1.0):
+    # duration초 동안(최소 3회) 반복한 검증 횟수로 초당 로그인 수 계산
+    count = 0
+    start = time.perf_counter()
+    while count < 3 or time.perf_counter() - start < duration:
+        verify()
+        count += 1
+    elapsed = time.perf_counter() - start
+    return count / elapsed, elapsed / count * 1000
+
+
+def main():
+    password = 'correct horse battery staple'
+    print(f"{'방식':>16} {'메모리 (MB)':>12} {'로그인 1회 (ms)':>16} {'초당 로그인':>12}")
+
+    legacy = LegacySHA256Hasher()
+    stored = legacy.hash(password)
+    rate, ms = logins_per_second(lambda: legacy.verify(password, stored))
+    print(f"{'SHA-256 (이전)':>16} {'-':>12} {ms:>16.4f} {rate:>12,.0f}")
+
+    for cost in (10, 12, 14, 15, 16):
+        hasher = ScryptHasher(cost)
+        stored = hasher.hash(password)
+        rate, ms = logins_per_second(lambda: hasher.verify(password, stored))
+        memory = 128 * hasher.r * hasher.n / 1024 / 1024
+        print(f"{f'scrypt 2^{cost}':>16} {memory:>12.0f} {ms:>16.2f} {rate:>12,.1f}")
+
+    # 검증에 성공한 뒤 ttl 안에 같은 비밀번호로 다시 로그인하는 경우 (HMAC 한 번)
+    verifier = PasswordVerifier(ScryptHasher())
+    stored = verifier.hash(password)
+    verifier.verify('user', password, stored)
+    rate, ms = logins_per_second(lambda: verifier.verify('user', password, stored))
+    print(f"{'검증 캐시 적중':>16} {'-':>12} {ms:>16.4f} {rate:>12,.0f}")
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,81 @@
+"""종목 수에 따른 포트폴리오 계산 시간 측정
+
+기존 방식(딕셔너리 목록을 합계/환산마다 반복 순회)과 Portfolio 엔진(열 단위 벡터 연산)을 비교합니다.
+
+    python benchmarks/bench_portfolio.py
+"""
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from portfolio import Portfolio
+from stock_schema import MONTHS
+
+
+def make_stocks(count):
+    # 이전 형식(파생 값을 함께 저장)의 종목 딕셔너리 생성
+    rng = random.Random(0)
+    stocks = []
+    for i in range(count):
+        quantity, purchase_price, current_price = rng.uniform(1, 100), rng.uniform(10, 200), rng.uniform(10, 200)
+        monthly = {month: rng.uniform(0, 2) for month in MONTHS}
+        total_investment = quantity * purchase_price
+        profit_loss = quantity * current_price + sum(monthly.values()) - total_investment
+        stocks.append({
+            '종목명': f'종목{i}', '보유 수량': quantity, '매수 단가': purchase_price, '현재 주가': current_price,
+            '총 투자금': total_investment, '현재 평가금': quantity * current_price,
+            '누적 배당금': sum(monthly.values()), '실제 손익': profit_loss,
+            '수익률 (%)': profit_loss / total_investment * 100, '월별 배당금': monthly
+        })
+    return stocks
+
+
+def loop_pass(stocks, rate):
+    # 기존 대시보드와 같은 방식: 합계 4번 + 종목별 환산 반복
+    total_investment = sum(stock['총 투자금'] for stock in stocks)
+    total_current_value = sum(stock['현재 평가금'] for stock in stocks)
+    sum(stock['누적 배당금'] for stock in stocks)
+    sum(stock['실제 손익'] for stock in stocks)
+    for _ in range(3):
+        for stock in stocks:
+            stock['총 투자금'] * rate, stock['현재 평가금'] * rate, stock['누적 배당금'] * rate
+    [stock['총 투자금'] / total_investment for stock in stocks]
+    [stock['현재 평가금'] / total_current_value for stock in stocks]
+    monthly_sums = dict.fromkeys(MONTHS, 0)
+    for stock in stocks:
+        for month, amount in stock['월별 배당금'].items():
+            monthly_sums[month] += amount
+
+
+def vector_pass(columns, rate):
+    portfolio = Portfolio(*columns)
+    portfolio.totals()
+    portfolio.weights()
+    portfolio.monthly_totals()
+    portfolio.total_investment * rate, portfolio.current_value * rate, portfolio.total_dividend * rate
+
+
+def timeit(func, *args, repeat=5):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(*args)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    # 변환: 딕셔너리 목록 → 열 배열 (포트폴리오가 바뀔 때만 필요), 계산: 파생 값/합계/비중/환산 전체
+    print(f"{'종목 수':>8} {'반복문 (ms)':>14} {'변환 (ms)':>12} {'벡터 계산 (ms)':>16}")
+    for count in (100, 1000, 10000, 50000):
+        stocks = make_stocks(count)
+        portfolio = Portfolio.from_stocks(stocks)
+        columns = (portfolio.names, portfolio.quantity, portfolio.purchase_price,
+                   portfolio.current_price, portfolio.dividends)
+        print(f"{count:>8} {timeit(loop_pass, stocks, 1350.0):>14.2f} "
+              f"{timeit(Portfolio.from_stocks, stocks):>12.2f} {timeit(vector_pass, columns, 1350.0):>16.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""시세 저장소 조회/일괄 갱신 시간 측정
+
+티커 수 × 거래일 수만큼의 종가를 저장하는 시간과, 여러 사용자가 같은 티커를 나눠 가진 전체 종목의
+기준일 종가를 찾는 시간(종목마다 찾기 vs 고유 티커만 한 번에 찾기)을 비교하고,
+저장 방식별로 모든 사용자의 현재 주가를 한 번에 갱신하는 시간을 측정합니다.
+
+    python benchmarks/bench_price_store.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from price_store import PriceStore, refresh_all_prices
+from user_store import make_user_manager
+from stock_schema import MONTHS
+
+
+def make_prices(tickers, days, seed=0):
+    # 티커마다 같은 거래일의 종가 (무작위 걷기)
+    rng = np.random.default_rng(seed)
+    names = np.repeat(np.array([f'T{i}' for i in range(tickers)], dtype=object), days)
+    dates = np.tile(np.datetime64('2020-01-01') + np.arange(days), tickers)
+    closes = np.abs(100 + np.cumsum(rng.normal(0, 1, (tickers, days)), axis=1)).ravel() + 1
+    return names, dates, closes
+
+
+def make_stocks(count, tickers, rng):
+    return [{
+        '종목명': f'T{ticker}',
+        '보유 수량': 10.0,
+        '매수 단가': 100.0,
+        '현재 주가': 100.0,
+        '월별 배당금': {month: 0.0 for month in MONTHS}
+    } for ticker in rng.integers(0, tickers, count)]
+
+
+def bench_lookup(store, names, as_of):
+    start = time.perf_counter()
+    each = [store.latest([name], as_of)[0] for name in names]
+    each_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    batch = store.latest(names, as_of)
+    batch_ms = (time.perf_counter() - start) * 1000
+    assert np.allclose(each, batch)
+    return each_ms, batch_ms
+
+
+def main():
+    workdir = tempfile.mkdtemp()
+    os.chdir(workdir)
+    tickers, days = 2000, 1250
+    store = PriceStore('prices')
+    start = time.perf_counter()
+    store.ingest(*make_prices(tickers, days))
+    ingest_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    store.ingest(*make_prices(tickers, 1, seed=1))
+    append_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    reopened = PriceStore('prices')
+    open_ms = (time.perf_counter() - start) * 1000
+    print(f"시세 {len(store):,}건 (티커 {tickers:,}개 × {days:,}일) 저장 {ingest_ms:.0f} ms, "
+          f"하루치 추가 {append_ms:.0f} ms, 다시 열기 {open_ms:.1f} ms")
+
+    rng = np.random.default_rng(0)
+    as_of = str(np.datetime64('2020-01-01') + days // 2)
+    print(f"{'종목 수':>8} {'종목마다 찾기 (ms)':>18} {'고유 티커 한 번 (ms)':>20}")
+    for count in (1000, 10000, 50000):
+        names = [f'T{ticker}' for ticker in rng.integers(0, tickers, count)]
+        each_ms, batch_ms = bench_lookup(reopened, names, as_of)
+        print(f"{count:>8,} {each_ms:>18.1f} {batch_ms:>20.1f}")
+
+    users, per_user = 200, 25
+    print(f"사용자 {users:,}명 × 종목 {per_user}개 현재 주가 일괄 갱신")
+    print(f"{'저장 방식':>10} {'갱신 (ms)':>10} {'바뀐 종목':>10}")
+    for storage in ('json', 'sharded', 'sqlite'):
+        manager = make_user_manager(storage)
+        for i in range(users):
+            username = f'{storage}{i}'
+            manager.register_user(username, username, f'{username}@example.com', 'password')
+            manager.save_user_stocks(username, make_stocks(per_user, tickers, rng))
+        start = time.perf_counter()
+        changed = refresh_all_prices(manager, reopened, as_of)
+        refresh_ms = (time.perf_counter() - start) * 1000
+        print(f"{storage:>10} {refresh_ms:>10.1f} {changed:>10,}")
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,55 @@
+"""배당 수입 예측 시뮬레이션 시간 측정
+
+종목 수, 예측 기간, 시나리오 수, 재투자(DRIP) 여부에 따라 project_income 한 번의 시간을 측정합니다.
+Streamlit rerun 안에서 쓸 수 있도록 수천 개 시나리오도 1초 안에 끝나는지 확인합니다.
+
+    python benchmarks/bench_projection.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from projection import max_scenarios, project_income
+
+
+def make_inputs(count):
+    # 분기 배당(배당 월을 종목마다 다르게)과 월 배당을 섞은 종목
+    rng = np.random.default_rng(0)
+    quantity = rng.uniform(10, 500, count)
+    price = rng.uniform(20, 200, count)
+    monthly_dps = np.zeros((count, 12))
+    for i in range(count):
+        months = range(12) if i % 5 == 0 else range(i % 3, 12, 3)
+        monthly_dps[i, list(months)] = price[i] * 0.04 / len(months)
+    return quantity, price, monthly_dps
+
+
+def timeit(func, repeat=3):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    # 재투자 시나리오 수가 max_scenarios를 넘으면 상한까지만 계산 (괄호 안이 실제 시나리오 수)
+    print(f"{'종목 수':>8} {'기간':>6} {'시나리오':>8} {'재투자 없음 (ms)':>16} {'재투자 (ms)':>20}")
+    for count in (10, 50, 200):
+        quantity, price, monthly_dps = make_inputs(count)
+        for years, scenarios in ((10, 0), (30, 0), (10, 1000), (30, 1000), (30, 5000), (30, 10000)):
+            drip_scenarios = min(scenarios, max_scenarios(count, years, True))
+            def run(drip, scenarios):
+                return lambda: project_income(quantity, price, monthly_dps, years=years, drip=drip,
+                                              scenarios=scenarios, dividend_volatility=0.05, price_volatility=0.2)
+            drip_ms = f'{timeit(run(True, drip_scenarios)):.2f}'
+            if drip_scenarios < scenarios:
+                drip_ms += f' ({drip_scenarios:,})'
+            print(f"{count:>8} {years:>5}년 {scenarios or '-':>8} {timeit(run(False, scenarios)):>16.2f} {drip_ms:>20}")
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
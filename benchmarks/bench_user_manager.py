@@ -0,0 +1,57 @@
+"""사용자 수에 따른 rerun 지연 시간 측정
+
+기존 방식(rerun마다 SimpleUserManager 생성)과 캐시된 관리자(get_user_manager)의
+rerun당 비용을 비교합니다.
+
+    python benchmarks/bench_user_manager.py
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simple_auth import SimpleUserManager
+from stock_schema import MONTHS
+
+
+def make_users(user_count, stocks_per_user=20):
+    # 벤치마크용 사용자 데이터 생성
+    stock = {
+        '종목명': '리얼티인컴', '보유 수량': 10.0, '매수 단가': 50.0, '현재 주가': 55.0,
+        '월별 배당금': {month: 0.25 for month in MONTHS}
+    }
+    return {
+        f'user{i}': {
+            'name': f'사용자{i}', 'email': f'user{i}@example.com',
+            'password': '0' * 64, 'stocks': [dict(stock) for _ in range(stocks_per_user)]
+        }
+        for i in range(user_count)
+    }
+
+
+def timeit(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    workdir = tempfile.mkdtemp()
+    os.chdir(workdir)
+    print(f"{'사용자 수':>10} {'매 rerun 생성 (ms)':>20} {'캐시 사용 (ms)':>16}")
+    for user_count in (10, 100, 1000, 5000):
+        with open('users.json', 'w', encoding='utf-8') as file:
+            json.dump(make_users(user_count), file, ensure_ascii=False, indent=4)
+        repeat = 5 if user_count >= 1000 else 20
+        uncached = timeit(lambda: SimpleUserManager('users.json'), repeat)
+        shared = SimpleUserManager('users.json')
+        cached = timeit(shared.reload_if_changed, 1000)
+        print(f"{user_count:>10} {uncached:>20.3f} {cached:>16.4f}")
+
+
+if __name__ == '__main__':
+    main()
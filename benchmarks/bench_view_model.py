@@ -0,0 +1,81 @@
+"""통화 표시 방식 전환 비용 측정
+
+PortfolioView를 처음 만들고 세 가지 통화 보기의 표를 모두 만드는 시간과, 이미 만든 뷰에서
+통화 보기만 바꾸는 시간(라디오 버튼 전환 rerun), 통화가 섞인 포트폴리오에서 보조 표시 통화를
+처음 바꿀 때의 시간(종목별 환산 1회 + 표 생성)을 비교합니다.
+
+    python benchmarks/bench_view_model.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from currency import CURRENCIES, CrossRates
+from portfolio import Portfolio
+from view_model import CURRENCY_VIEWS, PortfolioView, currency_views
+from bench_portfolio import make_stocks
+
+
+def render_tables(view, currency_view):
+    # 대시보드와 상세 정보 탭이 rerun마다 요청하는 표
+    view.summary_table()
+    view.profit_table(currency_view)
+    view.composition_table(currency_view)
+    view.monthly_table(currency_view)
+    view.detail_table(currency_view)
+    view.summary_table(currency_view, detail=True)
+
+
+def build_all(portfolio, rate):
+    view = PortfolioView(portfolio, rate, tuple(portfolio.totals().values()))
+    for currency_view in CURRENCY_VIEWS:
+        render_tables(view, currency_view)
+    return view
+
+
+def switch_all(view):
+    for currency_view in CURRENCY_VIEWS:
+        render_tables(view, currency_view)
+
+
+def switch_currency(portfolio, rates):
+    # 새 뷰에서 USD/KRW 표를 만든 뒤 보조 통화를 JPY, EUR, HKD로 차례로 바꾸는 시간
+    view = PortfolioView(portfolio, rates)
+    render_tables(view, "모두 표시")
+    start = time.perf_counter()
+    for code in ('JPY', 'EUR', 'HKD'):
+        currencies = ('USD', code)
+        for currency_view in currency_views(currencies):
+            view.summary_table(currencies=currencies)
+            view.profit_table(currency_view, currencies)
+            view.composition_table(currency_view, currencies)
+            view.detail_table(currency_view, currencies)
+    return (time.perf_counter() - start) * 1000
+
+
+def timeit(func, *args, repeat=5):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(*args)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    print(f"{'종목 수':>8} {'생성 + 3개 보기 (ms)':>22} {'보기 전환 3회 (ms)':>20} {'보조 통화 전환 3회 (ms)':>24}")
+    rates = CrossRates({'KRW': 1350.0})
+    for count in (100, 1000, 10000):
+        stocks = make_stocks(count)
+        portfolio = Portfolio.from_stocks(stocks)
+        view = build_all(portfolio, 1350.0)
+        # 같은 종목을 통화만 섞어서 (USD, KRW, JPY, EUR, HKD 순환)
+        for i, stock in enumerate(stocks):
+            stock['통화'] = CURRENCIES[i % len(CURRENCIES)]
+        mixed = Portfolio.from_stocks(stocks)
+        print(f"{count:>8} {timeit(build_all, portfolio, 1350.0):>22.2f} {timeit(switch_all, view):>20.3f} "
+              f"{switch_currency(mixed, rates):>24.2f}")
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,30 @@
+from stock_schema import MONTHS
+
+# altair는 불러오는 데 수백 ms가 걸리므로 차트를 처음 그릴 때 불러옴 (로그인 화면에서는 불러오지 않음)
+
+
+def _long_form(pivot):
+    # 월 × 종목 표 -> (월, 종목, 배당금) 행
+    return pivot.reset_index().melt(id_vars='월', var_name='종목', value_name='배당금')
+
+
+def dividend_heatmap(pivot):
+    """종목 × 월 배당금 히트맵 (차트 하나로 전체 종목의 배당 시기를 표시)"""
+    import altair as alt
+    return alt.Chart(_long_form(pivot)).mark_rect().encode(
+        x=alt.X('월:N', sort=MONTHS, title='월'),
+        y=alt.Y('종목:N', sort=list(pivot.columns), title=None),
+        color=alt.Color('배당금:Q', scale=alt.Scale(scheme='greens'), title='배당금'),
+        tooltip=['종목', '월', alt.Tooltip('배당금:Q', format=',.2f')]
+    )
+
+
+def dividend_stacked_bar(pivot):
+    """월별 배당금 누적 막대 (종목별로 색 구분)"""
+    import altair as alt
+    return alt.Chart(_long_form(pivot)).mark_bar().encode(
+        x=alt.X('월:N', sort=MONTHS, title='월'),
+        y=alt.Y('sum(배당금):Q', title='배당금'),
+        color=alt.Color('종목:N', sort=list(pivot.columns), title='종목'),
+        tooltip=['종목', '월', alt.Tooltip('배당금:Q', format=',.2f')]
+    )
\ No newline at end of file
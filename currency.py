@@ -0,0 +1,73 @@
+from functools import cached_property
+
+import numpy as np
+
+# 지원 통화: 코드 -> (기호, 소수 자릿수)
+CURRENCY_FORMATS = {
+    'USD': ('$', 2),
+    'KRW': ('₩', 0),
+    'JPY': ('¥', 0),
+    'EUR': ('€', 2),
+    'HKD': ('HK$', 2)
+}
+CURRENCIES = list(CURRENCY_FORMATS)
+
+# 환율 데이터가 없을 때 쓰는 기본 환율 (1 USD당 통화 단위)
+DEFAULT_USD_RATES = {'USD': 1.0, 'KRW': 1350.0, 'JPY': 150.0, 'EUR': 0.92, 'HKD': 7.8}
+
+
+def format_money(values, currency):
+    """금액 목록을 통화 기호와 자릿수에 맞는 문자열 목록으로 변환합니다."""
+    symbol, digits = CURRENCY_FORMATS[currency]
+    return [f"{symbol}{value:,.{digits}f}" for value in values]
+
+
+def currency_codes(currencies):
+    """통화 코드 목록 -> CURRENCIES 기준 정수 인덱스 배열"""
+    index = {code: i for i, code in enumerate(CURRENCIES)}
+    try:
+        return np.fromiter((index[code] for code in currencies), dtype=np.intp, count=len(currencies))
+    except KeyError as e:
+        raise ValueError(f"지원하지 않는 통화입니다: {e.args[0]}") from None
+
+
+class CrossRates:
+    """지원 통화 사이의 교차 환율 행렬
+
+    1 USD당 각 통화 환율에서 matrix[i, j] = (통화 i 1단위의 통화 j 값)을 한 번 계산해 두고,
+    포트폴리오 전체 환산은 종목별 통화 인덱스로 행렬에서 환산 계수를 골라 곱하는 한 번의
+    벡터 연산으로 처리합니다. key는 환율 값이 같으면 같으므로 캐시 키로 사용합니다.
+    """
+
+    def __init__(self, usd_rates):
+        rates = dict(DEFAULT_USD_RATES)
+        rates.update({code: float(rate) for code, rate in usd_rates.items() if rate})
+        self.usd_rates = np.array([rates[code] for code in CURRENCIES], dtype=float)
+        self.key = tuple(self.usd_rates.tolist())
+
+    @classmethod
+    def from_provider(cls, provider, usd_krw=None):
+        """환율 제공자의 현재 환율로 만듭니다. (usd_krw: 화면에서 입력한 달러-원 환율)"""
+        usd_rates = {}
+        if provider is not None:
+            usd_rates = {code: provider.spot('USD', code) for code in CURRENCIES}
+        if usd_krw is not None:
+            usd_rates['KRW'] = usd_krw
+        return cls(usd_rates)
+
+    @cached_property
+    def matrix(self):
+        return self.usd_rates[None, :] / self.usd_rates[:, None]
+
+    def rate(self, base, quote):
+        """1 base = ? quote"""
+        return float(self.matrix[CURRENCIES.index(base), CURRENCIES.index(quote)])
+
+    def factors(self, codes, target):
+        """종목별 통화 인덱스 배열 -> target 통화 환산 계수 배열"""
+        return self.matrix[codes, CURRENCIES.index(target)]
+
+    def convert(self, amounts, codes, target):
+        """(종목 수, ...) 금액 배열을 target 통화로 한 번에 환산합니다."""
+        factors = self.factors(codes, target)
+        return amounts * factors.reshape((-1,) + (1,) * (np.ndim(amounts) - 1))
\ No newline at end of file
@@ -0,0 +1,185 @@
+import numpy as np
+
+from stock_schema import MONTHS
+
+# 배당 주기 -> 지급 간격 (개월)
+SCHEDULE_FREQUENCIES = {'매월': 1, '분기': 3, '반기': 6, '연간': 12}
+# 배당락일부터 지급일까지 기본 간격 (일)
+DEFAULT_PAY_LAG = 30
+
+
+def make_schedule(per_share, frequency, ex_date, pay_lag=DEFAULT_PAY_LAG, events=None):
+    """저장용 배당 일정 딕셔너리 (ex_date: 기준 배당락일 'YYYY-MM-DD' 또는 date)
+
+    events는 실제 지급된 배당 내역(dividend_event 목록)입니다. 내역이 있으면 첫 내역부터 마지막 내역의
+    배당락일까지는 내역의 금액과 날짜를 쓰고, 그 밖의 기간에만 주기 일정을 반복합니다.
+    """
+    if frequency not in SCHEDULE_FREQUENCIES:
+        raise ValueError(f"지원하지 않는 배당 주기입니다: {frequency}")
+    schedule = {
+        '주당 배당금': float(per_share),
+        '주기': frequency,
+        '배당락일': str(ex_date),
+        '지급일 간격': int(pay_lag)
+    }
+    if events:
+        schedule['배당 내역'] = sorted(events, key=lambda event: event['배당락일'])
+    return schedule
+
+
+def dividend_event(ex_date, per_share, pay_date):
+    """배당 내역 한 건 (특별 배당, 배당금 변경, 지급일 변경 등 실제 지급 기록)"""
+    return {'배당락일': str(ex_date), '지급일': str(pay_date), '주당 배당금': float(per_share)}
+
+
+def add_dividend_event(schedule, ex_date, per_share, pay_date=None):
+    """배당 내역을 추가한 새 배당 일정 (같은 배당락일의 내역은 바꾸고, 지급일이 없으면 지급일 간격으로 계산)"""
+    if pay_date is None:
+        pay_date = np.datetime64(str(ex_date), 'D') + int(schedule.get('지급일 간격', DEFAULT_PAY_LAG))
+    events = [event for event in schedule.get('배당 내역', []) if event['배당락일'] != str(ex_date)]
+    events.append(dividend_event(ex_date, per_share, pay_date))
+    return dict(schedule, **{'배당 내역': sorted(events, key=lambda event: event['배당락일'])})
+
+
+def _add_months(dates, months):
+    # datetime64[D] 배열에 개월 수를 더함 (말일을 넘으면 그 달 말일로 맞춤)
+    dates = np.asarray(dates, dtype='datetime64[D]')
+    month_starts = dates.astype('datetime64[M]')
+    days = (dates - month_starts.astype('datetime64[D]')).astype(np.int64)
+    target = month_starts + np.asarray(months)
+    month_lengths = ((target + 1).astype('datetime64[D]') - target.astype('datetime64[D]')).astype(np.int64)
+    return target.astype('datetime64[D]') + np.minimum(days, month_lengths - 1)
+
+
+def expand_schedule(schedule, start, end):
+    """배당 일정을 [start, end) 사이 배당락일의 (배당락일 배열, 지급일 배열, 주당 배당금 배열)로 펼칩니다.
+
+    기준 배당락일 앞뒤로 주기마다 반복하며, 일(日)은 기준 배당락일과 같게(말일 넘으면 말일) 둡니다.
+    배당 내역이 있으면 첫 내역부터 마지막 내역의 배당락일까지는 내역만 쓰고, 반복 일정은 그 밖에만 만듭니다.
+    """
+    step = SCHEDULE_FREQUENCIES[schedule['주기']]
+    anchor = np.datetime64(schedule['배당락일'], 'D')
+    start, end = np.datetime64(start, 'D'), np.datetime64(end, 'D')
+    anchor_month = anchor.astype('datetime64[M]').astype(np.int64)
+    first = (start.astype('datetime64[M]').astype(np.int64) - anchor_month) // step - 1
+    last = (end.astype('datetime64[M]').astype(np.int64) - anchor_month) // step + 1
+    ex_dates = _add_months(np.full(last - first + 1, anchor), np.arange(first, last + 1) * step)
+    events = schedule.get('배당 내역')
+    if events:
+        recorded = np.array([event['배당락일'] for event in events], dtype='datetime64[D]')
+        ex_dates = ex_dates[(ex_dates < recorded.min()) | (ex_dates > recorded.max())]
+    ex_dates = ex_dates[(ex_dates >= start) & (ex_dates < end)]
+    pay_dates = ex_dates + np.timedelta64(int(schedule.get('지급일 간격', DEFAULT_PAY_LAG)), 'D')
+    per_share = np.full(len(ex_dates), float(schedule['주당 배당금']))
+    if not events:
+        return ex_dates, pay_dates, per_share
+    keep = (recorded >= start) & (recorded < end)
+    return (np.concatenate((recorded[keep], ex_dates)),
+            np.concatenate((np.array([event['지급일'] for event in events], dtype='datetime64[D]')[keep], pay_dates)),
+            np.concatenate((np.array([event['주당 배당금'] for event in events], dtype=float)[keep], per_share)))
+
+
+class DividendCalendar:
+    """배당 이벤트(종목, 배당락일, 지급일, 주당 배당금)를 지급일순 배열로 보관하는 달력
+
+    이벤트는 종목별 배당 내역(실제 지급 기록)과 그 뒤의 반복 일정에서 만들어지므로, 같은 종목이라도
+    이벤트마다 금액과 지급일 간격이 다를 수 있습니다.
+
+    수입 조회는 보유 수량 배열(shares, 종목 수 길이)을 받아 이벤트별 수입의 누적 합을 한 번 만들어 두고,
+    기간 [start, end)의 합은 지급일 배열에서 np.searchsorted로 찾은 두 위치의 누적 합 차이로 구합니다.
+    따라서 이벤트가 많아도 기간 조회는 O(log n)이며, 월별/연도별 조회는 경계 날짜를 한 번에 찾습니다.
+    금액은 종목 통화 기준이므로 통화가 섞여 있으면 shares에 환산 계수를 곱해서 넘깁니다.
+    """
+
+    def __init__(self, holdings, ex_dates, pay_dates, per_share, holding_count):
+        order = np.argsort(np.asarray(pay_dates, dtype='datetime64[D]'), kind='stable')
+        self.holdings = np.asarray(holdings, dtype=np.intp)[order]
+        self.ex_dates = np.asarray(ex_dates, dtype='datetime64[D]')[order]
+        self.pay_dates = np.asarray(pay_dates, dtype='datetime64[D]')[order]
+        self.per_share = np.asarray(per_share, dtype=float)[order]
+        self.holding_count = holding_count
+        # 마지막으로 쓴 보유 수량과 그 누적 합
+        self._prefix_key = None
+        self._prefix = None
+
+    @classmethod
+    def from_schedules(cls, schedules, start, end, purchase_dates=None):
+        """종목별 배당 일정(없으면 None) 목록을 [start, end) 기간의 이벤트로 펼칩니다.
+
+        purchase_dates(종목별 매수일, NaT 가능)가 있으면 매수일 이전 배당락일의 이벤트는 제외합니다.
+        """
+        parts = []
+        for i, schedule in enumerate(schedules):
+            if not schedule:
+                continue
+            ex_dates, pay_dates, per_share = expand_schedule(schedule, start, end)
+            if purchase_dates is not None and not np.isnat(purchase_dates[i]):
+                keep = ex_dates >= purchase_dates[i]
+                ex_dates, pay_dates, per_share = ex_dates[keep], pay_dates[keep], per_share[keep]
+            parts.append((np.full(len(ex_dates), i), ex_dates, pay_dates, per_share))
+        if not parts:
+            return cls([], [], [], [], len(schedules))
+        holdings, ex_dates, pay_dates, per_share = (np.concatenate(columns) for columns in zip(*parts))
+        return cls(holdings, ex_dates, pay_dates, per_share, len(schedules))
+
+    def __len__(self):
+        return len(self.pay_dates)
+
+    def _cumulative(self, shares):
+        shares = np.asarray(shares, dtype=float)
+        key = shares.tobytes()
+        if key != self._prefix_key:
+            self._prefix = np.concatenate(([0.0], np.cumsum(self.per_share * shares[self.holdings])))
+            self._prefix_key = key
+        return self._prefix
+
+    def _positions(self, dates):
+        return np.searchsorted(self.pay_dates, np.asarray(dates, dtype='datetime64[D]'), side='left')
+
+    def income(self, shares, start, end):
+        """지급일이 [start, end)인 배당 수입 합계"""
+        prefix = self._cumulative(shares)
+        lo, hi = self._positions([start, end])
+        return float(prefix[hi] - prefix[lo])
+
+    def period_income(self, shares, boundaries):
+        """경계 날짜 목록 [b0, b1, ..., bn] -> 기간 [b0, b1), ..., [bn-1, bn)별 수입 배열"""
+        return np.diff(self._cumulative(shares)[self._positions(boundaries)])
+
+    def monthly_income(self, shares, year):
+        """year년 1월~12월 지급 수입 (12,) 배열"""
+        boundaries = np.datetime64(f'{year}-01', 'M') + np.arange(13)
+        return self.period_income(shares, boundaries.astype('datetime64[D]'))
+
+    def yearly_income(self, shares, first_year, last_year):
+        """first_year~last_year 연도별 지급 수입 배열"""
+        boundaries = np.arange(first_year, last_year + 2) - 1970
+        return self.period_income(shares, boundaries.astype('datetime64[Y]').astype('datetime64[D]'))
+
+    def trailing_income(self, shares, as_of, months=12):
+        """as_of 날짜까지(당일 포함) 최근 months개월 지급 수입"""
+        end = np.datetime64(as_of, 'D') + 1
+        return self.income(shares, _add_months(end, -months), end)
+
+    def holding_income(self, shares, start, end):
+        """지급일이 [start, end)인 종목별 수입 (종목 수,) 배열"""
+        lo, hi = self._positions([start, end])
+        holdings = self.holdings[lo:hi]
+        return np.bincount(holdings, weights=self.per_share[lo:hi] * np.asarray(shares, dtype=float)[holdings],
+                           minlength=self.holding_count)
+
+    def holding_monthly(self, shares, year):
+        """year년 종목별 월별 지급 수입 (종목 수, 12) 행렬 (기존 월별 배당금 입력 형식)"""
+        lo, hi = self._positions([f'{year}-01-01', f'{year + 1}-01-01'])
+        holdings = self.holdings[lo:hi]
+        months = self.pay_dates[lo:hi].astype('datetime64[M]').astype(np.int64) % 12
+        result = np.zeros((self.holding_count, 12))
+        np.add.at(result, (holdings, months), self.per_share[lo:hi] * np.asarray(shares, dtype=float)[holdings])
+        return result
+
+
+def schedule_monthly_dividends(schedule, quantity, year, purchase_date=None):
+    """배당 일정 하나로 year년 {월: 배당금} 딕셔너리를 만듭니다. (월별 배당금 입력을 채울 때 사용)"""
+    purchase_dates = np.array([purchase_date or 'NaT'], dtype='datetime64[D]')
+    calendar = DividendCalendar.from_schedules([schedule], f'{year - 1}-01-01', f'{year + 1}-01-01', purchase_dates)
+    return dict(zip(MONTHS, calendar.holding_monthly([quantity], year)[0].tolist()))
\ No newline at end of file
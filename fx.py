@@ -0,0 +1,369 @@
+import os
+import csv
+import json
+import time
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+
+def _stat_signature(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+def _to_dates(dates):
+    # 'YYYY-MM-DD' 문자열/날짜/None 목록 -> datetime64[D] 배열 (None은 NaT)
+    if isinstance(dates, np.ndarray) and dates.dtype == 'datetime64[D]':
+        return dates
+    return np.array([date or 'NaT' for date in dates], dtype='datetime64[D]')
+
+
+class FXProvider(ABC):
+    """환율 제공자 인터페이스
+
+    rate(base, quote, date)는 1 base = ? quote 환율을, rates(base, quote, dates)는 여러 날짜의
+    환율을 한 번에 돌려줍니다. date가 None이면 최신(현재) 환율이며, 값이 없으면 None/NaN입니다.
+    """
+
+    def rate(self, base, quote, date=None):
+        if date is None:
+            return self.spot(base, quote)
+        value = self.rates(base, quote, [date])[0]
+        return None if np.isnan(value) else float(value)
+
+    @abstractmethod
+    def spot(self, base, quote):
+        """최신 환율 (없으면 None)"""
+
+    @abstractmethod
+    def rates(self, base, quote, dates):
+        """날짜별 환율 배열 (없는 날짜는 NaN)"""
+
+    def reload_if_changed(self):
+        return False
+
+    @property
+    def version(self):
+        # 환율 데이터가 바뀌면 달라지는 값 (화면 캐시 키로 사용)
+        return None
+
+
+class RateTable(FXProvider):
+    """날짜별 환율 표 (CSVRateTable, SQLiteRateTable의 공통 부분)
+
+    통화 쌍마다 날짜순으로 정렬한 배열을 두고, 조회 날짜 이전의 가장 최근 환율을
+    np.searchsorted로 한 번에 찾습니다. 역방향 쌍만 있으면 역수를 사용하고, 둘 다 없으면
+    CrossRates처럼 USD를 거쳐 (USD -> quote) / (USD -> base)로 교차 환율을 만듭니다.
+    """
+
+    def __init__(self):
+        self._series = {}
+        self._lock = threading.Lock()
+
+    @abstractmethod
+    def _load_series(self, base, quote):
+        """(날짜 배열, 환율 배열) 또는 None"""
+
+    def _pair_series(self, base, quote):
+        # 정방향 쌍, 없으면 역방향 쌍의 역수
+        series = self._load_series(base, quote)
+        if series is None:
+            inverse = self._load_series(quote, base)
+            if inverse is not None:
+                series = (inverse[0], 1.0 / inverse[1])
+        return series
+
+    @staticmethod
+    def _cross_series(base_leg, quote_leg):
+        # USD -> base, USD -> quote 두 시계열의 날짜를 합쳐 각 날짜의 최근 환율끼리 나눔 (두 쪽 다 있는 날짜부터)
+        dates = np.union1d(base_leg[0], quote_leg[0])
+        base_positions = np.searchsorted(base_leg[0], dates, side='right') - 1
+        quote_positions = np.searchsorted(quote_leg[0], dates, side='right') - 1
+        found = (base_positions >= 0) & (quote_positions >= 0)
+        if not found.any():
+            return None
+        return dates[found], quote_leg[1][quote_positions[found]] / base_leg[1][base_positions[found]]
+
+    def _series_for(self, base, quote):
+        key = (base, quote)
+        with self._lock:
+            if key not in self._series:
+                series = self._pair_series(base, quote)
+                if series is None and 'USD' not in key:
+                    base_leg, quote_leg = self._pair_series('USD', base), self._pair_series('USD', quote)
+                    if base_leg is not None and quote_leg is not None:
+                        series = self._cross_series(base_leg, quote_leg)
+                self._series[key] = series
+            return self._series[key]
+
+    def spot(self, base, quote):
+        if base == quote:
+            return 1.0
+        series = self._series_for(base, quote)
+        return float(series[1][-1]) if series is not None else None
+
+    def rates(self, base, quote, dates):
+        dates = _to_dates(dates)
+        if base == quote:
+            return np.ones(len(dates))
+        result = np.full(len(dates), np.nan)
+        series = self._series_for(base, quote)
+        if series is None:
+            return result
+        table_dates, table_rates = series
+        # 조회 날짜 이전(같은 날 포함) 가장 최근 환율의 위치
+        positions = np.searchsorted(table_dates, dates, side='right') - 1
+        found = (positions >= 0) & ~np.isnat(dates)
+        result[found] = table_rates[positions[found]]
+        return result
+
+    @staticmethod
+    def _build_series(rows):
+        # (날짜, 환율) 행 -> 날짜순 배열 (같은 날짜는 마지막 값 사용)
+        if not rows:
+            return None
+        dates = np.array([row[0] for row in rows], dtype='datetime64[D]')
+        rates = np.array([row[1] for row in rows], dtype=float)
+        order = np.argsort(dates, kind='stable')
+        dates, rates = dates[order], rates[order]
+        keep = np.append(dates[1:] != dates[:-1], True)
+        return dates[keep], rates[keep]
+
+
+class CSVRateTable(RateTable):
+    """date,base,quote,rate 열을 가진 CSV 환율 표
+
+        date,base,quote,rate
+        2024-01-02,USD,KRW,1300.5
+    """
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        self._rows = {}
+        self._signature = None
+        self.reload_if_changed()
+
+    def reload_if_changed(self):
+        signature = _stat_signature(self.path)
+        if signature == self._signature:
+            return False
+        rows = {}
+        if signature is not None:
+            with open(self.path, newline='', encoding='utf-8') as f:
+                for row in csv.DictReader(f):
+                    rows.setdefault((row['base'].upper(), row['quote'].upper()), []).append(
+                        (row['date'], float(row['rate'])))
+        with self._lock:
+            self._rows = rows
+            self._series = {}
+            self._signature = signature
+        return True
+
+    def _load_series(self, base, quote):
+        return self._build_series(self._rows.get((base, quote)))
+
+    @property
+    def version(self):
+        return self._signature
+
+
+class SQLiteRateTable(RateTable):
+    """SQLite fx_rates 표 (date, base, quote, rate)
+
+    통화 쌍별로 한 번의 쿼리로 전체 이력을 읽어 두고 조회는 메모리에서 합니다.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS fx_rates (
+        date TEXT NOT NULL,
+        base TEXT NOT NULL,
+        quote TEXT NOT NULL,
+        rate REAL NOT NULL,
+        PRIMARY KEY (base, quote, date)
+    );
+    """
+
+    def __init__(self, db_path):
+        super().__init__()
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        self.conn.executescript(self.SCHEMA)
+        self._signature = _stat_signature(db_path)
+
+    def add_rates(self, rows):
+        """(date, base, quote, rate) 행을 추가/갱신합니다."""
+        with self._lock, self.conn:
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO fx_rates (date, base, quote, rate) VALUES (?, ?, ?, ?)',
+                [(date, base.upper(), quote.upper(), float(rate)) for date, base, quote, rate in rows]
+            )
+            self._series = {}
+        self._signature = _stat_signature(self.db_path)
+
+    def reload_if_changed(self):
+        signature = _stat_signature(self.db_path)
+        if signature == self._signature:
+            return False
+        with self._lock:
+            self._series = {}
+            self._signature = signature
+        return True
+
+    def _load_series(self, base, quote):
+        rows = self.conn.execute(
+            'SELECT date, rate FROM fx_rates WHERE base = ? AND quote = ? ORDER BY date', (base, quote)
+        ).fetchall()
+        return self._build_series(rows)
+
+    @property
+    def version(self):
+        return self._signature
+
+
+class FileFeedProvider(FXProvider):
+    """원격 환율 피드 대신 쓰는 JSON 파일 제공자 (현재 환율만 제공)
+
+        {"base": "USD", "timestamp": "2024-01-31T09:00:00", "rates": {"KRW": 1335.2, "JPY": 147.9}}
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._feed = {'base': 'USD', 'rates': {}}
+        self._signature = None
+        self.reload_if_changed()
+
+    def reload_if_changed(self):
+        signature = _stat_signature(self.path)
+        if signature == self._signature:
+            return False
+        feed = {'base': 'USD', 'rates': {}}
+        if signature is not None:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                feed = json.load(f)
+        self._feed = feed
+        self._signature = signature
+        return True
+
+    def spot(self, base, quote):
+        if base == quote:
+            return 1.0
+        feed_base = self._feed.get('base', 'USD').upper()
+        rates = {currency.upper(): rate for currency, rate in self._feed.get('rates', {}).items()}
+        rates[feed_base] = 1.0
+        if base not in rates or quote not in rates:
+            return None
+        # 피드 기준 통화를 거쳐 교차 환율 계산
+        return rates[quote] / rates[base]
+
+    def rates(self, base, quote, dates):
+        # 이력이 없으므로 과거 날짜는 NaN (호출하는 쪽에서 현재 환율로 대체)
+        return np.ones(len(dates)) if base == quote else np.full(len(dates), np.nan)
+
+    @property
+    def version(self):
+        return self._signature
+
+
+class CachedFXProvider(FXProvider):
+    """다른 제공자 앞에 두는 TTL 캐시
+
+    조회 결과를 ttl초 동안 보관하고, 만료되면 원본 데이터가 바뀌었는지 확인한 뒤 캐시를 비웁니다.
+    rates()는 처음 보는 날짜만 모아 원본에 한 번에 요청합니다.
+    """
+
+    def __init__(self, provider, ttl=300, clock=time.monotonic):
+        self.provider = provider
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._spot = {}
+        self._history = {}
+        self._expires = clock() + ttl
+        self.hits = 0
+        self.misses = 0
+
+    def _check_expiry(self):
+        if self._clock() >= self._expires:
+            self.provider.reload_if_changed()
+            self._spot.clear()
+            self._history.clear()
+            self._expires = self._clock() + self.ttl
+
+    def spot(self, base, quote):
+        with self._lock:
+            self._check_expiry()
+            if (base, quote) in self._spot:
+                self.hits += 1
+                return self._spot[(base, quote)]
+            self.misses += 1
+        value = self.provider.spot(base, quote)
+        with self._lock:
+            self._spot[(base, quote)] = value
+        return value
+
+    def rates(self, base, quote, dates):
+        dates = _to_dates(dates)
+        result = np.full(len(dates), np.nan)
+        valid = ~np.isnat(dates)
+        # 같은 날짜는 한 번만 조회
+        unique, inverse = np.unique(dates[valid], return_inverse=True)
+        with self._lock:
+            self._check_expiry()
+            cached = self._history.setdefault((base, quote), {})
+            known = {date: cached[date] for date in unique if date in cached}
+            missing = [date for date in unique if date not in known]
+            self.hits += len(known)
+            self.misses += len(missing)
+        if missing:
+            values = self.provider.rates(base, quote, np.array(missing, dtype='datetime64[D]'))
+            found = dict(zip(missing, values))
+            # 공유 캐시는 잠금 안에서만 고침 (그 사이 만료로 비워졌을 수 있으므로 다시 찾음)
+            with self._lock:
+                self._history.setdefault((base, quote), {}).update(found)
+            known.update(found)
+        result[valid] = np.array([known.get(date, np.nan) for date in unique], dtype=float)[inverse]
+        return result
+
+    def reload_if_changed(self):
+        with self._lock:
+            self._expires = self._clock()
+            self._check_expiry()
+        return True
+
+    @property
+    def version(self):
+        return self.provider.version
+
+
+def make_provider(source, ttl=300):
+    """파일 확장자로 제공자를 고릅니다. (.csv: CSV 표, .db/.sqlite: SQLite 표, .json: 피드 파일)"""
+    if source.endswith('.csv'):
+        provider = CSVRateTable(source)
+    elif source.endswith(('.db', '.sqlite', '.sqlite3')):
+        provider = SQLiteRateTable(source)
+    elif source.endswith('.json'):
+        provider = FileFeedProvider(source)
+    else:
+        raise ValueError(f"지원하지 않는 환율 파일 형식입니다: {source}")
+    return CachedFXProvider(provider, ttl=ttl)
+
+
+def trade_date_rates(provider, currencies, dates, target):
+    """종목별 매수일 환율 (종목 통화 -> target, 없는 종목은 NaN)
+
+    같은 통화의 종목끼리 모아 통화 쌍마다 한 번씩 조회합니다.
+    """
+    dates = _to_dates(dates)
+    currencies = np.asarray(currencies, dtype=object)
+    result = np.full(len(dates), np.nan)
+    for currency in set(currencies.tolist()):
+        mask = currencies == currency
+        result[mask] = provider.rates(currency, target, dates[mask])
+    return result
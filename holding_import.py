@@ -0,0 +1,321 @@
+import codecs
+import itertools
+import os
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from currency import CURRENCIES
+from dividend_calendar import DEFAULT_PAY_LAG, DividendCalendar, make_schedule
+from portfolio import Portfolio
+from stock_schema import MONTHS, Holding
+
+# 한 번에 읽어 검증하는 행 수 (파일 전체를 한 번에 DataFrame으로 만들지 않음)
+CHUNK_ROWS = 5000
+# 결과에 남기는 오류 행 수 (나머지는 개수만 셈)
+MAX_ERRORS = 200
+# CSV 인코딩 후보 (국내 증권사 내보내기 파일은 대부분 CP949)
+CSV_ENCODINGS = ['utf-8-sig', 'cp949']
+
+# 증권사 내보내기 파일의 열 이름(소문자, 공백/기호 제거) -> 가져오기 필드
+COLUMN_ALIASES = {
+    '종목명': ['종목명', '종목', 'name', 'symbol', 'ticker', '티커', 'security'],
+    '보유 수량': ['보유수량', '수량', '잔고수량', 'quantity', 'qty', 'shares'],
+    '매수 단가': ['매수단가', '평균단가', '매입단가', '평균매입가', 'averagecost', 'avgcost', 'costpershare',
+              'averageprice', 'purchaseprice'],
+    '현재 주가': ['현재주가', '현재가', 'price', 'lastprice', 'currentprice', 'marketprice'],
+    '통화': ['통화', 'currency', 'ccy'],
+    '매수일': ['매수일', '매입일', 'purchasedate', 'acquired', 'opendate'],
+    '주당 배당금': ['주당배당금', 'dividendpershare', 'dps'],
+    '배당 주기': ['배당주기', 'frequency', 'dividendfrequency'],
+    '배당락일': ['배당락일', 'exdate', 'exdividenddate'],
+    '지급일 간격': ['지급일간격', 'paylag']
+}
+for _i, _month in enumerate(MONTHS):
+    COLUMN_ALIASES[_month] = [_month, ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov',
+                                       'dec'][_i]]
+REQUIRED_COLUMNS = ['종목명', '보유 수량', '매수 단가', '현재 주가']
+# 영문 배당 주기 -> SCHEDULE_FREQUENCIES 키
+FREQUENCY_ALIASES = {'monthly': '매월', 'quarterly': '분기', 'semiannual': '반기', 'annual': '연간'}
+
+_ALIAS_LOOKUP = {alias: field for field, aliases in COLUMN_ALIASES.items() for alias in aliases}
+
+
+def _normalize_header(name):
+    return ''.join(c for c in str(name).lower() if c.isalnum())
+
+
+def map_columns(headers):
+    """원본 열 이름 목록 -> {원본 열 이름: 가져오기 필드} (알 수 없는 열은 제외)"""
+    mapping = {}
+    for header in headers:
+        field = _ALIAS_LOOKUP.get(_normalize_header(header))
+        if field is not None and field not in mapping.values():
+            mapping[header] = field
+    missing = [field for field in REQUIRED_COLUMNS if field not in mapping.values()]
+    if missing:
+        raise ValueError(f"필수 열이 없습니다: {', '.join(missing)}")
+    return mapping
+
+
+def _detect_encoding(head):
+    # 앞부분만 디코딩해 보고 인코딩을 고름 (잘린 마지막 글자는 final=False로 허용)
+    for encoding in CSV_ENCODINGS:
+        try:
+            codecs.getincrementaldecoder(encoding)().decode(head, final=False)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    raise ValueError("CSV 파일 인코딩을 알 수 없습니다. UTF-8 또는 CP949로 저장해 주세요.")
+
+
+def _csv_chunks(file, chunk_rows):
+    head = file.read(64 * 1024)
+    file.seek(0)
+    reader = pd.read_csv(file, dtype=str, keep_default_na=False, skipinitialspace=True,
+                         encoding=_detect_encoding(head), chunksize=chunk_rows)
+    with reader:
+        yield from reader
+
+
+def _excel_chunks(file, chunk_rows):
+    # openpyxl은 엑셀 파일을 가져올 때만 필요하므로 여기서 불러옴
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ValueError("엑셀 파일을 가져오려면 openpyxl을 설치해야 합니다. (pip install openpyxl)") from None
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        headers = next(rows, None)
+        if headers is None:
+            return
+        headers = ['' if header is None else str(header) for header in headers]
+        while True:
+            chunk = list(itertools.islice(rows, chunk_rows))
+            if not chunk:
+                break
+            yield pd.DataFrame(chunk, columns=headers)
+    finally:
+        workbook.close()
+
+
+def read_chunks(file, filename, chunk_rows=CHUNK_ROWS):
+    """CSV/XLSX 파일을 chunk_rows행씩 DataFrame으로 읽습니다. (file: 바이너리 파일 객체)"""
+    extension = os.path.splitext(filename)[1].lower()
+    if extension == '.csv':
+        return _csv_chunks(file, chunk_rows)
+    if extension == '.xlsx':
+        return _excel_chunks(file, chunk_rows)
+    raise ValueError(f"지원하지 않는 파일 형식입니다: {extension or filename} (CSV 또는 XLSX)")
+
+
+# 숫자 앞뒤에 붙을 수 있는 통화 표시 (기호, 3자리 통화 코드, '원')
+_CURRENCY_PREFIX = r'^(-?)(?:[A-Za-z]{3}|[$₩€¥£])'
+_CURRENCY_SUFFIX = r'(?:[A-Za-z]{3}|[$₩€¥£]|원)$'
+
+
+def _numbers(column):
+    """칸을 숫자로 변환해 (숫자 배열, 변환 실패 마스크)를 반환합니다. (빈 칸은 NaN이며 실패가 아님)
+
+    대부분의 칸은 그대로 숫자로 바뀌므로 변환에 실패한 칸만 천 단위 구분 기호, 공백, 앞뒤 통화 표시를
+    지우고 다시 변환합니다. 괄호로 감싼 값은 음수('(1,234)' -> -1234)이고 앞의 '-'는 통화 표시 앞에
+    있어도 음수입니다. 그래도 숫자가 아닌 칸은 실패로 표시해 호출한 쪽에서 오류 행으로 알립니다.
+    """
+    numbers = pd.to_numeric(column, errors='coerce').to_numpy(dtype=float)
+    if column.dtype != object:
+        return numbers, np.zeros(len(numbers), dtype=bool)
+    nonblank = column.notna().to_numpy() & (column.astype(str).str.strip() != '').to_numpy()
+    failed = np.flatnonzero(np.isnan(numbers) & nonblank)
+    if len(failed):
+        text = column.iloc[failed].astype(str).str.strip()
+        negative = text.str.match(r'^\(.*\)$').to_numpy()
+        text = (text.str.replace(r'^\((.*)\)$', r'\1', regex=True)
+                .str.replace(r'[\s,]', '', regex=True)
+                .str.replace(_CURRENCY_PREFIX, r'\1', regex=True)
+                .str.replace(_CURRENCY_SUFFIX, '', regex=True))
+        values = pd.to_numeric(text, errors='coerce').to_numpy(dtype=float)
+        numbers[failed] = np.where(negative, -values, values)
+    return numbers, np.isnan(numbers) & nonblank
+
+
+def _texts(column):
+    return column.fillna('').astype(str).str.strip()
+
+
+class ImportChunk:
+    """검증을 통과한 행의 열 배열 (한 청크 또는 여러 청크를 이어 붙인 결과)"""
+
+    def __init__(self, names, quantity, purchase_price, current_price, dividends, purchase_dates, currencies,
+                 schedules):
+        self.names = names
+        self.quantity = quantity
+        self.purchase_price = purchase_price
+        self.current_price = current_price
+        self.dividends = dividends
+        self.purchase_dates = purchase_dates
+        self.currencies = currencies
+        self.schedules = schedules
+
+    @classmethod
+    def concatenate(cls, chunks):
+        if not chunks:
+            return cls([], np.empty(0), np.empty(0), np.empty(0), np.empty((0, 12)),
+                       np.empty(0, dtype='datetime64[D]'), [], [])
+        return cls(list(itertools.chain.from_iterable(chunk.names for chunk in chunks)),
+                   np.concatenate([chunk.quantity for chunk in chunks]),
+                   np.concatenate([chunk.purchase_price for chunk in chunks]),
+                   np.concatenate([chunk.current_price for chunk in chunks]),
+                   np.concatenate([chunk.dividends for chunk in chunks]),
+                   np.concatenate([chunk.purchase_dates for chunk in chunks]),
+                   list(itertools.chain.from_iterable(chunk.currencies for chunk in chunks)),
+                   list(itertools.chain.from_iterable(chunk.schedules for chunk in chunks)))
+
+    def __len__(self):
+        return len(self.names)
+
+
+def normalize_chunk(frame, mapping, first_row, default_currency='USD'):
+    """원본 청크를 검증해 (ImportChunk, [(행 번호, 사유), ...])를 반환합니다.
+
+    숫자/날짜/통화 변환과 검증은 열 단위 벡터 연산으로 하고, 행 번호는 헤더를 1행으로 센 파일 기준입니다.
+    """
+    frame = pd.DataFrame({field: frame[header] for header, field in mapping.items()})
+    count = len(frame)
+
+    def column(field):
+        return frame[field] if field in frame.columns else pd.Series([''] * count, index=frame.index, dtype=object)
+
+    names = _texts(column('종목명'))
+    quantity, bad_quantity = _numbers(frame['보유 수량'])
+    purchase_price, bad_purchase_price = _numbers(frame['매수 단가'])
+    current_price, bad_current_price = _numbers(frame['현재 주가'])
+    monthly = [_numbers(column(month)) for month in MONTHS]
+    dividends = np.nan_to_num(np.column_stack([numbers for numbers, _ in monthly]), nan=0.0)
+    bad_dividends = np.column_stack([bad for _, bad in monthly]).any(axis=1)
+    currencies = _texts(column('통화')).str.upper().replace('', default_currency)
+    date_text = _texts(column('매수일'))
+    purchase_dates = pd.to_datetime(date_text, errors='coerce', format='mixed').to_numpy().astype('datetime64[D]')
+
+    # 엑셀 파일 끝의 빈 행처럼 필수 칸이 모두 비어 있는 행은 오류 없이 건너뜀
+    blank = (names == '').to_numpy() & np.isnan(quantity) & np.isnan(purchase_price) & np.isnan(current_price)
+    problems = [
+        (names == '').to_numpy(), "종목명이 비어 있습니다.",
+        bad_quantity, "보유 수량이 숫자가 아닙니다.",
+        bad_purchase_price, "매수 단가가 숫자가 아닙니다.",
+        bad_current_price, "현재 주가가 숫자가 아닙니다.",
+        bad_dividends, "월별 배당금이 숫자가 아닙니다.",
+        ~(quantity > 0), "보유 수량은 0보다 커야 합니다.",
+        ~(purchase_price > 0), "매수 단가는 0보다 커야 합니다.",
+        ~(current_price > 0), "현재 주가는 0보다 커야 합니다.",
+        (dividends < 0).any(axis=1), "월별 배당금은 0 이상이어야 합니다.",
+        ~currencies.isin(CURRENCIES).to_numpy(), "지원하지 않는 통화입니다.",
+        np.isnat(purchase_dates) & (date_text != '').to_numpy(), "매수일 형식이 잘못되었습니다."
+    ]
+    schedules = [None] * count
+    if '주당 배당금' in frame.columns:
+        schedule_problems, schedules = _schedules(frame, column)
+        problems += [schedule_problems, "배당 일정 형식이 잘못되었습니다."]
+
+    invalid = blank.copy()
+    errors = []
+    for mask, reason in zip(problems[::2], problems[1::2]):
+        rows = np.flatnonzero(mask & ~invalid)
+        errors.extend((first_row + int(row), reason) for row in rows)
+        invalid |= mask
+    errors.sort()
+
+    valid = np.flatnonzero(~invalid)
+    names = names.to_numpy()[valid].tolist()
+    currencies = currencies.to_numpy()[valid].tolist()
+    return ImportChunk(names, quantity[valid], purchase_price[valid], current_price[valid], dividends[valid],
+                       purchase_dates[valid], currencies, [schedules[row] for row in valid]), errors
+
+
+def _schedules(frame, column):
+    # 주당 배당금이 있는 행만 배당 일정을 만듦 (배당 주기가 없으면 분기, 지급일 간격이 없으면 기본값)
+    per_share, bad_per_share = _numbers(frame['주당 배당금'])
+    per_share = np.nan_to_num(per_share, nan=0.0)
+    frequencies = _texts(column('배당 주기'))
+    ex_dates = _texts(column('배당락일'))
+    pay_lags, bad_pay_lags = _numbers(column('지급일 간격'))
+    schedules = [None] * len(frame)
+    problems = (per_share < 0) | bad_per_share | bad_pay_lags
+    for row in np.flatnonzero(per_share > 0):
+        frequency = frequencies.iat[row] or '분기'
+        frequency = FREQUENCY_ALIASES.get(frequency.lower(), frequency)
+        pay_lag = DEFAULT_PAY_LAG if np.isnan(pay_lags[row]) else int(pay_lags[row])
+        try:
+            ex_date = date.fromisoformat(ex_dates.iat[row][:10])
+            schedules[row] = make_schedule(per_share[row], frequency, ex_date.isoformat(), pay_lag)
+        except ValueError:
+            problems[row] = True
+    return problems, schedules
+
+
+class ImportResult:
+    """가져오기 결과: 검증을 통과한 종목 열 배열, 오류 행 목록, 전체 행 수
+
+    portfolio()는 가져온 모든 종목의 파생 값을 기존 Portfolio 벡터 연산으로 한 번에 계산하므로
+    미리 보기와 합계에 쓰고, holdings()는 세션에 넣을 Holding 목록을 만듭니다.
+    """
+
+    def __init__(self, rows, errors, error_count, total_rows):
+        self.rows = rows
+        self.errors = errors
+        self.error_count = error_count
+        self.total_rows = total_rows
+
+    def __len__(self):
+        return len(self.rows)
+
+    def portfolio(self):
+        rows = self.rows
+        return Portfolio(rows.names, rows.quantity, rows.purchase_price, rows.current_price, rows.dividends,
+                         purchase_dates=[None if np.isnat(day) else str(day) for day in rows.purchase_dates],
+                         currencies=rows.currencies, schedules=rows.schedules)
+
+    def holdings(self):
+        rows = self.rows
+        purchase_dates = [None if np.isnat(day) else str(day) for day in rows.purchase_dates]
+        return [Holding(*fields) for fields in zip(rows.names, rows.quantity.tolist(), rows.purchase_price.tolist(),
+                                                   rows.current_price.tolist(), rows.dividends.tolist(),
+                                                   purchase_dates, rows.currencies, rows.schedules)]
+
+    def error_frame(self):
+        return pd.DataFrame(self.errors, columns=['행 번호', '사유'])
+
+
+def _fill_scheduled_dividends(rows, year):
+    # 월별 배당금이 모두 0이고 배당 일정이 있는 종목은 year년 일정으로 채움 (달력 하나로 한 번에 계산)
+    scheduled = np.array([schedule is not None for schedule in rows.schedules], dtype=bool) & \
+        ~rows.dividends.any(axis=1)
+    if not scheduled.any():
+        return
+    calendar = DividendCalendar.from_schedules([schedule if fill else None
+                                                for schedule, fill in zip(rows.schedules, scheduled)],
+                                               f'{year - 1}-01-01', f'{year + 1}-01-01', rows.purchase_dates)
+    rows.dividends[scheduled] = calendar.holding_monthly(rows.quantity, year)[scheduled]
+
+
+def import_holdings(file, filename, default_currency='USD', chunk_rows=CHUNK_ROWS, year=None):
+    """증권사 내보내기 CSV/XLSX 파일에서 보유 종목을 가져옵니다.
+
+    파일은 chunk_rows행씩 읽어 청크마다 열 단위로 검증·변환하고, 통과한 행의 열 배열만 모아 둡니다.
+    통화 열이 없거나 비어 있으면 default_currency를, 월별 배당금이 비어 있고 배당 일정 열이 있으면
+    year년(기본 올해) 일정으로 채웁니다. 저장은 하지 않으므로 호출한 쪽에서 결과를 한 번에 저장합니다.
+    """
+    chunks, errors, error_count, total_rows = [], [], 0, 0
+    mapping = None
+    for frame in read_chunks(file, filename, chunk_rows):
+        if mapping is None:
+            mapping = map_columns(frame.columns)
+        chunk, chunk_errors = normalize_chunk(frame, mapping, total_rows + 2, default_currency)
+        total_rows += len(frame)
+        error_count += len(chunk_errors)
+        errors.extend(chunk_errors[:MAX_ERRORS - len(errors)])
+        chunks.append(chunk)
+    rows = ImportChunk.concatenate(chunks)
+    _fill_scheduled_dividends(rows, year or date.today().year)
+    return ImportResult(rows, errors, error_count, total_rows)
\ No newline at end of file
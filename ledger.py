@@ -0,0 +1,261 @@
+from array import array
+from collections import deque
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+# 거래 유형 (저장 시 이름, 메모리에서는 인덱스 코드)
+TRANSACTION_TYPES = ['매수', '매도', '분할']
+BUY, SELL, SPLIT = range(len(TRANSACTION_TYPES))
+# 취득가 계산 방식
+COST_METHODS = ['평균', 'FIFO']
+# 이보다 작은 수량은 0으로 봄 (부동소수점 오차)
+EPSILON = 1e-9
+
+
+def _day_number(day):
+    # 'YYYY-MM-DD' 또는 date -> 1970-01-01 기준 일 수
+    return int(np.datetime64(str(day), 'D').astype(np.int64))
+
+
+class Ledger:
+    """종목 한 건의 거래 내역(매수/매도/분할)과 누적 취득가 상태
+
+    거래는 유형 코드, 날짜(일 수), 수량, 단가를 열 단위 배열로 보관합니다. 분할 거래의 수량 칸은 분할 비율
+    (2주로 나누면 2.0, 병합은 0.5)입니다. 보유 수량, 평균/FIFO 취득가 합계, 실현 손익은 거래를 추가할 때마다
+    그 거래만 반영해 갱신하므로 조회할 때 전체 내역을 다시 계산하지 않습니다. FIFO 로트는 분할 전 기준
+    수량으로 보관하고 누적 분할 계수를 곱해 쓰므로 분할도 로트 수와 관계없이 O(1)입니다.
+    과거 날짜 거래를 끼워 넣을 때만 그 거래부터가 아니라 처음부터 다시 계산합니다.
+    """
+
+    __slots__ = ('kinds', 'days', 'quantities', 'prices', 'method', '_factor', '_base_shares', '_lots',
+                 '_average_cost', '_fifo_cost', '_realized_average', '_realized_fifo', '_saved')
+
+    def __init__(self, method='평균'):
+        if method not in COST_METHODS:
+            raise ValueError(f"지원하지 않는 취득가 계산 방식입니다: {method}")
+        self.kinds = array('b')
+        self.days = array('l')
+        self.quantities = array('d')
+        self.prices = array('d')
+        self.method = method
+        self._reset()
+
+    def _reset(self):
+        self._factor = 1.0
+        self._base_shares = 0.0
+        # FIFO 로트: [분할 전 기준 수량, 기준 수량당 취득가]
+        self._lots = deque()
+        self._average_cost = 0.0
+        self._fifo_cost = 0.0
+        self._realized_average = 0.0
+        self._realized_fifo = 0.0
+        # 마지막으로 만든 저장용 딕셔너리 (거래가 바뀌면 다시 만듦)
+        self._saved = None
+
+    @classmethod
+    def from_holding(cls, quantity, purchase_price, purchase_date=None, method='평균'):
+        """거래 내역이 없던 종목을 현재 보유 수량/매수 단가의 매수 한 건으로 시작합니다."""
+        ledger = cls(method)
+        if quantity > 0:
+            ledger.add('매수', purchase_date or date.today().isoformat(), quantity, purchase_price)
+        return ledger
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def set_method(self, method):
+        """매수 단가로 쓸 취득가 계산 방식을 바꿉니다. (두 방식의 상태는 항상 함께 갱신하므로 다시 계산하지 않음)"""
+        if method not in COST_METHODS:
+            raise ValueError(f"지원하지 않는 취득가 계산 방식입니다: {method}")
+        self.method = method
+        self._saved = None
+
+    @property
+    def shares(self):
+        """현재 보유 수량"""
+        return self._base_shares * self._factor
+
+    def cost_basis(self, method=None):
+        """남은 보유 수량의 취득가 합계 (총 투자금)"""
+        return self._fifo_cost if (method or self.method) == 'FIFO' else self._average_cost
+
+    def unit_cost(self, method=None):
+        """주당 취득가 (매수 단가)"""
+        shares = self.shares
+        return self.cost_basis(method) / shares if shares > EPSILON else 0.0
+
+    def realized(self, method=None):
+        """매도로 실현한 손익 합계"""
+        return self._realized_fifo if (method or self.method) == 'FIFO' else self._realized_average
+
+    def unrealized(self, current_price, method=None):
+        """현재 주가 기준 평가 손익"""
+        return self.shares * current_price - self.cost_basis(method)
+
+    def _apply(self, kind, quantity, price):
+        # 검증을 통과한 거래 한 건을 누적 상태에 반영
+        if kind == SPLIT:
+            self._factor *= quantity
+            return
+        if kind == BUY:
+            self._lots.append([quantity / self._factor, price * self._factor])
+            self._base_shares += quantity / self._factor
+            self._average_cost += quantity * price
+            self._fifo_cost += quantity * price
+            return
+        shares = self.shares
+        proceeds = quantity * price
+        # 평균: 보유 비율만큼 취득가를 덜어 냄
+        average_cost = self._average_cost * min(quantity / shares, 1.0) if shares > EPSILON else self._average_cost
+        self._average_cost -= average_cost
+        self._realized_average += proceeds - average_cost
+        # FIFO: 가장 먼저 산 로트부터 덜어 냄 (다 쓴 로트는 버리므로 로트 하나당 한 번만 처리)
+        remaining = quantity / self._factor
+        fifo_cost = 0.0
+        while remaining > EPSILON and self._lots:
+            lot = self._lots[0]
+            taken = min(lot[0], remaining)
+            fifo_cost += taken * lot[1]
+            lot[0] -= taken
+            remaining -= taken
+            if lot[0] <= EPSILON:
+                self._lots.popleft()
+        self._fifo_cost -= fifo_cost
+        self._realized_fifo += proceeds - fifo_cost
+        self._base_shares -= quantity / self._factor
+        if self.shares <= EPSILON:
+            # 전량 매도: 오차가 쌓이지 않도록 남은 취득가를 0으로 맞춤
+            self._base_shares = self._average_cost = self._fifo_cost = 0.0
+            self._lots.clear()
+
+    def add(self, kind, day, quantity, price=0.0):
+        """거래 한 건을 추가합니다. (kind: '매수'/'매도'/'분할', day: 'YYYY-MM-DD' 또는 date)
+
+        마지막 거래 이후 날짜면 그 거래만 반영하고, 과거 날짜면 끼워 넣은 뒤 처음부터 다시 계산합니다.
+        매도 수량이 그 시점 보유 수량보다 많으면 ValueError이며 거래 내역은 바뀌지 않습니다.
+        """
+        self.extend([(kind, day, quantity, price)])
+
+    def extend(self, transactions):
+        """(유형, 날짜, 수량, 단가) 거래 여러 건을 추가합니다. 과거 날짜가 섞여 있어도 다시 계산은 한 번입니다."""
+        rows = sorted(((TRANSACTION_TYPES.index(kind), _day_number(day), float(quantity), float(price))
+                       for kind, day, quantity, price in transactions), key=lambda row: row[1])
+        if not rows:
+            return
+        if not self.days or rows[0][1] >= self.days[-1]:
+            # 상태를 바꾸기 전에 보유 수량만으로 먼저 검증하므로 중간에 실패해도 원장은 그대로
+            self._validate(rows)
+            for kind, day, quantity, price in rows:
+                self._apply(kind, quantity, price)
+                self._append(kind, day, quantity, price)
+            self._saved = None
+            return
+        # 과거 날짜 거래: 날짜순(같은 날짜는 입력 순서)으로 합친 내역을 새 원장에서 다시 계산
+        merged = sorted(list(zip(self.kinds, self.days, self.quantities, self.prices)) + rows,
+                        key=lambda row: row[1])
+        rebuilt = Ledger(self.method)
+        rebuilt._validate(merged)
+        for kind, day, quantity, price in merged:
+            rebuilt._apply(kind, quantity, price)
+            rebuilt._append(kind, day, quantity, price)
+        for name in self.__slots__:
+            setattr(self, name, getattr(rebuilt, name))
+
+    def _validate(self, rows):
+        shares = self.shares
+        for kind, _, quantity, price in rows:
+            if quantity <= 0:
+                raise ValueError("분할 비율은 0보다 커야 합니다." if kind == SPLIT else "거래 수량은 0보다 커야 합니다.")
+            if kind == SPLIT:
+                shares *= quantity
+            elif price < 0:
+                raise ValueError("거래 단가는 0 이상이어야 합니다.")
+            elif kind == BUY:
+                shares += quantity
+            elif quantity > shares + EPSILON:
+                raise ValueError(f"매도 수량({quantity:g})이 보유 수량({shares:g})보다 많습니다.")
+            else:
+                shares -= quantity
+
+    def _append(self, kind, day, quantity, price):
+        self.kinds.append(kind)
+        self.days.append(day)
+        self.quantities.append(quantity)
+        self.prices.append(price)
+
+    def _state(self):
+        return {
+            '거래 수': len(self),
+            '분할 계수': self._factor,
+            '기준 수량': self._base_shares,
+            '로트 수량': [lot[0] for lot in self._lots],
+            '로트 단가': [lot[1] for lot in self._lots],
+            '평균 취득가 합계': self._average_cost,
+            'FIFO 취득가 합계': self._fifo_cost,
+            '평균 실현 손익': self._realized_average,
+            'FIFO 실현 손익': self._realized_fifo
+        }
+
+    def _restore(self, state):
+        self._factor = state['분할 계수']
+        self._base_shares = state['기준 수량']
+        self._lots = deque([quantity, cost] for quantity, cost in zip(state['로트 수량'], state['로트 단가']))
+        self._average_cost = state['평균 취득가 합계']
+        self._fifo_cost = state['FIFO 취득가 합계']
+        self._realized_average = state['평균 실현 손익']
+        self._realized_fifo = state['FIFO 실현 손익']
+
+    def to_dict(self):
+        """저장용 딕셔너리 (거래는 열 단위 목록, 누적 상태를 함께 저장해 불러올 때 다시 계산하지 않음)"""
+        if self._saved is None:
+            self._saved = {
+                '방식': self.method,
+                '유형': [TRANSACTION_TYPES[kind] for kind in self.kinds],
+                '날짜': np.asarray(self.days, dtype=np.int64).astype('datetime64[D]').astype(str).tolist(),
+                '수량': self.quantities.tolist(),
+                '단가': self.prices.tolist(),
+                '상태': self._state()
+            }
+        return self._saved
+
+    @classmethod
+    def from_dict(cls, data):
+        """to_dict() 형식에서 만듭니다. 저장된 상태가 거래 수와 맞지 않으면 처음부터 다시 계산합니다."""
+        ledger = cls(data.get('방식', '평균'))
+        codes = {name: code for code, name in enumerate(TRANSACTION_TYPES)}
+        ledger.kinds = array('b', [codes[kind] for kind in data['유형']])
+        ledger.days = array('l', np.array(data['날짜'], dtype='datetime64[D]').astype(np.int64).tolist())
+        ledger.quantities = array('d', data['수량'])
+        ledger.prices = array('d', data['단가'])
+        state = data.get('상태')
+        if state and state.get('거래 수') == len(ledger):
+            ledger._restore(state)
+        else:
+            rows = list(zip(ledger.kinds, ledger.days, ledger.quantities, ledger.prices))
+            ledger._validate(rows)
+            for kind, _, quantity, price in rows:
+                ledger._apply(kind, quantity, price)
+        return ledger
+
+    def frame(self, last=None):
+        """거래 내역 DataFrame (last가 있으면 최근 last건만, 최신순)"""
+        start = max(len(self) - last, 0) if last is not None else 0
+        days = np.asarray(self.days[start:], dtype=np.int64).astype('datetime64[D]')
+        return pd.DataFrame({
+            '날짜': days.astype(str),
+            '유형': [TRANSACTION_TYPES[kind] for kind in self.kinds[start:]],
+            '수량': np.asarray(self.quantities[start:]),
+            '단가': np.asarray(self.prices[start:])
+        }).iloc[::-1].reset_index(drop=True)
+
+    def __eq__(self, other):
+        if not isinstance(other, Ledger):
+            return NotImplemented
+        return (self.method, self.kinds, self.days, self.quantities, self.prices) == \
+            (other.method, other.kinds, other.days, other.quantities, other.prices)
+
+    def __repr__(self):
+        return (f"Ledger(method={self.method!r}, transactions={len(self)}, shares={self.shares:g}, "
+                f"cost_basis={self.cost_basis():g})")
\ No newline at end of file
@@ -0,0 +1,53 @@
+import math
+
+import streamlit as st
+
+# 페이지당 종목 수 선택지
+PAGE_SIZES = [10, 20, 50, 100]
+
+
+def filter_indices(names, query):
+    """종목명에 검색어가 포함된 종목의 인덱스 목록 (대소문자 무시)"""
+    query = (query or '').strip().lower()
+    if not query:
+        return list(range(len(names)))
+    return [i for i, name in enumerate(names) if query in name.lower()]
+
+
+def page_range(count, page, page_size):
+    """(시작, 끝, 전체 페이지 수) - page는 1부터 시작하며 범위를 벗어나면 가장 가까운 페이지로 맞춤"""
+    page_count = max(1, math.ceil(count / page_size))
+    page = min(max(1, page), page_count)
+    start = (page - 1) * page_size
+    return start, min(start + page_size, count), page_count
+
+
+def paginate(key, names, page_sizes=PAGE_SIZES):
+    """검색/페이지 선택 위젯을 그리고 현재 페이지에 표시할 종목 인덱스 목록을 반환합니다.
+
+    종목 수가 가장 작은 페이지 크기 이하이면 위젯 없이 전체를 반환합니다.
+    """
+    if len(names) <= page_sizes[0]:
+        return list(range(len(names)))
+
+    col1, col2, col3 = st.columns([2, 1, 1])
+    with col1:
+        query = st.text_input('종목 검색', key=f'{key}_query', placeholder='종목명 일부 입력')
+    with col2:
+        page_size = st.selectbox('페이지당 종목 수', page_sizes, key=f'{key}_page_size')
+    indices = filter_indices(names, query)
+
+    # 검색 결과가 줄어 현재 페이지가 범위를 벗어나면 마지막 페이지로 이동 (위젯 생성 전에 조정)
+    page_key = f'{key}_page'
+    start, stop, page_count = page_range(len(indices), st.session_state.get(page_key, 1), page_size)
+    if st.session_state.get(page_key, 1) > page_count:
+        st.session_state[page_key] = page_count
+    with col3:
+        page = st.number_input('페이지', min_value=1, max_value=page_count, step=1, key=page_key)
+    start, stop, page_count = page_range(len(indices), page, page_size)
+
+    if indices:
+        st.caption(f"{len(indices)}개 종목 중 {start + 1}~{stop}번째 ({page}/{page_count} 페이지)")
+    else:
+        st.caption("검색 결과가 없습니다.")
+    return indices[start:stop]
\ No newline at end of file
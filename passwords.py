@@ -0,0 +1,196 @@
+import os
+import hmac
+import time
+import base64
+import hashlib
+import threading
+from abc import ABC, abstractmethod
+
+# scrypt 기본 비용 (N = 2 ** YIELDNOTE_SCRYPT_COST, 기본 2 ** 14)
+DEFAULT_SCRYPT_COST = 14
+
+
+def _b64encode(data):
+    return base64.b64encode(data).decode('ascii').rstrip('=')
+
+
+def _b64decode(text):
+    return base64.b64decode(text + '=' * (-len(text) % 4))
+
+
+def _is_legacy_sha256(stored):
+    # 이전 버전의 솔트 없는 SHA-256 16진수 문자열
+    return len(stored) == 64 and all(c in '0123456789abcdef' for c in stored)
+
+
+class PasswordHasher(ABC):
+    """비밀번호 해셔 인터페이스
+
+    hash()로 만든 문자열은 형식 이름으로 시작하므로, verify_password()는 저장된 해시를 보고
+    어느 해셔로 검증할지 고릅니다. needs_rehash()는 다른 형식이거나 비용이 바뀐 해시에서 True입니다.
+    """
+
+    scheme = None
+
+    @abstractmethod
+    def hash(self, password):
+        """password의 해시 문자열"""
+
+    @abstractmethod
+    def verify(self, password, stored):
+        """password가 stored 해시와 맞는지 여부"""
+
+    def needs_rehash(self, stored):
+        return not self.identify(stored)
+
+    @abstractmethod
+    def identify(self, stored):
+        """stored가 이 해셔의 형식인지 여부"""
+
+
+class ScryptHasher(PasswordHasher):
+    """hashlib.scrypt 해셔 (scrypt$N$r$p$솔트$해시)
+
+    cost는 N의 2 지수이며 1 늘릴 때마다 계산 시간과 메모리(128 * r * N 바이트)가 두 배가 됩니다.
+    """
+
+    scheme = 'scrypt'
+
+    def __init__(self, cost=DEFAULT_SCRYPT_COST, r=8, p=1, salt_size=16, key_size=32):
+        self.n = 2 ** cost
+        self.r = r
+        self.p = p
+        self.salt_size = salt_size
+        self.key_size = key_size
+
+    @staticmethod
+    def _derive(password, salt, n, r, p, key_size):
+        return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p,
+                              maxmem=256 * r * n + 1024 * 1024, dklen=key_size)
+
+    def hash(self, password):
+        salt = os.urandom(self.salt_size)
+        key = self._derive(password, salt, self.n, self.r, self.p, self.key_size)
+        return f"scrypt${self.n}${self.r}${self.p}${_b64encode(salt)}${_b64encode(key)}"
+
+    def verify(self, password, stored):
+        try:
+            _, n, r, p, salt, key = stored.split('$')
+            salt, key = _b64decode(salt), _b64decode(key)
+            derived = self._derive(password, salt, int(n), int(r), int(p), len(key))
+        except ValueError:
+            return False
+        return hmac.compare_digest(derived, key)
+
+    def identify(self, stored):
+        return stored.startswith('scrypt$')
+
+    def needs_rehash(self, stored):
+        if not self.identify(stored):
+            return True
+        # 비용을 올렸다면 다음 로그인 때 새 비용으로 다시 해싱
+        return stored.split('$')[1:4] != [str(self.n), str(self.r), str(self.p)]
+
+
+class BcryptHasher(PasswordHasher):
+    """bcrypt 해셔 (streamlit-authenticator의 config.yaml과 같은 형식)"""
+
+    scheme = 'bcrypt'
+
+    def __init__(self, rounds=12):
+        self.rounds = rounds
+
+    def hash(self, password):
+        import bcrypt
+        return bcrypt.hashpw(password.encode(), bcrypt.gensalt(self.rounds)).decode()
+
+    def verify(self, password, stored):
+        import bcrypt
+        try:
+            return bcrypt.checkpw(password.encode(), stored.encode())
+        except ValueError:
+            return False
+
+    def identify(self, stored):
+        return stored.startswith('$2')
+
+    def needs_rehash(self, stored):
+        if not self.identify(stored):
+            return True
+        return int(stored.split('$')[2]) != self.rounds
+
+
+class LegacySHA256Hasher(PasswordHasher):
+    """이전 버전의 솔트 없는 SHA-256 (검증 전용, 로그인 시 새 해셔로 교체됨)"""
+
+    scheme = 'sha256'
+
+    def hash(self, password):
+        return hashlib.sha256(password.encode()).hexdigest()
+
+    def verify(self, password, stored):
+        return hmac.compare_digest(self.hash(password), stored)
+
+    def identify(self, stored):
+        return _is_legacy_sha256(stored)
+
+
+def verify_password(password, stored, hashers=None):
+    """저장된 해시의 형식에 맞는 해셔로 비밀번호를 검증합니다."""
+    for hasher in hashers or (ScryptHasher(), BcryptHasher(), LegacySHA256Hasher()):
+        if hasher.identify(stored):
+            return hasher.verify(password, stored)
+    return False
+
+
+def default_hasher():
+    """YIELDNOTE_PASSWORD_HASH(scrypt: 기본값, bcrypt)와 YIELDNOTE_SCRYPT_COST로 해셔를 고릅니다."""
+    scheme = os.environ.get('YIELDNOTE_PASSWORD_HASH', 'scrypt')
+    if scheme == 'bcrypt':
+        return BcryptHasher()
+    if scheme == 'scrypt':
+        return ScryptHasher(int(os.environ.get('YIELDNOTE_SCRYPT_COST', DEFAULT_SCRYPT_COST)))
+    raise ValueError(f"지원하지 않는 비밀번호 해시 방식입니다: {scheme}")
+
+
+class PasswordVerifier:
+    """사용자 관리자가 공유하는 비밀번호 해싱/검증기
+
+    검증에 성공하면 (사용자명, 저장된 해시, 비밀번호)의 HMAC을 ttl초 동안 기억해 두어,
+    같은 사용자가 다른 탭이나 새로고침 후 다시 로그인할 때는 scrypt/bcrypt를 다시 계산하지 않습니다.
+    HMAC 키는 프로세스마다 새로 만들고 비밀번호 자체는 보관하지 않으며, 저장된 해시가 바뀌면
+    (비밀번호 변경, 재해싱) 키가 달라지므로 이전 항목은 더 이상 맞지 않습니다.
+    """
+
+    def __init__(self, hasher=None, ttl=300, clock=time.monotonic):
+        self.hasher = hasher or default_hasher()
+        self.ttl = ttl
+        self._clock = clock
+        self._secret = os.urandom(32)
+        self._lock = threading.Lock()
+        # HMAC -> 만료 시각
+        self._verified = {}
+
+    def hash(self, password):
+        return self.hasher.hash(password)
+
+    def _token(self, username, password, stored):
+        message = '\0'.join((username, stored, password)).encode()
+        return hmac.new(self._secret, message, hashlib.sha256).digest()
+
+    def verify(self, username, password, stored):
+        """(성공 여부, 새 해시) - 새 해시는 이전 형식/비용이라 다시 저장해야 할 때만 반환합니다."""
+        token = self._token(username, password, stored)
+        now = self._clock()
+        with self._lock:
+            expires = self._verified.get(token)
+            if expires is not None and expires > now:
+                return True, None
+        if not verify_password(password, stored):
+            return False, None
+        new_hash = self.hasher.hash(password) if self.hasher.needs_rehash(stored) else None
+        with self._lock:
+            # 만료된 항목 정리
+            self._verified = {key: value for key, value in self._verified.items() if value > now}
+            self._verified[self._token(username, password, new_hash or stored)] = now + self.ttl
+        return True, new_hash
\ No newline at end of file
@@ -0,0 +1,215 @@
+import json
+import hashlib
+import itertools
+from array import array
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+from currency import currency_codes
+from dividend_calendar import DividendCalendar
+from stock_schema import MONTHS, compact_stock
+
+# 금액 열 (환율 적용 대상)
+MONEY_COLUMNS = ['매수 단가', '현재 주가', '총 투자금', '현재 평가금', '누적 배당금', '실제 손익']
+
+
+def make_stock(name, quantity, purchase_price, current_price, monthly_dividends):
+    """입력 값으로 저장용 종목 딕셔너리를 만듭니다. (파생 값은 Portfolio가 계산)"""
+    return compact_stock({
+        '종목명': name,
+        '보유 수량': quantity,
+        '매수 단가': purchase_price,
+        '현재 주가': current_price,
+        '월별 배당금': monthly_dividends
+    })
+
+
+class Portfolio:
+    """보유 종목을 열 단위 NumPy 배열로 보관하고 파생 값과 합계를 계산하는 엔진
+
+    - quantity, purchase_price, current_price: (종목 수,) 배열
+    - dividends: (종목 수, 12) 월별 배당금 행렬
+    - purchase_dates: (종목 수,) datetime64[D] 매수일 배열 (없으면 NaT)
+    - currencies: 종목 통화 코드 목록 (금액 배열은 각 종목의 통화 기준, 기본 USD)
+    - schedules: 종목별 배당 일정 목록 (없으면 None, dividend_calendar()에서 사용)
+    파생 값은 처음 사용할 때 벡터 연산으로 한 번만 계산해 보관합니다. version은 이 포트폴리오를
+    만든 종목 목록의 버전으로, 같은 버전이면 다시 만들 필요가 없습니다.
+    """
+
+    def __init__(self, names, quantity, purchase_price, current_price, dividends, version=None,
+                 purchase_dates=None, currencies=None, schedules=None):
+        self.names = list(names)
+        self.quantity = np.asarray(quantity, dtype=float)
+        self.purchase_price = np.asarray(purchase_price, dtype=float)
+        self.current_price = np.asarray(current_price, dtype=float)
+        self.dividends = np.asarray(dividends, dtype=float).reshape(len(self.names), 12)
+        if purchase_dates is None:
+            purchase_dates = [None] * len(self.names)
+        self.purchase_dates = np.array([date or 'NaT' for date in purchase_dates], dtype='datetime64[D]')
+        self.currencies = [currency or 'USD' for currency in currencies] if currencies is not None \
+            else ['USD'] * len(self.names)
+        self.schedules = list(schedules) if schedules is not None else [None] * len(self.names)
+        self.version = version
+
+    @classmethod
+    def from_stocks(cls, stocks, version=None):
+        """종목 딕셔너리 목록에서 포트폴리오를 만듭니다. (이전 형식의 파생 값은 무시)"""
+        count = len(stocks)
+
+        def column(key):
+            return np.fromiter((stock[key] for stock in stocks), dtype=float, count=count)
+
+        # 월별 배당금은 (종목 수 × 12) 값을 한 줄로 읽어 행렬로 변환
+        dividends = np.fromiter(
+            itertools.chain.from_iterable(
+                (monthly.get(month, 0.0) for month in MONTHS)
+                for monthly in (stock['월별 배당금'] for stock in stocks)
+            ),
+            dtype=float, count=count * 12
+        )
+        return cls([stock['종목명'] for stock in stocks], column('보유 수량'), column('매수 단가'),
+                   column('현재 주가'), dividends, version=version,
+                   purchase_dates=[stock.get('매수일') for stock in stocks],
+                   currencies=[stock.get('통화') for stock in stocks],
+                   schedules=[stock.get('배당 일정') for stock in stocks])
+
+    @classmethod
+    def from_holdings(cls, holdings, version=None):
+        """Holding 목록에서 포트폴리오를 만듭니다. (월별 배당금 배열을 그대로 이어 붙임)"""
+        count = len(holdings)
+        dividends = array('d')
+        for holding in holdings:
+            dividends.extend(holding.dividends)
+        return cls(
+            [holding.name for holding in holdings],
+            np.fromiter((holding.quantity for holding in holdings), dtype=float, count=count),
+            np.fromiter((holding.purchase_price for holding in holdings), dtype=float, count=count),
+            np.fromiter((holding.current_price for holding in holdings), dtype=float, count=count),
+            np.frombuffer(dividends, dtype=float) if count else np.zeros((0, 12)),
+            version=version,
+            purchase_dates=[holding.purchase_date for holding in holdings],
+            currencies=[holding.currency for holding in holdings],
+            schedules=[holding.schedule for holding in holdings]
+        )
+
+    @cached_property
+    def fingerprint(self):
+        """종목 구성과 입력 값이 같으면 같은 값이 되는 해시 (화면 캐시 키로 사용)"""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update('\0'.join(self.names).encode('utf-8'))
+        for values in (self.quantity, self.purchase_price, self.current_price, self.dividends, self.purchase_dates,
+                       self.currency_codes):
+            digest.update(np.ascontiguousarray(values).tobytes())
+        if any(self.schedules):
+            digest.update(json.dumps(self.schedules, sort_keys=True).encode('utf-8'))
+        return digest.hexdigest()
+
+    @cached_property
+    def currency_codes(self):
+        """종목별 통화 인덱스 배열 (currency.CURRENCIES 기준)"""
+        return currency_codes(self.currencies)
+
+    @property
+    def single_currency(self):
+        """모든 종목이 같은 통화이면 그 통화, 아니면 None"""
+        currencies = set(self.currencies)
+        return currencies.pop() if len(currencies) == 1 else None
+
+    @cached_property
+    def total_investment(self):
+        return self.quantity * self.purchase_price
+
+    @cached_property
+    def current_value(self):
+        return self.quantity * self.current_price
+
+    @cached_property
+    def total_dividend(self):
+        return self.dividends.sum(axis=1)
+
+    @cached_property
+    def profit_loss(self):
+        return self.current_value + self.total_dividend - self.total_investment
+
+    @cached_property
+    def profit_rate(self):
+        return np.divide(self.profit_loss * 100, self.total_investment,
+                         out=np.zeros_like(self.profit_loss), where=self.total_investment > 0)
+
+    def __len__(self):
+        return len(self.names)
+
+    def frame(self):
+        """종목별 입력 값과 파생 값을 담은 DataFrame"""
+        return pd.DataFrame({
+            '종목명': self.names,
+            '보유 수량': self.quantity,
+            '매수 단가': self.purchase_price,
+            '현재 주가': self.current_price,
+            '총 투자금': self.total_investment,
+            '현재 평가금': self.current_value,
+            '누적 배당금': self.total_dividend,
+            '실제 손익': self.profit_loss,
+            '수익률 (%)': self.profit_rate
+        })
+
+    def monthly_frame(self):
+        """종목 × 월 배당금 DataFrame"""
+        return pd.DataFrame(self.dividends, index=self.names, columns=MONTHS)
+
+    def dividend_pivot(self, top_n=None):
+        """월 × 종목 배당금 DataFrame (연간 배당금 상위 top_n 종목만 열로 두고 나머지는 '기타'로 합산)"""
+        labels = [f"{i+1}. {name}" for i, name in enumerate(self.names)]
+        order = np.argsort(-self.total_dividend, kind='stable')
+        keep, rest = (order[:top_n], order[top_n:]) if top_n is not None else (order, order[:0])
+        pivot = pd.DataFrame(self.dividends[keep].T, index=pd.Index(MONTHS, name='월'),
+                             columns=[labels[i] for i in keep])
+        if len(rest):
+            pivot['기타'] = self.dividends[rest].sum(axis=0)
+        return pivot
+
+    def dividend_calendar(self, start, end):
+        """배당 일정을 [start, end) 기간의 배당 이벤트 달력으로 펼칩니다. (매수일 이전 배당락일은 제외)"""
+        return DividendCalendar.from_schedules(self.schedules, start, end, self.purchase_dates)
+
+    def totals(self):
+        """포트폴리오 전체 합계 (종목 통화를 환산하지 않으므로 단일 통화 포트폴리오에 사용)"""
+        total_investment = float(self.total_investment.sum())
+        profit_loss = float(self.profit_loss.sum())
+        return {
+            '총 투자금': total_investment,
+            '현재 평가금': float(self.current_value.sum()),
+            '누적 배당금': float(self.total_dividend.sum()),
+            '실제 손익': profit_loss,
+            '수익률 (%)': (profit_loss / total_investment * 100) if total_investment > 0 else 0
+        }
+
+    def monthly_totals(self):
+        """월별 배당금 합계 (길이 12 배열)"""
+        return self.dividends.sum(axis=0)
+
+    def weights(self):
+        """투자금/평가금 기준 비중(%)"""
+        total_investment = self.total_investment.sum()
+        total_value = self.current_value.sum()
+        invest_pct = self.total_investment / total_investment * 100 if total_investment > 0 else np.zeros(len(self))
+        value_pct = self.current_value / total_value * 100 if total_value > 0 else np.zeros(len(self))
+        return invest_pct, value_pct
+
+    def to_stocks(self):
+        """저장용 종목 딕셔너리 목록으로 변환합니다."""
+        return [
+            compact_stock({
+                '종목명': self.names[i],
+                '보유 수량': float(self.quantity[i]),
+                '매수 단가': float(self.purchase_price[i]),
+                '현재 주가': float(self.current_price[i]),
+                '월별 배당금': dict(zip(MONTHS, self.dividends[i].tolist())),
+                '매수일': None if np.isnat(self.purchase_dates[i]) else str(self.purchase_dates[i]),
+                '통화': self.currencies[i],
+                '배당 일정': self.schedules[i]
+            })
+            for i in range(len(self))
+        ]
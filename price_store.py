@@ -0,0 +1,223 @@
+import io
+import os
+import sys
+import json
+import time
+import threading
+
+import numpy as np
+import pandas as pd
+
+from atomic_io import atomic_write_bytes, atomic_write_json, file_lock
+
+# 키 = (티커 인덱스 << 32) | (1970-01-01 기준 일 수 + DAY_OFFSET): 1970년 이전 날짜도 양수로 정렬되도록 이동
+DAY_OFFSET = 1 << 31
+# 다른 프로세스가 시세를 갱신했는지 확인하는 최소 간격 (초)
+CHECK_INTERVAL = 30
+
+
+def ticker_key(name):
+    """종목명 -> 시세 저장소 티커 (앞뒤 공백 제거, 대문자)"""
+    return str(name).strip().upper()
+
+
+class PriceStore:
+    """티커 × 날짜 종가를 메모리 매핑 NumPy 배열로 보관하는 로컬 시세 저장소
+
+    directory 안에 keys-<버전>.npy(정렬된 int64 키), close-<버전>.npy(종가), tickers-<버전>.json(티커 목록)을
+    두고 manifest.json이 현재 버전을 가리킵니다. 키가 (티커, 날짜)순으로 정렬되어 있으므로 여러 티커의
+    기준일 이전 최근 종가를 np.searchsorted 한 번으로 찾습니다. 배열은 mmap_mode='r'로 열어 필요한 부분만
+    읽고, 갱신(ingest)은 새 버전 파일을 다 쓴 뒤 manifest를 바꾸므로 읽는 쪽은 항상 완전한 버전을 봅니다.
+    열린 버전은 (버전, 키, 종가, 티커 목록, 티커 인덱스) 튜플 하나로 바꿔 끼우므로, 조회는 호출마다 이 튜플을
+    한 번 읽어 다른 스레드가 새 버전을 여는 중에도 한 버전의 배열만 씁니다.
+    """
+
+    def __init__(self, directory='./prices', check_interval=CHECK_INTERVAL, clock=time.monotonic):
+        self.directory = directory
+        self.manifest_path = os.path.join(directory, 'manifest.json')
+        self.check_interval = check_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._signature = None
+        self._next_check = 0.0
+        self._load(None)
+        self.reload_if_changed(force=True)
+
+    def _path(self, name, version, extension):
+        return os.path.join(self.directory, f'{name}-{version}.{extension}')
+
+    def _load(self, version):
+        if version is None:
+            keys, close, tickers = np.empty(0, dtype=np.int64), np.empty(0), []
+        else:
+            keys = np.load(self._path('keys', version, 'npy'), mmap_mode='r')
+            close = np.load(self._path('close', version, 'npy'), mmap_mode='r')
+            with open(self._path('tickers', version, 'json'), 'r', encoding='utf-8') as file:
+                tickers = json.load(file)
+        self._data = (version, keys, close, tickers, {ticker: i for i, ticker in enumerate(tickers)})
+
+    @property
+    def version(self):
+        return self._data[0]
+
+    @property
+    def keys(self):
+        return self._data[1]
+
+    @property
+    def close(self):
+        return self._data[2]
+
+    @property
+    def tickers(self):
+        return self._data[3]
+
+    def reload_if_changed(self, force=False):
+        """manifest가 바뀌었으면 새 버전을 엽니다. (force가 아니면 check_interval초에 한 번만 확인)"""
+        now = self._clock()
+        if not force and now < self._next_check:
+            return False
+        self._next_check = now + self.check_interval
+        try:
+            stat = os.stat(self.manifest_path)
+            signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            signature = None
+        if signature == self._signature:
+            return False
+        with self._lock:
+            version = None
+            if signature is not None:
+                with open(self.manifest_path, 'r', encoding='utf-8') as file:
+                    version = json.load(file)['version']
+            self._load(version)
+            self._signature = signature
+        return True
+
+    def __len__(self):
+        return len(self.keys)
+
+    def latest(self, names, as_of=None):
+        """종목명 목록의 as_of(기본: 전체 최신) 이전(당일 포함) 가장 최근 종가 배열 (없으면 NaN)
+
+        같은 티커는 한 번만 찾고 결과를 종목 위치로 펼칩니다.
+        """
+        tickers, inverse = np.unique(np.array([ticker_key(name) for name in names], dtype=object),
+                                     return_inverse=True)
+        _, keys, close, _, index = self._data
+        prices = np.full(len(tickers), np.nan)
+        found = np.array([ticker in index for ticker in tickers], dtype=bool)
+        if found.any() and len(keys):
+            positions = np.array([index[ticker] for ticker in tickers[found]], dtype=np.int64)
+            day = np.datetime64(as_of, 'D').astype(np.int64) + DAY_OFFSET if as_of is not None else (1 << 32) - 1
+            # 각 티커의 기준일 이하 마지막 키 위치 (그 위치의 티커가 다르면 기준일 이전 시세가 없음)
+            rows = np.searchsorted(keys, (positions << 32) | day, side='right') - 1
+            valid = (rows >= 0) & (keys[np.maximum(rows, 0)] >> 32 == positions)
+            values = np.full(len(positions), np.nan)
+            values[valid] = close[rows[valid]]
+            prices[found] = values
+        return prices[inverse]
+
+    def history(self, name):
+        """(날짜 배열, 종가 배열) 한 종목의 전체 시세"""
+        _, keys, close, _, tickers = self._data
+        index = tickers.get(ticker_key(name))
+        if index is None:
+            return np.empty(0, dtype='datetime64[D]'), np.empty(0)
+        lo, hi = np.searchsorted(keys, [index << 32, (index + 1) << 32])
+        days = (np.asarray(keys[lo:hi]) & ((1 << 32) - 1)) - DAY_OFFSET
+        return days.astype('datetime64[D]'), np.asarray(close[lo:hi])
+
+    def ingest(self, tickers, dates, closes):
+        """(티커, 날짜, 종가) 배열을 추가하고 새 버전으로 저장합니다. 같은 티커/날짜는 새 값으로 바꿉니다."""
+        os.makedirs(self.directory, exist_ok=True)
+        with file_lock(self.manifest_path):
+            # 다른 프로세스가 먼저 갱신했을 수 있으므로 최신 버전 위에 합침
+            self.reload_if_changed(force=True)
+            current_version, current_keys, current_close, current_tickers, current_index = self._data
+            # 티커 정규화와 인덱스 배정은 행이 아니라 고유 티커마다 한 번
+            unique, inverse = np.unique(np.asarray(tickers, dtype=object), return_inverse=True)
+            names = list(current_tickers)
+            index = dict(current_index)
+            for ticker in map(ticker_key, unique):
+                if ticker not in index:
+                    index[ticker] = len(names)
+                    names.append(ticker)
+            positions = np.array([index[ticker_key(ticker)] for ticker in unique], dtype=np.int64)[inverse]
+            days = np.asarray(dates, dtype='datetime64[D]').astype(np.int64) + DAY_OFFSET
+            keys = np.concatenate((current_keys, (positions << 32) | days))
+            close = np.concatenate((current_close, np.asarray(closes, dtype=float)))
+            order = np.argsort(keys, kind='stable')
+            keys, close = keys[order], close[order]
+            # 같은 키는 나중 값(새로 넣은 값)만 남김
+            keep = np.append(keys[1:] != keys[:-1], True)
+            version = (current_version or 0) + 1
+            for name, array in (('keys', keys[keep]), ('close', close[keep])):
+                buffer = io.BytesIO()
+                np.save(buffer, array)
+                atomic_write_bytes(self._path(name, version, 'npy'), buffer.getvalue())
+            atomic_write_json(self._path('tickers', version, 'json'), names, indent=None)
+            atomic_write_json(self.manifest_path, {'version': version, 'rows': int(keep.sum()), 'tickers': len(names)})
+            self._remove_versions(before=version - 1)
+            self.reload_if_changed(force=True)
+        return len(self)
+
+    def _remove_versions(self, before):
+        # 바로 이전 버전은 막 manifest를 읽은 다른 프로세스를 위해 남겨 둠
+        for filename in os.listdir(self.directory):
+            stem, _, extension = filename.rpartition('.')
+            name, _, version = stem.rpartition('-')
+            if name in ('keys', 'close', 'tickers') and version.isdigit() and int(version) < before:
+                try:
+                    os.remove(os.path.join(self.directory, filename))
+                except OSError:
+                    # Windows에서는 다른 프로세스가 아직 메모리 매핑으로 연 파일을 지울 수 없음 (다음 갱신 때 다시 시도)
+                    pass
+
+
+def load_price_file(path):
+    """date,ticker,close 열을 가진 CSV 시세 파일(시세 피드 대신 사용) -> (티커, 날짜, 종가) 배열
+
+        date,ticker,close
+        2024-01-02,O,57.31
+    """
+    frame = pd.read_csv(path, usecols=['date', 'ticker', 'close'], dtype={'ticker': str})
+    return (frame['ticker'].to_numpy(dtype=object), frame['date'].to_numpy(dtype='datetime64[D]'),
+            frame['close'].to_numpy(dtype=float))
+
+
+def apply_prices(holdings, store, as_of=None):
+    """Holding 목록의 현재 주가를 시세 저장소 종가로 바꿉니다. (시세가 없는 종목은 그대로, 바뀐 종목 수 반환)"""
+    prices = store.latest([holding.name for holding in holdings], as_of)
+    changed = 0
+    for holding, price in zip(holdings, prices.tolist()):
+        if price == price and price != holding.current_price:
+            holding.current_price = price
+            changed += 1
+    return changed
+
+
+def refresh_all_prices(user_manager, store, as_of=None):
+    """모든 사용자의 모든 종목 현재 주가를 시세 저장소로 한 번에 갱신합니다. (바뀐 종목 수 반환)
+
+    저장소별 update_current_prices()가 전체 종목명을 한 번에 넘기면, 고유 티커마다 한 번만 종가를 찾아
+    종목 위치로 펼친 배열을 돌려주고, 저장소는 바뀐 값만 한 번의 쓰기로 반영합니다.
+    """
+    return user_manager.update_current_prices(lambda names: store.latest(names, as_of))
+
+
+if __name__ == '__main__':
+    # 사용법: python price_store.py refresh <시세 CSV> [기준일]
+    #   시세 파일을 저장소(YIELDNOTE_PRICE_STORE, 기본 ./prices)에 넣고 모든 사용자의 현재 주가를 갱신합니다.
+    if len(sys.argv) < 3 or sys.argv[1] != 'refresh':
+        print("사용법: python price_store.py refresh <시세 CSV> [기준일 YYYY-MM-DD]")
+        sys.exit(1)
+    from user_store import make_user_manager
+    started = time.perf_counter()
+    store = PriceStore(os.environ.get('YIELDNOTE_PRICE_STORE', './prices'))
+    rows = store.ingest(*load_price_file(sys.argv[2]))
+    loaded = time.perf_counter()
+    changed = refresh_all_prices(make_user_manager(os.environ.get('YIELDNOTE_STORAGE', 'json')), store,
+                                 sys.argv[3] if len(sys.argv) > 3 else None)
+    print(f"시세 {rows:,}건 (티커 {len(store.tickers):,}개) 저장 {loaded - started:.2f}초, "
+          f"현재 주가 {changed:,}건 갱신 {time.perf_counter() - loaded:.2f}초")
\ No newline at end of file
@@ -0,0 +1,173 @@
+import numpy as np
+
+# 예측 기간 상한 (년)
+MAX_YEARS = 30
+# 한 번에 시뮬레이션하는 (시나리오 × 종목 × 월) 원소 수 상한 (중간 배열 메모리 제한)
+BLOCK_ELEMENTS = 1_000_000
+# 재투자(DRIP) 시나리오 계산은 블록당 약 15 ms이므로 한 번의 예측을 50블록(약 0.8초) 안으로 제한
+DRIP_MAX_BLOCKS = 50
+# 화면에서 고르는 시나리오 수
+SCENARIO_CHOICES = (1000, 5000, 10000)
+
+
+class ProjectionResult:
+    """배당 수입 예측 결과
+
+    - months: 예측 월 datetime64[M] 배열
+    - income: (시나리오 수, 월 수) 월별 배당 수입
+    - value: (시나리오 수, 연수) 예측 연도 말 평가금 (재투자한 주식 포함)
+    결정적 예측(시나리오 없음)은 시나리오 수가 1입니다.
+    """
+
+    def __init__(self, start_month, income, value):
+        self.months = np.datetime64(start_month, 'M') + np.arange(income.shape[1])
+        self.income = income
+        self.value = value
+
+    @property
+    def scenarios(self):
+        return self.income.shape[0]
+
+    @property
+    def years(self):
+        return self.income.shape[1] // 12
+
+    def yearly_income(self):
+        """(시나리오 수, 연수) 예측 연도별 배당 수입 (예측 시작 월부터 12개월 단위)"""
+        return self.income.reshape(self.scenarios, self.years, 12).sum(axis=2)
+
+    def percentiles(self, q=(10, 50, 90)):
+        """(len(q), 연수) 시나리오별 연간 배당 수입의 백분위수"""
+        return np.percentile(self.yearly_income(), q, axis=0)
+
+
+def _per_holding(value, count):
+    return np.broadcast_to(np.asarray(value, dtype=float), (count,))
+
+
+def _scenario_factors(count, years, months, dividend_volatility, price_volatility, rng):
+    # 시나리오별 시장 공통 충격: (count, 연수) 배당 성장 누적 계수, (count, 월 수) 주가 누적 계수
+    dividend = np.ones((count, years))
+    if dividend_volatility > 0 and years > 1:
+        shocks = np.maximum(1.0 + dividend_volatility * rng.standard_normal((count, years - 1)), 0.0)
+        dividend[:, 1:] = np.cumprod(shocks, axis=1)
+    price = np.ones((count, months))
+    if price_volatility > 0:
+        # 평균이 1인 로그정규 경로
+        log_returns = price_volatility / np.sqrt(12) * rng.standard_normal((count, months)) - price_volatility ** 2 / 24
+        price = np.exp(np.cumsum(log_returns, axis=1))
+    return dividend, price
+
+
+def _simulate(quantity, dps, prices, dividend_shock, price_shock, drip):
+    # 종목별 기본 경로 dps, prices (종목 수, 월 수)에 시나리오 충격 (시나리오 수, 월 수)을 곱해 한 번에 계산
+    months = dps.shape[1]
+    year_ends = np.arange(11, months, 12)
+    if not drip:
+        income = dividend_shock * (quantity @ dps)[None, :]
+        value = price_shock[:, year_ends] * (quantity @ prices[:, year_ends])[None, :]
+        return income, value
+    # 배당금으로 그 달 주가에 주식을 더 삼: 보유 수량은 (1 + 주당 배당 / 주가)의 누적 곱.
+    # 배당이 없는 달은 보유 수량이 그대로이므로 배당이 있는 달만 계산
+    paid = np.flatnonzero(dps.any(axis=0))
+    yield_path = np.divide(dps[:, paid], prices[:, paid], out=np.zeros((len(dps), len(paid))),
+                           where=prices[:, paid] > 0)
+    # 누적 곱이 계산의 대부분이므로 float32로 계산 (360개월 누적에도 상대 오차 1e-5 수준)
+    reinvest = 1.0 + yield_path.astype(np.float32)[None, :, :] * \
+        (dividend_shock[:, paid] / price_shock[:, paid]).astype(np.float32)[:, None, :]
+    after = np.cumprod(reinvest, axis=2)
+    after *= quantity[None, :, None]
+    income = np.zeros(dividend_shock.shape)
+    income[:, paid] = dividend_shock[:, paid] * np.einsum('shk,hk->sk', after / reinvest, dps[:, paid])
+    # 연도 말 보유 수량 = 그 시점까지 마지막 배당 달의 재투자 후 수량 (그 전이면 처음 수량)
+    last = np.searchsorted(paid, year_ends, side='right') - 1
+    shares = np.concatenate((np.broadcast_to(quantity[None, :, None], after.shape[:2] + (1,)), after), axis=2)
+    value = price_shock[:, year_ends] * np.einsum('shy,hy->sy', shares[:, :, last + 1], prices[:, year_ends])
+    return income, value
+
+
+def max_scenarios(holdings, years, drip):
+    """종목 수와 예측 기간에서 한 번에 계산할 수 있는 시나리오 수 (재투자가 없으면 화면 선택지의 최댓값)
+
+    재투자 계산은 (시나리오 × 종목 × 월)에 비례하므로 DRIP_MAX_BLOCKS × BLOCK_ELEMENTS 원소로 제한합니다.
+    """
+    if not drip:
+        return max(SCENARIO_CHOICES)
+    return max(1, DRIP_MAX_BLOCKS * BLOCK_ELEMENTS // (max(1, holdings) * years * 12))
+
+
+def scenario_choices(holdings, years, drip):
+    """화면 선택지 중 max_scenarios 이하인 시나리오 수 (하나도 없으면 상한을 100 단위로 내린 값 하나)"""
+    limit = max_scenarios(holdings, years, drip)
+    return [count for count in SCENARIO_CHOICES if count <= limit] or [limit // 100 * 100 or limit]
+
+
+def project_income(quantity, price, monthly_dps, years=10, start_month='2025-01', dividend_growth=0.05,
+                   price_growth=0.05, drip=False, scenarios=0, dividend_volatility=0.0, price_volatility=0.0,
+                   seed=0):
+    """앞으로 years년의 월별 배당 수입을 예측합니다.
+
+    - quantity, price: (종목 수,) 현재 보유 수량과 주가
+    - monthly_dps: (종목 수, 12) 1월~12월 주당 배당금
+    - dividend_growth, price_growth: 연 성장률 (스칼라 또는 종목별 배열, 0.05 = 5%)
+    - drip: 배당금을 그 달 주가로 재투자
+    - scenarios: 0이면 결정적 예측, 1 이상이면 몬테카를로 시나리오 수. 시나리오마다 시장 공통 충격으로
+      배당 성장률에 연 변동성(dividend_volatility)을, 주가에 연 변동성(price_volatility)을 줍니다.
+    종목별 기본 경로는 한 번만 만들고 시나리오 충격은 (시나리오 × 월) 배열로 곱하므로, 재투자가 없으면
+    행렬 곱 한 번이고 재투자가 있어도 (시나리오 × 종목 × 월) 누적 곱 한 번으로 끝납니다.
+    재투자 계산의 중간 배열은 메모리 상한에 맞춰 시나리오를 나눠 계산하고, 시나리오 수는 max_scenarios로
+    제한합니다.
+    """
+    if not 1 <= years <= MAX_YEARS:
+        raise ValueError(f"예측 기간은 1~{MAX_YEARS}년이어야 합니다.")
+    quantity = np.asarray(quantity, dtype=float)
+    holdings = len(quantity)
+    limit = max_scenarios(holdings, years, drip)
+    if drip and scenarios > limit:
+        raise ValueError(f"종목 {holdings}개, {years}년 재투자 예측의 시나리오 수는 최대 {limit:,}개입니다.")
+    price = np.asarray(price, dtype=float)
+    monthly_dps = np.asarray(monthly_dps, dtype=float).reshape(holdings, 12)
+    dividend_growth = _per_holding(dividend_growth, holdings)
+    price_growth = _per_holding(price_growth, holdings)
+
+    start_month = np.datetime64(start_month, 'M')
+    months = years * 12
+    calendar_months = (start_month.astype(np.int64) + np.arange(months)) % 12
+    year_index = np.arange(months) // 12
+
+    # 종목별 기본 경로: 배당은 예측 연도가 바뀔 때마다 성장 (첫해는 현재 배당), 주가는 월 복리 성장
+    growth = np.cumprod(np.maximum(1.0 + np.tile(dividend_growth[:, None], (1, years)), 0.0), axis=1)
+    growth /= np.maximum(growth[:, :1], 1e-12)
+    dps = monthly_dps[:, calendar_months] * growth[:, year_index]
+    prices = price[:, None] * np.exp(np.outer(np.log1p(price_growth) / 12, np.arange(1, months + 1)))
+
+    stochastic = scenarios > 0 and (dividend_volatility > 0 or price_volatility > 0)
+    total = scenarios if stochastic else 1
+    rng = np.random.default_rng(seed)
+
+    income = np.empty((total, months))
+    value = np.empty((total, years))
+    block = max(1, BLOCK_ELEMENTS // max(1, holdings * months)) if drip else total
+    for lo in range(0, total, block):
+        hi = min(lo + block, total)
+        dividend_shock, price_shock = _scenario_factors(hi - lo, years, months, dividend_volatility if stochastic else 0.0,
+                                                        price_volatility if stochastic else 0.0, rng)
+        income[lo:hi], value[lo:hi] = _simulate(quantity, dps, prices, dividend_shock[:, year_index], price_shock,
+                                                drip)
+    return ProjectionResult(start_month, income, value)
+
+
+def portfolio_projection_inputs(portfolio, rates, currency, year):
+    """포트폴리오에서 (보유 수량, 주가, 월별 주당 배당금)을 currency 기준으로 만듭니다.
+
+    배당 일정이 있는 종목은 year년 일정의 주당 배당금을, 없는 종목은 월별 배당금 ÷ 보유 수량을 씁니다.
+    """
+    factors = rates.factors(portfolio.currency_codes, currency)
+    quantity = portfolio.quantity
+    monthly_dps = np.divide(portfolio.dividends, quantity[:, None], out=np.zeros_like(portfolio.dividends),
+                            where=quantity[:, None] > 0)
+    scheduled = np.array([bool(schedule) for schedule in portfolio.schedules], dtype=bool)
+    if scheduled.any():
+        calendar = portfolio.dividend_calendar(f'{year - 1}-01-01', f'{year + 1}-01-01')
+        monthly_dps[scheduled] = calendar.holding_monthly(np.ones(len(portfolio)), year)[scheduled]
+    return quantity, portfolio.current_price * factors, monthly_dps * factors[:, None]
\ No newline at end of file
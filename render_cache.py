@@ -0,0 +1,57 @@
+import threading
+from collections import OrderedDict
+
+
+class RenderCache:
+    """화면에 그릴 표(DataFrame)를 키별로 보관하는 LRU 캐시
+
+    키는 (포트폴리오 지문, 환율, 통화 표시 방식, ...)처럼 결과를 결정하는 입력 값의 튜플입니다.
+    입력이 같으면 이전에 만든 결과를 그대로 돌려주고, maxsize를 넘으면 가장 오래 쓰지 않은
+    항목부터 버립니다. 여러 세션이 함께 쓰므로 잠금으로 보호합니다.
+    """
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_build(self, key, build):
+        """key에 해당하는 결과를 반환합니다. 없으면 build()로 만들어 보관합니다."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+        # 표 생성은 잠금 밖에서 (다른 세션의 조회를 막지 않도록)
+        value = build()
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def metrics(self):
+        """캐시 적중/미적중 통계"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_ratio': self.hits / lookups if lookups else 0.0
+            }
\ No newline at end of file
@@ -0,0 +1,58 @@
+import os
+import json
+import threading
+
+from atomic_io import atomic_write_json, file_lock
+
+
+def sidecar_path(config_path):
+    """설정 파일 옆의 세션 세대 파일 경로 (users.json -> users_sessions.json)"""
+    return os.path.splitext(config_path)[0] + '_sessions.json'
+
+
+class SessionGenerations:
+    """사용자별 세션 세대를 설정 파일과 분리해 작은 JSON 파일 하나에 보관하는 저장소
+
+    로그아웃할 때마다 세대를 올리므로 사용자 정보 전체를 다시 쓰거나 백업 스냅샷을 만들지 않도록
+    {사용자명: 세대}만 따로 저장합니다. 조회는 파일이 바뀐 경우에만 다시 읽고, 없는 사용자의 세대는 0입니다.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._generations = {}
+        self._signature = None
+
+    def _stat_signature(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def _reload(self, force=False):
+        signature = self._stat_signature()
+        if force or signature != self._signature:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as file:
+                    self._generations = json.load(file)
+            except (OSError, ValueError):
+                self._generations = {}
+            self._signature = signature
+
+    def get(self, username):
+        """username의 세션 세대 (다른 프로세스가 올린 세대도 보이도록 파일 변경 확인 후 조회)"""
+        with self._lock:
+            self._reload()
+            return self._generations.get(username, 0)
+
+    def bump(self, username):
+        """username의 세션 세대를 1 올리고 새 세대를 반환합니다."""
+        with self._lock, file_lock(self.path):
+            self._reload(force=True)
+            generations = dict(self._generations)
+            generations[username] = generations.get(username, 0) + 1
+            atomic_write_json(self.path, generations)
+            self._generations = generations
+            self._signature = self._stat_signature()
+            return generations[username]
@@ -0,0 +1,161 @@
+import os
+import sys
+import hmac
+import json
+import time
+import base64
+import hashlib
+
+import streamlit as st
+
+from atomic_io import atomic_write_json, file_lock
+
+# 세션 토큰을 담는 URL 쿼리 파라미터 이름
+QUERY_PARAM = 'session'
+# 토큰 유효 기간 (초). 유효 기간의 절반이 지나면 새 토큰으로 바꾸므로 사용 중인 세션은 계속 유지됨
+DEFAULT_TTL = 12 * 3600
+# 키 교체 후에도 검증에 쓰는 이전 키 개수
+KEEP_KEYS = 2
+# 로그아웃 버튼 안내 (세션 세대를 올리므로 같은 계정의 모든 세션이 함께 끝남)
+LOGOUT_HELP = "이 계정으로 로그인한 모든 기기와 브라우저, 복사해 둔 URL에서 함께 로그아웃됩니다."
+
+
+def _b64encode(data):
+    return base64.urlsafe_b64encode(data).decode('ascii').rstrip('=')
+
+
+def _b64decode(text):
+    return base64.urlsafe_b64decode(text + '=' * (-len(text) % 4))
+
+
+class SessionTokens:
+    """HMAC 서명 세션 토큰 (<키 ID>.<내용>.<서명>)
+
+    내용에는 사용자명, 이름, 만료 시각, 세션 세대가 들어 있습니다. 서명을 확인한 뒤 사용자 레코드의
+    세션 세대 하나만 비교하면 로그인 상태를 복원할 수 있고, 로그아웃 때 세대를 올리면 그 전에 발급한
+    토큰은 모두 무효가 됩니다. keys는 (키 ID, 비밀 키) 목록이며 첫 번째 키로 서명하고,
+    나머지(교체 전 키)는 검증에만 씁니다. 이전 키로 서명됐거나 유효 기간이 절반 이상 지난 토큰은
+    needs_refresh()가 True이므로 새 토큰으로 바꿔 줍니다.
+    """
+
+    def __init__(self, keys, ttl=DEFAULT_TTL, clock=time.time):
+        if not keys:
+            raise ValueError("세션 토큰 서명 키가 없습니다.")
+        self.key_id = keys[0][0]
+        self._keys = dict(keys)
+        self.ttl = ttl
+        self._clock = clock
+
+    def _sign(self, key, message):
+        return _b64encode(hmac.new(key, message.encode('ascii'), hashlib.sha256).digest())
+
+    def issue(self, username, name, generation=0):
+        """새 토큰을 만듭니다. (generation: 사용자 레코드의 세션 세대)"""
+        now = int(self._clock())
+        payload = _b64encode(json.dumps({'u': username, 'n': name, 'g': generation, 'iat': now, 'exp': now + self.ttl},
+                                        ensure_ascii=False, separators=(',', ':')).encode())
+        message = f"{self.key_id}.{payload}"
+        return f"{message}.{self._sign(self._keys[self.key_id], message)}"
+
+    def verify(self, token):
+        """서명과 만료 시각이 유효하면 토큰 내용(dict), 아니면 None"""
+        try:
+            key_id, payload, signature = token.split('.')
+        except (AttributeError, ValueError):
+            return None
+        key = self._keys.get(key_id)
+        if key is None:
+            return None
+        # 앞부분이 몇 글자 맞는지와 관계없이 같은 시간이 걸리도록 compare_digest로 비교
+        if not hmac.compare_digest(self._sign(key, f"{key_id}.{payload}"), signature):
+            return None
+        try:
+            claims = json.loads(_b64decode(payload))
+        except ValueError:
+            return None
+        if claims.get('exp', 0) <= self._clock():
+            return None
+        claims['kid'] = key_id
+        return claims
+
+    def needs_refresh(self, claims):
+        return claims['kid'] != self.key_id or claims['exp'] - self._clock() < self.ttl / 2
+
+
+def _new_key():
+    return {'id': _b64encode(os.urandom(6)), 'secret': os.urandom(32).hex()}
+
+
+def load_keys(path='./session_keys.json'):
+    """서명 키 목록 [(키 ID, 비밀 키), ...]
+
+    YIELDNOTE_SESSION_KEYS 환경 변수("ID:16진수 키,ID:16진수 키", 첫 번째가 현재 키)가 있으면 그것을,
+    없으면 키 파일을 사용하며 파일이 없으면 새 키로 만듭니다.
+    """
+    env_keys = os.environ.get('YIELDNOTE_SESSION_KEYS')
+    if env_keys:
+        return [(key_id, bytes.fromhex(secret))
+                for key_id, secret in (item.split(':', 1) for item in env_keys.split(',') if item)]
+    if not os.path.exists(path):
+        with file_lock(path):
+            # 여러 프로세스가 동시에 시작해도 키 파일은 한 번만 만듦
+            if not os.path.exists(path):
+                atomic_write_json(path, {'keys': [_new_key()]})
+    with open(path, 'r', encoding='utf-8') as file:
+        return [(key['id'], bytes.fromhex(key['secret'])) for key in json.load(file)['keys']]
+
+
+def rotate_keys(path='./session_keys.json', keep=KEEP_KEYS):
+    """새 서명 키를 맨 앞에 추가하고 이전 키는 keep개만 남깁니다. (그보다 오래된 키의 토큰은 무효)"""
+    with file_lock(path):
+        keys = []
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as file:
+                keys = json.load(file)['keys']
+        keys.insert(0, _new_key())
+        atomic_write_json(path, {'keys': keys[:keep + 1]})
+    return keys[0]['id']
+
+
+@st.cache_resource
+def get_session_tokens(path='./session_keys.json'):
+    """프로세스 전체에서 공유하는 세션 토큰 서명기 (키는 처음 한 번만 읽음)"""
+    return SessionTokens(load_keys(path))
+
+
+def restore_session(tokens, session_generation):
+    """URL의 세션 토큰을 확인합니다. 유효하면 토큰 내용을, 아니면 None을 반환합니다.
+
+    session_generation(사용자명 -> 세션 세대, 없는 사용자는 None)과 토큰의 세대가 다르면 로그아웃한
+    세션의 토큰이므로 무효입니다. 곧 만료되거나 이전 키로 서명된 토큰은 새 토큰으로 바꿉니다.
+    """
+    token = st.query_params.get(QUERY_PARAM)
+    if not token:
+        return None
+    claims = tokens.verify(token)
+    if claims is None or session_generation(claims['u']) != claims.get('g', 0):
+        del st.query_params[QUERY_PARAM]
+        return None
+    if tokens.needs_refresh(claims):
+        st.query_params[QUERY_PARAM] = tokens.issue(claims['u'], claims['n'], claims.get('g', 0))
+    return claims
+
+
+def remember_session(tokens, username, name, generation=0):
+    # 로그인 성공 시 새로고침해도 유지되도록 URL에 토큰 저장
+    st.query_params[QUERY_PARAM] = tokens.issue(username, name, generation)
+
+
+def forget_session():
+    # 로그아웃 시 URL의 토큰 제거
+    if QUERY_PARAM in st.query_params:
+        del st.query_params[QUERY_PARAM]
+
+
+if __name__ == '__main__':
+    # 사용법: python session_tokens.py rotate [키 파일 경로]
+    if len(sys.argv) < 2 or sys.argv[1] != 'rotate':
+        print("사용법: python session_tokens.py rotate [키 파일 경로]")
+        sys.exit(1)
+    key_id = rotate_keys(sys.argv[2] if len(sys.argv) > 2 else './session_keys.json')
+    print(f"새 서명 키 {key_id}를 추가했습니다. 실행 중인 앱을 다시 시작하면 적용됩니다.")
\ No newline at end of file
@@ -0,0 +1,268 @@
+import os
+import sys
+import json
+import shutil
+import threading
+from datetime import datetime
+from urllib.parse import quote, unquote
+from atomic_io import atomic_write_json, file_lock
+from passwords import PasswordVerifier
+from stock_schema import compact_stocks
+
+# 사용자별 파일 디렉토리 초기화(이전 포함)가 끝났음을 표시하는 파일
+MIGRATED_MARKER = '.migrated'
+
+
+def _shard_filename(username):
+    # 한글/특수문자 사용자명도 안전한 파일명이 되도록 퍼센트 인코딩
+    return quote(username, safe='') + '.json'
+
+
+def migrate_from_json(json_path='./users.json', shard_dir='./users'):
+    """기존 users.json을 사용자별 파일로 옮기고 완료 표시 파일을 씁니다. 새로 옮긴 사용자 수를 반환합니다.
+
+    이미 파일이 있는 사용자는 건너뛰므로, 중간에 중단되었으면 다시 실행해 남은 사용자만 옮깁니다.
+    (사용자 파일은 하나씩 원자적으로 쓰므로 이미 있는 파일은 완전한 파일)
+    """
+    with open(json_path, 'r', encoding='utf-8') as file:
+        users = json.load(file)
+    os.makedirs(shard_dir, exist_ok=True)
+    migrated = 0
+    for username, record in users.items():
+        path = os.path.join(shard_dir, _shard_filename(username))
+        if os.path.exists(path):
+            continue
+        # 파생 값은 옮기지 않고 입력 값만 저장
+        record['stocks'] = compact_stocks(record.get('stocks', []))
+        atomic_write_json(path, record)
+        migrated += 1
+    atomic_write_json(os.path.join(shard_dir, MIGRATED_MARKER), {'source': os.path.abspath(json_path)})
+    return migrated
+
+
+class ShardedUserManager:
+    """사용자마다 별도 파일(users/<사용자명>.json)에 정보를 저장하는 관리자
+
+    SimpleUserManager와 같은 메서드를 제공하지만, 종목 저장 시 해당 사용자의
+    파일 하나만 다시 씁니다.
+    """
+
+    def __init__(self, shard_dir='./users', legacy_path='./users.json', backup_dir='backup/shards', hasher=None):
+        self.shard_dir = shard_dir
+        self.backup_dir = backup_dir
+        self.passwords = PasswordVerifier(hasher)
+        self._lock = threading.RLock()
+        # username -> ((inode, mtime, size), record)
+        self._cache = {}
+        os.makedirs(shard_dir, exist_ok=True)
+        os.makedirs(backup_dir, exist_ok=True)
+        marker = os.path.join(shard_dir, MIGRATED_MARKER)
+        if not os.path.exists(marker):
+            # 완료 표시가 생길 때까지 (이전이 중간에 중단된 경우 포함) 여러 프로세스 중 하나만 이전
+            with file_lock(marker):
+                if not os.path.exists(marker):
+                    if os.path.exists(legacy_path):
+                        # 기존 users.json에서 아직 옮기지 않은 사용자만 이전
+                        migrate_from_json(legacy_path, shard_dir)
+                    else:
+                        if not self._list_shards():
+                            self._create_default_user()
+                        atomic_write_json(marker, {'source': None})
+
+    def _list_shards(self):
+        return [f for f in os.listdir(self.shard_dir) if f.endswith('.json')]
+
+    def _shard_path(self, username):
+        return os.path.join(self.shard_dir, _shard_filename(username))
+
+    def _create_default_user(self):
+        # 기본 사용자 생성 (admin/admin 계정)
+        self._save_user('admin', {
+            'name': "관리자",
+            'password': self._hash_password("admin"),
+            'email': "admin@example.com",
+            'stocks': []
+        })
+
+    def _load_user(self, username):
+        # 파일이 바뀌지 않았다면 캐시된 레코드 사용
+        path = self._shard_path(username)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            self._cache.pop(username, None)
+            return None
+        signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        cached = self._cache.get(username)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                record = json.load(file)
+        except (json.JSONDecodeError, OSError):
+            record = self._restore_user(username)
+            if record is None:
+                return None
+        self._cache[username] = (signature, record)
+        return record
+
+    def _save_user(self, username, record, create=False):
+        path = self._shard_path(username)
+        try:
+            with self._lock, file_lock(path):
+                if create and os.path.exists(path):
+                    # 다른 프로세스가 같은 사용자명을 먼저 등록함
+                    return False
+                atomic_write_json(path, record)
+                stat = os.stat(path)
+                self._cache[username] = ((stat.st_ino, stat.st_mtime_ns, stat.st_size), record)
+                # 해당 사용자 파일만 백업
+                atomic_write_json(os.path.join(self.backup_dir, _shard_filename(username)), record)
+            return True
+        except Exception as e:
+            print(f"사용자 정보 저장 중 오류 발생: {e}")
+            return False
+
+    def _restore_user(self, username):
+        """백업에서 한 사용자의 정보를 복원합니다."""
+        backup_path = os.path.join(self.backup_dir, _shard_filename(username))
+        try:
+            with open(backup_path, 'r', encoding='utf-8') as file:
+                record = json.load(file)
+        except (json.JSONDecodeError, OSError):
+            return None
+        atomic_write_json(self._shard_path(username), record)
+        return record
+
+    def _backup_config(self):
+        """모든 사용자 파일을 백업 디렉토리에 복사합니다."""
+        try:
+            for filename in self._list_shards():
+                shutil.copy2(os.path.join(self.shard_dir, filename), os.path.join(self.backup_dir, filename))
+            return True
+        except Exception as e:
+            print(f"백업 중 오류 발생: {e}")
+            return False
+
+    def backup(self):
+        """모든 사용자 파일을 백업합니다. (수동 백업)"""
+        return self._backup_config()
+
+    def _hash_password(self, password):
+        # 비밀번호 해싱 (SimpleUserManager와 같은 해셔)
+        return self.passwords.hash(password)
+
+    def reload_if_changed(self):
+        # 사용자별로 접근 시점에 변경 여부를 확인하므로 전체 재로드는 필요 없음
+        return False
+
+    def list_usernames(self):
+        return [unquote(f[:-len('.json')]) for f in self._list_shards()]
+
+    def register_user(self, username, name, email, password):
+        # 사용자 등록
+        with self._lock:
+            if os.path.exists(self._shard_path(username)):
+                return False, "이미 존재하는 사용자명입니다."
+
+            success = self._save_user(username, {
+                'name': name,
+                'email': email,
+                'password': self._hash_password(password),
+                'stocks': [],
+                'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            }, create=True)
+            if not success and os.path.exists(self._shard_path(username)):
+                return False, "이미 존재하는 사용자명입니다."
+        if not success:
+            return False, "사용자 등록 중 오류가 발생했습니다. 다시 시도해주세요."
+
+        return True, "등록이 완료되었습니다."
+
+    def verify_user(self, username, password):
+        # 사용자 인증
+        record = self._load_user(username)
+        if record is None:
+            return False
+        verified, new_hash = self.passwords.verify(username, password, record['password'])
+        if new_hash is not None:
+            # 이전 형식의 해시는 새 해시로 교체 (해당 사용자 파일만 다시 씀)
+            with self._lock:
+                record = self._load_user(username)
+                if record is not None:
+                    record = dict(record)
+                    record['password'] = new_hash
+                    self._save_user(username, record)
+        return verified
+
+    def get_user_name(self, username):
+        # 사용자 이름 가져오기
+        record = self._load_user(username)
+        if record is not None:
+            return record['name']
+        return None
+
+    def get_session_generation(self, username):
+        # 세션 토큰 복원 시 조회 (해당 사용자 파일 stat 한 번, 없는 사용자는 None)
+        record = self._load_user(username)
+        return record.get('session_generation', 0) if record is not None else None
+
+    def bump_session_generation(self, username):
+        # 로그아웃 시 세션 세대를 올려 그 전에 발급한 세션 토큰을 무효로 만듦
+        with self._lock:
+            record = self._load_user(username)
+            if record is None:
+                return False
+            record = dict(record)
+            record['session_generation'] = record.get('session_generation', 0) + 1
+            return self._save_user(username, record)
+
+    def save_user_stocks(self, username, stocks):
+        # 사용자의 주식 정보 저장 (해당 사용자 파일만 다시 씀)
+        with self._lock:
+            record = self._load_user(username)
+            if record is None:
+                return False
+            record = dict(record)
+            record['stocks'] = compact_stocks(stocks)
+            record['last_updated'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            return self._save_user(username, record)
+
+    def update_current_prices(self, price_lookup):
+        """모든 사용자 종목의 현재 주가를 price_lookup(종목명 목록 -> 주가 배열, NaN은 유지)으로 갱신합니다.
+
+        전체 종목을 한 번에 조회하고, 종목 주가가 바뀐 사용자 파일만 다시 씁니다. (바뀐 종목 수 반환)
+        """
+        with self._lock:
+            records = {username: self._load_user(username) for username in self.list_usernames()}
+            owned = [(username, i, stock) for username, record in records.items() if record is not None
+                     for i, stock in enumerate(record.get('stocks', []))]
+            prices = price_lookup([stock['종목명'] for _, _, stock in owned])
+            updates, changed = {}, 0
+            for (username, i, stock), price in zip(owned, prices.tolist()):
+                if price == price and price != stock['현재 주가']:
+                    updates.setdefault(username, []).append((i, price))
+            for username, changes in updates.items():
+                # 캐시된 레코드는 다른 세션과 공유하므로 복사본을 고쳐서 저장
+                record = dict(records[username])
+                record['stocks'] = list(record['stocks'])
+                for i, price in changes:
+                    record['stocks'][i] = dict(record['stocks'][i], **{'현재 주가': price})
+                if self._save_user(username, record):
+                    changed += len(changes)
+            return changed
+
+    def get_user_stocks(self, username):
+        # 사용자의 주식 정보 조회
+        record = self._load_user(username)
+        if record is not None:
+            return compact_stocks(record.get('stocks', []))
+        return []
+
+
+if __name__ == '__main__':
+    # 사용법: python sharded_store.py [users.json 경로] [사용자별 파일 디렉토리]
+    json_path = sys.argv[1] if len(sys.argv) > 1 else './users.json'
+    shard_dir = sys.argv[2] if len(sys.argv) > 2 else './users'
+    count = migrate_from_json(json_path, shard_dir)
+    print(f"{count}명의 사용자 정보를 {shard_dir}로 옮겼습니다.")
@@ -0,0 +1,371 @@
+import os
+import json
+import sqlite3
+import threading
+from datetime import datetime
+
+from passwords import PasswordVerifier
+from stock_schema import MONTHS
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    username TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    email TEXT,
+    password TEXT NOT NULL,
+    created_at TEXT,
+    last_updated TEXT,
+    session_generation INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS holdings (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    username TEXT NOT NULL REFERENCES users(username) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    stock_name TEXT NOT NULL,
+    quantity REAL NOT NULL,
+    purchase_price REAL NOT NULL,
+    current_price REAL NOT NULL,
+    purchase_date TEXT,
+    currency TEXT NOT NULL DEFAULT 'USD',
+    dividend_schedule TEXT,
+    transactions TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_holdings_username ON holdings(username, position);
+CREATE INDEX IF NOT EXISTS idx_holdings_stock_name ON holdings(stock_name);
+CREATE TABLE IF NOT EXISTS monthly_dividends (
+    holding_id INTEGER NOT NULL REFERENCES holdings(id) ON DELETE CASCADE,
+    month INTEGER NOT NULL CHECK (month BETWEEN 1 AND 12),
+    amount REAL NOT NULL,
+    PRIMARY KEY (holding_id, month)
+);
+"""
+
+# 기존 DB에 나중에 추가된 열 (연결할 때 없으면 추가)
+ADDED_COLUMNS = {
+    'users': [('session_generation', 'INTEGER NOT NULL DEFAULT 0')],
+    'holdings': [('purchase_date', 'TEXT'), ('currency', "TEXT NOT NULL DEFAULT 'USD'"), ('dividend_schedule', 'TEXT'),
+                 ('transactions', 'TEXT')]
+}
+
+# 종목별 파생 값(총 투자금, 평가금, 배당금, 손익)을 SQL에서 계산하는 뷰 쿼리
+HOLDING_VALUES = """
+SELECT h.id, h.position, h.stock_name, h.quantity, h.purchase_price, h.current_price,
+       h.quantity * h.purchase_price AS total_investment,
+       h.quantity * h.current_price AS current_value,
+       COALESCE((SELECT SUM(d.amount) FROM monthly_dividends d WHERE d.holding_id = h.id), 0) AS total_dividend
+FROM holdings h
+WHERE h.username = ?
+"""
+
+# 프로세스당 DB 파일별 연결 하나와 그 연결의 잠금을 재사용 (fork된 워커는 새 연결을 만듦)
+_connections = {}
+_connection_locks = {}
+_connections_lock = threading.Lock()
+
+
+def _connection_key(db_path):
+    return (os.path.abspath(db_path), os.getpid())
+
+
+def get_connection_lock(db_path):
+    """get_connection(db_path) 연결을 쓰는 모든 관리자가 함께 잡는 잠금
+
+    연결 하나를 여러 스레드가 공유하므로(check_same_thread=False) 읽기도 이 잠금 안에서 해야
+    다른 스레드의 쓰기 트랜잭션 중간 상태를 보거나 커서를 동시에 쓰지 않습니다.
+    """
+    key = _connection_key(db_path)
+    with _connections_lock:
+        return _connection_locks.setdefault(key, threading.RLock())
+
+
+def get_connection(db_path):
+    key = _connection_key(db_path)
+    with _connections_lock:
+        conn = _connections.get(key)
+        if conn is None:
+            conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('PRAGMA foreign_keys=ON')
+            conn.executescript(SCHEMA)
+            _add_missing_columns(conn)
+            _connections[key] = conn
+        return conn
+
+
+def _add_missing_columns(conn):
+    for table, columns in ADDED_COLUMNS.items():
+        existing = {row['name'] for row in conn.execute(f'PRAGMA table_info({table})')}
+        for name, column_type in columns:
+            if name not in existing:
+                conn.execute(f'ALTER TABLE {table} ADD COLUMN {name} {column_type}')
+    conn.commit()
+
+
+class SQLiteUserManager:
+    """SQLite에 사용자/종목/월별 배당금을 저장하는 관리자
+
+    SimpleUserManager(JSON), UserManager(YAML)와 같은 메서드를 제공합니다.
+    종목의 파생 값은 저장하지 않고 조회 시 SQL로 계산합니다.
+    """
+
+    def __init__(self, db_path='./yieldnote.db', legacy_path='./users.json', hasher=None):
+        self.db_path = db_path
+        self.conn = get_connection(db_path)
+        # 연결을 여러 세션(스레드)과 관리자가 공유하므로 읽기와 트랜잭션을 연결 단위로 직렬화
+        self._lock = get_connection_lock(db_path)
+        # 비밀번호 해싱/검증 (app.py는 streamlit-authenticator와 같은 bcrypt 해셔를 넘김)
+        self.passwords = PasswordVerifier(hasher)
+        if self._user_count() == 0:
+            if legacy_path and os.path.exists(legacy_path):
+                # 최초 실행 시 기존 JSON/YAML 파일에서 한 번만 이전
+                if legacy_path.endswith(('.yaml', '.yml')):
+                    self.migrate_from_yaml(legacy_path)
+                else:
+                    self.migrate_from_json(legacy_path)
+            else:
+                self.register_user('admin', "관리자", "admin@example.com", "admin")
+
+    def _user_count(self):
+        with self._lock:
+            return self.conn.execute('SELECT COUNT(*) FROM users').fetchone()[0]
+
+    def _hash_password(self, password):
+        # 비밀번호 해싱 (SimpleUserManager와 같은 해셔)
+        return self.passwords.hash(password)
+
+    def reload_if_changed(self):
+        # 매 조회가 DB를 직접 읽으므로 별도 재로드가 필요 없음
+        return False
+
+    def _backup_config(self, backup_path='backup/yieldnote_latest.db'):
+        """SQLite 온라인 백업으로 DB 전체를 복사합니다."""
+        try:
+            os.makedirs(os.path.dirname(backup_path), exist_ok=True)
+            target = sqlite3.connect(backup_path)
+            with self._lock:
+                self.conn.backup(target)
+            target.close()
+            return True
+        except sqlite3.Error as e:
+            print(f"백업 중 오류 발생: {e}")
+            return False
+
+    def backup(self):
+        """DB 전체 백업을 만듭니다. (수동 백업)"""
+        return self._backup_config()
+
+    def _insert_user(self, username, record):
+        self.conn.execute(
+            'INSERT INTO users (username, name, email, password, created_at, last_updated, session_generation) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (username, record['name'], record.get('email'), record['password'],
+             record.get('created_at'), record.get('last_updated'), record.get('session_generation', 0))
+        )
+        self._insert_stocks(username, record.get('stocks', []))
+
+    def _insert_stocks(self, username, stocks):
+        for position, stock in enumerate(stocks):
+            cursor = self.conn.execute(
+                'INSERT INTO holdings (username, position, stock_name, quantity, purchase_price, current_price, '
+                'purchase_date, currency, dividend_schedule, transactions) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (username, position, stock['종목명'], float(stock['보유 수량']),
+                 float(stock['매수 단가']), float(stock['현재 주가']), stock.get('매수일') or None,
+                 stock.get('통화') or 'USD',
+                 json.dumps(stock['배당 일정'], ensure_ascii=False) if stock.get('배당 일정') else None,
+                 json.dumps(stock['거래 내역'], ensure_ascii=False) if stock.get('거래 내역') else None)
+            )
+            dividends = stock.get('월별 배당금', {})
+            self.conn.executemany(
+                'INSERT INTO monthly_dividends (holding_id, month, amount) VALUES (?, ?, ?)',
+                [(cursor.lastrowid, i + 1, float(dividends[month]))
+                 for i, month in enumerate(MONTHS) if dividends.get(month)]
+            )
+
+    def migrate_from_json(self, json_path='./users.json'):
+        """SimpleUserManager의 users.json을 한 번에 가져옵니다."""
+        with open(json_path, 'r', encoding='utf-8') as file:
+            users = json.load(file)
+        with self._lock, self.conn:
+            for username, record in users.items():
+                self._insert_user(username, record)
+        return len(users)
+
+    def migrate_from_yaml(self, config_path='./config.yaml'):
+        """auth.UserManager의 config.yaml을 한 번에 가져옵니다."""
+        import yaml
+        with open(config_path, 'r') as file:
+            users = yaml.safe_load(file)['credentials']['usernames']
+        with self._lock, self.conn:
+            for username, record in users.items():
+                self._insert_user(username, record)
+        return len(users)
+
+    def register_user(self, username, name, email, password):
+        # 사용자 등록
+        try:
+            with self._lock, self.conn:
+                self.conn.execute(
+                    'INSERT INTO users (username, name, email, password, created_at) VALUES (?, ?, ?, ?, ?)',
+                    (username, name, email, self._hash_password(password),
+                     datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+                )
+        except sqlite3.IntegrityError:
+            return False, "이미 존재하는 사용자명입니다."
+        except sqlite3.Error as e:
+            print(f"사용자 등록 중 오류 발생: {e}")
+            return False, "사용자 등록 중 오류가 발생했습니다. 다시 시도해주세요."
+        return True, "등록이 완료되었습니다."
+
+    def verify_user(self, username, password):
+        # 사용자 인증
+        with self._lock:
+            row = self.conn.execute('SELECT password FROM users WHERE username = ?', (username,)).fetchone()
+        if row is None:
+            return False
+        # JSON에서 옮겨온 SHA-256, YAML에서 옮겨온 bcrypt 해시도 형식을 보고 검증
+        verified, new_hash = self.passwords.verify(username, password, row['password'])
+        if new_hash is not None:
+            with self._lock, self.conn:
+                self.conn.execute('UPDATE users SET password = ? WHERE username = ?', (new_hash, username))
+        return verified
+
+    def list_usernames(self):
+        with self._lock:
+            return [row['username'] for row in self.conn.execute('SELECT username FROM users ORDER BY username')]
+
+    def get_user_name(self, username):
+        # 사용자 이름 가져오기
+        with self._lock:
+            row = self.conn.execute('SELECT name FROM users WHERE username = ?', (username,)).fetchone()
+        return row['name'] if row is not None else None
+
+    def get_session_generation(self, username):
+        # 세션 토큰 복원 시 조회 (기본 키로 한 행만 읽음, 없는 사용자는 None)
+        with self._lock:
+            row = self.conn.execute('SELECT session_generation FROM users WHERE username = ?', (username,)).fetchone()
+        return row['session_generation'] if row is not None else None
+
+    def bump_session_generation(self, username):
+        # 로그아웃 시 세션 세대를 올려 그 전에 발급한 세션 토큰을 무효로 만듦
+        try:
+            with self._lock, self.conn:
+                cursor = self.conn.execute(
+                    'UPDATE users SET session_generation = session_generation + 1 WHERE username = ?', (username,)
+                )
+            return cursor.rowcount > 0
+        except sqlite3.Error as e:
+            print(f"세션 세대 갱신 중 오류 발생: {e}")
+            return False
+
+    @property
+    def config(self):
+        """streamlit_authenticator에 넘길 수 있는 config.yaml 형태의 설정"""
+        with self._lock:
+            rows = self.conn.execute('SELECT username, name, email, password FROM users').fetchall()
+        return {
+            'credentials': {
+                'usernames': {
+                    row['username']: {'email': row['email'], 'name': row['name'], 'password': row['password']}
+                    for row in rows
+                }
+            },
+            'cookie': {
+                'expiry_days': 30,
+                'key': 'dividend_calculator_cookie',
+                'name': 'dividend_calculator_auth'
+            },
+            'preauthorized': {
+                'emails': []
+            }
+        }
+
+    def save_user_stocks(self, username, stocks):
+        # 사용자의 주식 정보 저장 (해당 사용자의 행만 교체)
+        try:
+            with self._lock, self.conn:
+                cursor = self.conn.execute(
+                    'UPDATE users SET last_updated = ? WHERE username = ?',
+                    (datetime.now().strftime('%Y-%m-%d %H:%M:%S'), username)
+                )
+                if cursor.rowcount == 0:
+                    return False
+                self.conn.execute('DELETE FROM holdings WHERE username = ?', (username,))
+                self._insert_stocks(username, stocks)
+            return True
+        except sqlite3.Error as e:
+            print(f"종목 저장 중 오류 발생: {e}")
+            return False
+
+    def update_current_prices(self, price_lookup):
+        """모든 사용자 종목의 현재 주가를 price_lookup(종목명 목록 -> 주가 배열, NaN은 유지)으로 갱신합니다.
+
+        전체 종목을 한 번의 쿼리로 읽어 한 번에 조회하고, 바뀐 행만 한 트랜잭션으로 UPDATE합니다. (바뀐 종목 수 반환)
+        """
+        try:
+            with self._lock, self.conn:
+                rows = self.conn.execute('SELECT id, stock_name, current_price FROM holdings').fetchall()
+                prices = price_lookup([row['stock_name'] for row in rows])
+                changed = [(price, row['id']) for row, price in zip(rows, prices.tolist())
+                           if price == price and price != row['current_price']]
+                self.conn.executemany('UPDATE holdings SET current_price = ? WHERE id = ?', changed)
+            return len(changed)
+        except sqlite3.Error as e:
+            print(f"현재 주가 갱신 중 오류 발생: {e}")
+            return 0
+
+    def get_user_stocks(self, username):
+        # 사용자의 주식 정보 조회 (입력 값만 담은 종목 딕셔너리로 변환, 파생 값은 Portfolio가 계산)
+        with self._lock:
+            holdings = self.conn.execute(
+                'SELECT id, stock_name, quantity, purchase_price, current_price, purchase_date, currency, '
+                'dividend_schedule, transactions FROM holdings '
+                'WHERE username = ? ORDER BY position', (username,)
+            ).fetchall()
+            dividend_rows = self.conn.execute(
+                'SELECT d.holding_id, d.month, d.amount FROM monthly_dividends d '
+                'JOIN holdings h ON h.id = d.holding_id WHERE h.username = ?', (username,)
+            ).fetchall()
+        dividends = {}
+        for row in dividend_rows:
+            dividends.setdefault(row['holding_id'], {})[row['month']] = row['amount']
+
+        stocks = []
+        for row in holdings:
+            monthly = dividends.get(row['id'], {})
+            stock = {
+                '종목명': row['stock_name'],
+                '보유 수량': row['quantity'],
+                '매수 단가': row['purchase_price'],
+                '현재 주가': row['current_price'],
+                '월별 배당금': {month: monthly.get(i + 1, 0.0) for i, month in enumerate(MONTHS)}
+            }
+            if row['purchase_date']:
+                stock['매수일'] = row['purchase_date']
+            if row['currency'] != 'USD':
+                stock['통화'] = row['currency']
+            if row['dividend_schedule']:
+                stock['배당 일정'] = json.loads(row['dividend_schedule'])
+            if row['transactions']:
+                stock['거래 내역'] = json.loads(row['transactions'])
+            stocks.append(stock)
+        return stocks
+
+    def get_portfolio_totals(self, username):
+        """포트폴리오 합계를 SQL 집계로 계산합니다. (종목 통화를 환산하지 않으므로 모든 종목이 USD일 때 사용)"""
+        with self._lock:
+            row = self.conn.execute(
+                'SELECT COALESCE(SUM(total_investment), 0) AS total_investment, '
+                'COALESCE(SUM(current_value), 0) AS current_value, '
+                'COALESCE(SUM(total_dividend), 0) AS total_dividend '
+                'FROM (' + HOLDING_VALUES + ')', (username,)
+            ).fetchone()
+        profit_loss = row['current_value'] + row['total_dividend'] - row['total_investment']
+        return {
+            '총 투자금': row['total_investment'],
+            '현재 평가금': row['current_value'],
+            '누적 배당금': row['total_dividend'],
+            '실제 손익': profit_loss,
+            '수익률 (%)': (profit_loss / row['total_investment'] * 100) if row['total_investment'] > 0 else 0
+        }
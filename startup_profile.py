@@ -0,0 +1,127 @@
+import os
+import sys
+import json
+import argparse
+import tempfile
+import subprocess
+
+# 시작 시간 측정: 앱 스크립트의 첫 화면(로그인 화면)을 새 프로세스에서 그리면서 모듈별 불러오기 시간을 기록합니다.
+#   python startup_profile.py app_simple.py
+#   python startup_profile.py app.py --max-render-ms 1500 --json
+# 첫 화면에서 불러오면 안 되는 모듈이 불러와지거나 첫 화면 시간이 기준을 넘으면 종료 코드 1을 반환하므로
+# 배포 전 검사에 넣어 시작 시간 회귀를 잡을 수 있습니다.
+
+# 로그인 화면에서 불러오면 안 되는 무거운 패키지 (차트, 엑셀, bcrypt 인증)
+# app.py의 로그인 폼은 streamlit-authenticator(bcrypt)이므로 인증 패키지는 app_simple.py만 검사
+HEAVY_MODULES = ['altair', 'openpyxl']
+AUTH_MODULES = ['bcrypt', 'streamlit_authenticator']
+# 자식 프로세스 표준 오류에서 첫 화면 구간을 나누는 표시
+RENDER_MARK = 'yieldnote-startup: render'
+
+# -X importtime으로 실행하는 자식 프로세스 (Streamlit 테스트 실행기로 첫 화면을 한 번 그림)
+CHILD = f'''
+import sys, json, time
+from streamlit.testing.v1 import AppTest
+app = AppTest.from_file(sys.argv[1], default_timeout=120)
+sys.stderr.write({RENDER_MARK!r} + "\\n")
+sys.stderr.flush()
+start = time.perf_counter()
+app.run()
+render = time.perf_counter() - start
+print(json.dumps({{"render": render, "exceptions": [str(e.value) for e in app.exception]}}))
+'''
+
+
+def parse_importtime(lines):
+    """-X importtime 출력 줄 -> [(모듈, 자체 시간 µs, 누적 시간 µs, 깊이)] (불러온 순서)"""
+    entries = []
+    for line in lines:
+        if not line.startswith('import time:'):
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        name = parts[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        entries.append((name.strip(), int(parts[0]), int(parts[1]), depth))
+    return entries
+
+
+def profile(app_path, workdir):
+    """앱 첫 화면을 그리는 데 걸린 시간과 그동안 불러온 모듈 목록"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', CHILD, os.path.abspath(app_path)],
+                            cwd=workdir, capture_output=True, text=True,
+                            env=dict(os.environ, PYTHONPATH=os.path.dirname(os.path.abspath(app_path))))
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "실행 실패")
+    lines = result.stderr.splitlines()
+    mark = lines.index(RENDER_MARK)
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    report['harness'] = parse_importtime(lines[:mark])
+    report['imports'] = parse_importtime(lines[mark + 1:])
+    return report
+
+
+def summarize(report, top=15):
+    """첫 화면 구간의 최상위 모듈별 누적 불러오기 시간과 패키지별 자체 시간 합계 (ms)"""
+    imports = report['imports']
+    modules = sorted(((name, cumulative / 1000) for name, _, cumulative, depth in imports if depth == 0),
+                     key=lambda item: -item[1])
+    packages = {}
+    for name, own, _, _ in imports:
+        root = name.split('.')[0]
+        packages[root] = packages.get(root, 0.0) + own / 1000
+    import_ms = sum(own for _, own, _, _ in imports) / 1000
+    return {
+        'render_ms': report['render'] * 1000,
+        'import_ms': import_ms,
+        'harness_ms': sum(own for _, own, _, _ in report['harness']) / 1000,
+        'modules': modules[:top],
+        'packages': sorted(packages.items(), key=lambda item: -item[1])[:top],
+        'loaded': sorted(packages),
+        'exceptions': report['exceptions']
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="앱 첫 화면의 모듈별 불러오기 시간과 첫 화면 시간 측정")
+    parser.add_argument('app', nargs='?', default='app_simple.py', help="앱 스크립트 (기본: app_simple.py)")
+    parser.add_argument('--top', type=int, default=15, help="표시할 모듈/패키지 수 (기본: 15)")
+    parser.add_argument('--forbid', help="첫 화면에서 불러오면 안 되는 패키지 (쉼표 구분, 기본: 차트/엑셀 패키지, "
+                                         "app.py가 아니면 bcrypt 인증 패키지도 포함)")
+    parser.add_argument('--max-render-ms', type=float, help="첫 화면 시간 기준 (넘으면 종료 코드 1)")
+    parser.add_argument('--json', action='store_true', help="결과를 JSON으로 출력")
+    args = parser.parse_args(argv)
+
+    # 앱이 users.json 등을 만들지 않도록 빈 임시 디렉토리에서 실행
+    with tempfile.TemporaryDirectory() as workdir:
+        summary = summarize(profile(args.app, workdir), args.top)
+    if args.forbid is not None:
+        forbid = [name for name in args.forbid.split(',') if name]
+    else:
+        forbid = HEAVY_MODULES + (AUTH_MODULES if os.path.basename(args.app) != 'app.py' else [])
+    forbidden = [name for name in forbid if name in summary['loaded']]
+    over_budget = args.max_render_ms is not None and summary['render_ms'] > args.max_render_ms
+
+    if args.json:
+        print(json.dumps(dict(summary, forbidden=forbidden, over_budget=over_budget), ensure_ascii=False, indent=2))
+    else:
+        print(f"{args.app} 첫 화면: {summary['render_ms']:,.0f} ms (그중 모듈 불러오기 {summary['import_ms']:,.0f} ms)")
+        print(f"(앱 실행 전 Streamlit과 테스트 실행기 불러오기 {summary['harness_ms']:,.0f} ms는 제외)")
+        print(f"\n{'앱이 불러온 모듈 (하위 모듈 포함)':<40} {'누적 (ms)':>10}")
+        for name, ms in summary['modules']:
+            print(f"{name:<40} {ms:>10.1f}")
+        print(f"\n{'패키지 (자체 시간 합계)':<40} {'(ms)':>10}")
+        for name, ms in summary['packages']:
+            print(f"{name:<40} {ms:>10.1f}")
+        for message in summary['exceptions']:
+            print(f"\n첫 화면 오류: {message}")
+        if forbidden:
+            print(f"\n첫 화면에서 불러오면 안 되는 패키지를 불러왔습니다: {', '.join(forbidden)}")
+        if over_budget:
+            print(f"\n첫 화면 시간이 기준({args.max_render_ms:,.0f} ms)을 넘었습니다.")
+    return 1 if forbidden or over_budget or summary['exceptions'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
\ No newline at end of file
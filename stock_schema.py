@@ -0,0 +1,133 @@
+from array import array
+
+from ledger import Ledger
+
+MONTHS = ['1월', '2월', '3월', '4월', '5월', '6월', '7월', '8월', '9월', '10월', '11월', '12월']
+
+# 저장하는 입력 값
+STORED_FIELDS = ['종목명', '보유 수량', '매수 단가', '현재 주가', '월별 배당금']
+
+# 기본값과 다를 때만 저장하는 선택 입력 값과 기본값
+# (매수일: 'YYYY-MM-DD', 매수 시점 환율 조회에 사용 / 통화: 매수 단가·주가·배당금의 통화 /
+#  배당 일정: 주당 배당금, 주기, 기준 배당락일, 지급일 간격, 배당 내역 - dividend_calendar.make_schedule 참고 /
+#  거래 내역: 매수/매도/분할 거래와 누적 취득가 상태 - ledger.Ledger.to_dict 참고)
+OPTIONAL_FIELDS = {'매수일': None, '통화': 'USD', '배당 일정': None, '거래 내역': None}
+
+# 입력 값에서 계산되므로 저장하지 않는 값 (Portfolio가 필요할 때 계산)
+DERIVED_FIELDS = ['총 투자금', '현재 평가금', '누적 배당금', '실제 손익', '수익률 (%)']
+
+
+def compact_stock(stock):
+    """파생 값을 뺀 저장용 종목 딕셔너리를 새로 만듭니다."""
+    monthly = stock.get('월별 배당금', {})
+    compact = {
+        '종목명': stock['종목명'],
+        '보유 수량': float(stock['보유 수량']),
+        '매수 단가': float(stock['매수 단가']),
+        '현재 주가': float(stock['현재 주가']),
+        '월별 배당금': {month: float(monthly.get(month, 0.0)) for month in MONTHS}
+    }
+    for field, default in OPTIONAL_FIELDS.items():
+        if stock.get(field) and stock[field] != default:
+            value = stock[field]
+            compact[field] = dict(value) if isinstance(value, dict) else value
+    return compact
+
+
+def compact_stocks(stocks):
+    return [compact_stock(stock) for stock in stocks]
+
+
+def has_derived_fields(stocks):
+    """이전 형식(파생 값 포함)으로 저장된 종목이 있는지 확인합니다."""
+    return any(field in stock for stock in stocks for field in DERIVED_FIELDS)
+
+
+class Holding:
+    """보유 종목 한 건 (세션 메모리용 경량 레코드)
+
+    한글 키 딕셔너리 대신 __slots__ 속성과 12칸 float 배열(월별 배당금)로 보관합니다.
+    저장소와 주고받을 때는 to_dict()/from_dict()로 기존 딕셔너리 형식과 변환합니다.
+    """
+
+    __slots__ = ('name', 'quantity', 'purchase_price', 'current_price', 'dividends', 'purchase_date', 'currency',
+                 'schedule', 'ledger')
+
+    def __init__(self, name, quantity, purchase_price, current_price, dividends=None, purchase_date=None,
+                 currency='USD', schedule=None, ledger=None):
+        self.name = name
+        self.quantity = float(quantity)
+        self.purchase_price = float(purchase_price)
+        self.current_price = float(current_price)
+        # 1월~12월 배당금 (인덱스 0 = 1월)
+        self.dividends = array('d', dividends) if dividends is not None else array('d', bytes(12 * 8))
+        if len(self.dividends) != 12:
+            raise ValueError("월별 배당금은 12개월 값이어야 합니다.")
+        # 매수일 ('YYYY-MM-DD', 없으면 None)
+        self.purchase_date = purchase_date or None
+        # 종목 통화 (매수 단가, 현재 주가, 배당금의 통화)
+        self.currency = currency or 'USD'
+        # 배당 일정 (없으면 None)
+        self.schedule = dict(schedule) if schedule else None
+        # 거래 내역 (Ledger, 없으면 None - 있으면 보유 수량과 매수 단가는 거래 내역에서 계산한 값)
+        self.ledger = ledger
+
+    @classmethod
+    def from_dict(cls, stock):
+        """기존 종목 딕셔너리(파생 값 포함 여부 무관)에서 만듭니다."""
+        monthly = stock.get('월별 배당금', {})
+        return cls(stock['종목명'], stock['보유 수량'], stock['매수 단가'], stock['현재 주가'],
+                   [float(monthly.get(month, 0.0)) for month in MONTHS], stock.get('매수일'),
+                   stock.get('통화', 'USD'), stock.get('배당 일정'),
+                   Ledger.from_dict(stock['거래 내역']) if stock.get('거래 내역') else None)
+
+    def to_dict(self):
+        """저장용 종목 딕셔너리로 변환합니다."""
+        stock = {
+            '종목명': self.name,
+            '보유 수량': self.quantity,
+            '매수 단가': self.purchase_price,
+            '현재 주가': self.current_price,
+            '월별 배당금': dict(zip(MONTHS, self.dividends))
+        }
+        if self.purchase_date:
+            stock['매수일'] = self.purchase_date
+        if self.currency != 'USD':
+            stock['통화'] = self.currency
+        if self.schedule:
+            stock['배당 일정'] = dict(self.schedule)
+        if self.ledger is not None:
+            stock['거래 내역'] = self.ledger.to_dict()
+        return stock
+
+    def sync_ledger(self):
+        """거래 내역의 보유 수량과 주당 취득가로 보유 수량/매수 단가를 맞춥니다. (거래를 추가한 뒤 호출)"""
+        if self.ledger is not None:
+            self.quantity = self.ledger.shares
+            self.purchase_price = self.ledger.unit_cost()
+
+    def monthly_dividends(self):
+        """{월: 배당금} 딕셔너리"""
+        return dict(zip(MONTHS, self.dividends))
+
+    def __eq__(self, other):
+        if not isinstance(other, Holding):
+            return NotImplemented
+        return (self.name, self.quantity, self.purchase_price, self.current_price, self.dividends,
+                self.purchase_date, self.currency, self.schedule, self.ledger) == \
+            (other.name, other.quantity, other.purchase_price, other.current_price, other.dividends,
+             other.purchase_date, other.currency, other.schedule, other.ledger)
+
+    def __repr__(self):
+        return (f"Holding(name={self.name!r}, quantity={self.quantity}, purchase_price={self.purchase_price}, "
+                f"current_price={self.current_price}, dividends={list(self.dividends)}, "
+                f"purchase_date={self.purchase_date!r}, currency={self.currency!r}, schedule={self.schedule!r}, "
+                f"ledger={self.ledger!r})")
+
+
+def holdings_from_dicts(stocks):
+    return [Holding.from_dict(stock) for stock in stocks]
+
+
+def holdings_to_dicts(holdings):
+    return [holding.to_dict() for holding in holdings]
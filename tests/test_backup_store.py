@@ -0,0 +1,70 @@
+import os
+from datetime import datetime, timedelta
+
+from backup_store import BackupStore
+
+T0 = datetime(2024, 1, 31, 12, 0)
+
+
+def count_objects(store):
+    return sum(len(files) for _, _, files in os.walk(store.objects_dir))
+
+
+def test_snapshot_and_restore(tmp_path):
+    store = BackupStore(str(tmp_path))
+    first = store.snapshot({'a': {'v': 1}, 'b': {'v': 2}}, now=T0)
+    # 내용이 같으면 새 스냅샷을 만들지 않음
+    assert store.snapshot({'a': {'v': 1}, 'b': {'v': 2}}, now=T0 + timedelta(minutes=1)) == first
+    second = store.snapshot({'a': {'v': 1}, 'b': {'v': 3}}, now=T0 + timedelta(minutes=2))
+    assert second != first
+    assert count_objects(store) == 3
+
+    assert store.restore() == {'a': {'v': 1}, 'b': {'v': 3}}
+    assert store.restore(at=T0 + timedelta(minutes=1)) == {'a': {'v': 1}, 'b': {'v': 2}}
+    assert store.restore(snapshot_id=first) == {'a': {'v': 1}, 'b': {'v': 2}}
+    assert store.restore(at=T0 - timedelta(minutes=1)) is None
+
+
+def test_changed_reuses_previous_hashes(tmp_path):
+    store = BackupStore(str(tmp_path))
+    store.snapshot({'a': {'v': 1}, 'b': {'v': 2}}, now=T0)
+    # 바뀐 사용자만 다시 해시하므로 b의 (바뀌지 않았다고 알린) 변경은 반영되지 않음
+    store.snapshot({'a': {'v': 10}, 'b': {'v': 20}, 'c': {'v': 3}}, now=T0 + timedelta(minutes=1), changed=['a'])
+    assert store.restore() == {'a': {'v': 10}, 'b': {'v': 2}, 'c': {'v': 3}}
+
+    # 삭제된 사용자는 빠지고, 다른 인스턴스(프로세스)도 색인에서 직전 스냅샷을 읽어 재사용
+    other = BackupStore(str(tmp_path))
+    other.snapshot({'a': {'v': 10}, 'c': {'v': 30}}, now=T0 + timedelta(minutes=2), changed=['c'])
+    assert other.restore() == {'a': {'v': 10}, 'c': {'v': 30}}
+
+
+def test_corrupted_snapshot_falls_back(tmp_path):
+    store = BackupStore(str(tmp_path))
+    store.snapshot({'a': {'v': 1}}, now=T0)
+    latest = store.snapshot({'a': {'v': 2}}, now=T0 + timedelta(minutes=1))
+    with open(store._snapshot_path(latest), 'w', encoding='utf-8') as file:
+        file.write('{}')
+    assert store.restore() == {'a': {'v': 1}}
+    assert [entry['valid'] for entry in store._load_catalog()] == [True, False]
+
+
+def test_prune_and_collect_garbage(tmp_path):
+    store = BackupStore(str(tmp_path))
+    # 한 시간 안의 스냅샷 여러 개: 한 시간이 지나면 그 시간대의 마지막 스냅샷만 남음
+    for minute in (0, 10, 20):
+        store.snapshot({'a': {'v': minute}}, now=T0 + timedelta(minutes=minute))
+    later = T0 + timedelta(hours=3)
+    store.snapshot({'a': {'v': 99}}, now=later)
+    assert len(store._load_catalog()) == 2
+    # 레코드 정리는 저장할 때마다가 아니라 하루에 한 번이므로 아직 남아 있음
+    assert count_objects(store) == 4
+    assert store.collect_garbage(later) == 2
+    assert count_objects(store) == 2
+    assert store.restore(at=later - timedelta(hours=1)) == {'a': {'v': 20}}
+    assert store.restore() == {'a': {'v': 99}}
+
+    # 하루가 지난 뒤 첫 저장 때 다시 정리 (1월 31일은 일별로 마지막 스냅샷만 남음)
+    store.snapshot({'a': {'v': 100}}, now=later + timedelta(minutes=1))
+    store.snapshot({'a': {'v': 101}}, now=later + timedelta(days=1, hours=2))
+    assert count_objects(store) == 2
+    assert store.restore(at=later + timedelta(hours=1)) == {'a': {'v': 100}}
@@ -0,0 +1,43 @@
+import numpy as np
+
+from dividend_calendar import DividendCalendar, add_dividend_event, expand_schedule, make_schedule
+
+
+def test_recurring_schedule_monthly_income():
+    schedule = make_schedule(0.25, '분기', '2024-03-15', pay_lag=30)
+    calendar = DividendCalendar.from_schedules([schedule], '2024-01-01', '2025-01-01')
+    monthly = calendar.holding_monthly([10], 2024)[0]
+    assert monthly.tolist() == [0, 0, 0, 2.5, 0, 0, 2.5, 0, 0, 2.5, 0, 0]
+    assert calendar.income([10], '2024-01-01', '2025-01-01') == 7.5
+
+
+def test_recorded_events_replace_schedule_between_first_and_last_event():
+    schedule = make_schedule(0.25, '분기', '2024-03-15', pay_lag=30)
+    # 6월 배당금 인상, 7월 특별 배당 (지급일 간격도 다름)
+    schedule = add_dividend_event(schedule, '2024-06-14', 0.30)
+    schedule = add_dividend_event(schedule, '2024-07-01', 1.00, '2024-07-10')
+    ex_dates, pay_dates, per_share = expand_schedule(schedule, '2024-01-01', '2025-01-01')
+    order = np.argsort(ex_dates)
+    assert ex_dates[order].astype(str).tolist() == ['2024-03-15', '2024-06-14', '2024-07-01', '2024-09-15',
+                                                    '2024-12-15']
+    assert pay_dates[order].astype(str).tolist() == ['2024-04-14', '2024-07-14', '2024-07-10', '2024-10-15',
+                                                     '2025-01-14']
+    assert per_share[order].tolist() == [0.25, 0.30, 1.00, 0.25, 0.25]
+
+    calendar = DividendCalendar.from_schedules([schedule, None], '2024-01-01', '2025-01-01')
+    monthly = calendar.holding_monthly([10, 5], 2024)
+    assert np.allclose(monthly[0], [0, 0, 0, 2.5, 0, 0, 13.0, 0, 0, 2.5, 0, 0])
+    assert not monthly[1].any()
+
+
+def test_add_dividend_event_replaces_same_ex_date():
+    schedule = add_dividend_event(make_schedule(0.25, '분기', '2024-03-15'), '2024-06-14', 0.30)
+    schedule = add_dividend_event(schedule, '2024-06-14', 0.35, '2024-07-01')
+    assert schedule['배당 내역'] == [{'배당락일': '2024-06-14', '지급일': '2024-07-01', '주당 배당금': 0.35}]
+
+
+def test_purchase_date_excludes_recorded_events():
+    schedule = add_dividend_event(make_schedule(0.25, '분기', '2024-03-15'), '2024-06-14', 0.30)
+    purchase_dates = np.array(['2024-07-01'], dtype='datetime64[D]')
+    calendar = DividendCalendar.from_schedules([schedule], '2024-01-01', '2025-01-01', purchase_dates)
+    assert calendar.income([10], '2024-01-01', '2026-01-01') == 5.0
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from currency import CrossRates
+from fx import CSVRateTable, FXProvider, RateTable, make_provider, trade_date_rates
+
+RATES_CSV = """date,base,quote,rate
+2023-01-02,USD,KRW,1260
+2023-06-01,USD,KRW,1300
+2023-03-01,USD,JPY,130
+2023-06-01,EUR,USD,1.1
+"""
+
+
+@pytest.fixture
+def table(tmp_path):
+    path = tmp_path / 'rates.csv'
+    path.write_text(RATES_CSV, encoding='utf-8')
+    return str(path)
+
+
+def test_direct_and_inverse_pairs(table):
+    provider = CSVRateTable(table)
+    assert provider.rate('USD', 'KRW', '2023-05-31') == 1260
+    assert provider.rate('USD', 'KRW', '2023-06-01') == 1300
+    assert provider.rate('USD', 'EUR', '2023-06-01') == pytest.approx(1 / 1.1)
+    assert provider.rate('USD', 'KRW', '2022-12-31') is None
+
+
+def test_cross_through_usd(table):
+    provider = CSVRateTable(table)
+    # USD/KRW, USD/JPY만 있어도 JPY -> KRW는 같은 날짜의 두 환율로 계산
+    rates = trade_date_rates(provider, ['JPY', 'USD', 'JPY'], ['2023-06-01', '2023-06-01', '2023-02-01'], 'KRW')
+    np.testing.assert_allclose(rates[:2], [1300 / 130, 1300])
+    # 2023-02-01에는 USD/JPY 환율이 아직 없음
+    assert np.isnan(rates[2])
+    assert provider.spot('JPY', 'KRW') == pytest.approx(10.0)
+    assert provider.rate('KRW', 'JPY', '2023-04-01') == pytest.approx(130 / 1260)
+    # 역방향으로만 있는 EUR/USD도 교차 환율의 한쪽으로 사용
+    assert provider.rate('EUR', 'KRW', '2023-06-01') == pytest.approx(1.1 * 1300)
+
+
+def test_cached_provider_crosses(table):
+    provider = make_provider(table)
+    np.testing.assert_allclose(trade_date_rates(provider, ['JPY', 'USD'], ['2023-06-01'] * 2, 'KRW'), [10.0, 1300])
+    assert provider.spot('JPY', 'KRW') == pytest.approx(10.0)
+
+
+def test_cross_rates_matrix():
+    rates = CrossRates({'KRW': 1300, 'JPY': 130})
+    assert rates.rate('JPY', 'KRW') == pytest.approx(10.0)
+    np.testing.assert_allclose(rates.convert(np.array([1.0, 100.0]), np.array([0, 2]), 'KRW'), [1300, 1000])
+
+
+def test_providers_must_implement_lookups():
+    with pytest.raises(TypeError):
+        FXProvider()
+    with pytest.raises(TypeError):
+        RateTable()
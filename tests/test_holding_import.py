@@ -0,0 +1,66 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from holding_import import _numbers, import_holdings, map_columns
+
+HEADER = '종목명,보유 수량,매수 단가,현재 주가,통화,매수일,3월\n'
+
+
+def import_csv(text, encoding='utf-8', **kwargs):
+    return import_holdings(io.BytesIO(text.encode(encoding)), 'export.csv', **kwargs)
+
+
+def test_numbers_handles_separators_signs_and_currency():
+    numbers, failed = _numbers(pd.Series(['1,234', '(1,234)', '-5', 'EUR 12.5', '$-3', '-$3', '1,000원', '', 'abc'],
+                                         dtype=object))
+    np.testing.assert_array_equal(numbers[:7], [1234, -1234, -5, 12.5, -3, -3, 1000])
+    assert np.isnan(numbers[7:]).all()
+    assert failed.tolist() == [False] * 8 + [True]
+
+
+def test_import_reports_rows_by_file_line():
+    result = import_csv(HEADER +
+                        'AAA,10,"$1,000.50",1100,,2023-01-05,1.5\n'
+                        'BBB,(5),10,11,,,\n'
+                        'CCC,abc,10,11,,,\n'
+                        ',,,,,,\n'
+                        'DDD,1,10,11,XYZ,,\n'
+                        'EEE,1,10,11,krw,2023/02/03,x\n'
+                        'FFF,2,10,11,,not a date,\n'
+                        'GGG,1,10,11,,2023.03.04,\n', chunk_rows=3)
+    assert result.total_rows == 8
+    assert result.errors == [(3, "보유 수량은 0보다 커야 합니다."), (4, "보유 수량이 숫자가 아닙니다."),
+                             (6, "지원하지 않는 통화입니다."), (7, "월별 배당금이 숫자가 아닙니다."),
+                             (8, "매수일 형식이 잘못되었습니다.")]
+    holdings = result.holdings()
+    assert [holding.name for holding in holdings] == ['AAA', 'GGG']
+    assert holdings[0].purchase_price == 1000.5
+    assert holdings[0].purchase_date == '2023-01-05' and holdings[1].purchase_date == '2023-03-04'
+    assert holdings[0].dividends[2] == 1.5
+
+
+def test_cp949_and_english_headers():
+    result = import_csv('Symbol,Qty,Avg Cost,Last Price,Currency\n삼성전자,3,"70,000원","72,000원",KRW\n',
+                        encoding='cp949')
+    assert not result.errors
+    assert result.portfolio().currencies == ['KRW']
+    assert result.holdings()[0].current_price == 72000
+
+
+def test_missing_required_columns():
+    with pytest.raises(ValueError):
+        map_columns(['종목명', '수량'])
+    with pytest.raises(ValueError):
+        import_holdings(io.BytesIO(b''), 'export.txt')
+
+
+def test_schedule_fills_empty_dividends():
+    result = import_csv('종목명,수량,평균단가,현재가,주당배당금,배당주기,배당락일\n'
+                        'AAA,10,10,11,0.5,quarterly,2024-03-15\n'
+                        'BBB,10,10,11,abc,quarterly,2024-03-15\n', year=2024)
+    assert result.errors == [(3, "배당 일정 형식이 잘못되었습니다.")]
+    monthly = result.holdings()[0].dividends
+    assert sum(monthly) == pytest.approx(20.0)
@@ -0,0 +1,83 @@
+import pytest
+
+from ledger import Ledger
+
+
+def hand_checked():
+    # 10@100, 10@200 매수 후 2:1 분할 -> 40주, 25주를 80에 매도
+    ledger = Ledger()
+    ledger.add('매수', '2024-01-02', 10, 100)
+    ledger.add('매수', '2024-02-01', 10, 200)
+    ledger.add('분할', '2024-03-01', 2)
+    ledger.add('매도', '2024-04-01', 25, 80)
+    return ledger
+
+
+def test_fifo_and_average_cost_basis():
+    ledger = hand_checked()
+    assert ledger.shares == pytest.approx(15)
+    assert ledger.realized('FIFO') == pytest.approx(500)
+    assert ledger.cost_basis('FIFO') == pytest.approx(1500)
+    assert ledger.realized('평균') == pytest.approx(125)
+    assert ledger.cost_basis('평균') == pytest.approx(1125)
+    assert ledger.unit_cost('FIFO') == pytest.approx(100)
+    ledger.set_method('FIFO')
+    assert ledger.cost_basis() == pytest.approx(1500)
+
+
+def test_split_scales_lots_and_reverse_split():
+    ledger = Ledger('FIFO')
+    ledger.add('매수', '2024-01-02', 10, 100)
+    ledger.add('분할', '2024-02-01', 2)
+    assert (ledger.shares, ledger.unit_cost()) == (pytest.approx(20), pytest.approx(50))
+    ledger.add('분할', '2024-03-01', 0.25)
+    assert (ledger.shares, ledger.unit_cost()) == (pytest.approx(5), pytest.approx(200))
+    ledger.add('매도', '2024-04-01', 5, 250)
+    assert ledger.shares == 0 and ledger.cost_basis() == 0
+    assert ledger.realized() == pytest.approx(250)
+
+
+def test_backdated_transaction_recomputes_from_start():
+    ledger = Ledger()
+    ledger.add('매수', '2024-02-01', 10, 200)
+    ledger.add('분할', '2024-03-01', 2)
+    # 처음 매수보다 이전 날짜의 매수를 나중에 입력해도 날짜순으로 합쳐 다시 계산
+    ledger.extend([('매도', '2024-04-01', 25, 80), ('매수', '2024-01-02', 10, 100)])
+    expected = hand_checked()
+    for method in ('평균', 'FIFO'):
+        assert ledger.realized(method) == pytest.approx(expected.realized(method))
+        assert ledger.cost_basis(method) == pytest.approx(expected.cost_basis(method))
+    assert ledger.frame()['날짜'].tolist() == ['2024-04-01', '2024-03-01', '2024-02-01', '2024-01-02']
+
+
+def test_oversell_is_rejected_without_changing_ledger():
+    ledger = hand_checked()
+    with pytest.raises(ValueError):
+        ledger.add('매도', '2024-05-01', 16, 80)
+    with pytest.raises(ValueError):
+        ledger.add('매도', '2024-02-15', 30, 80)
+    assert len(ledger) == 4 and ledger.shares == pytest.approx(15)
+
+
+def test_to_dict_round_trip_uses_saved_state():
+    ledger = hand_checked()
+    data = ledger.to_dict()
+    assert data['날짜'] == ['2024-01-02', '2024-02-01', '2024-03-01', '2024-04-01']
+    restored = Ledger.from_dict(data)
+    assert restored == ledger
+    assert restored.realized('FIFO') == pytest.approx(500)
+    assert restored.cost_basis('평균') == pytest.approx(1125)
+
+    # 거래 수가 맞으면 저장된 누적 상태를 그대로 씀 (다시 계산하지 않음)
+    shortcut = dict(data, **{'상태': dict(data['상태'], **{'FIFO 실현 손익': 999.0})})
+    assert Ledger.from_dict(shortcut).realized('FIFO') == 999.0
+    # 거래 수가 다르거나 상태가 없으면 처음부터 다시 계산
+    stale = dict(data, **{'상태': dict(data['상태'], **{'거래 수': 3, 'FIFO 실현 손익': 999.0})})
+    assert Ledger.from_dict(stale).realized('FIFO') == pytest.approx(500)
+    assert Ledger.from_dict({key: value for key, value in data.items() if key != '상태'}).cost_basis('FIFO') == \
+        pytest.approx(1500)
+
+    # 복원한 원장에 거래를 더해도 로트 상태가 이어짐
+    restored.add('매도', '2024-05-01', 15, 100)
+    assert restored.realized('FIFO') == pytest.approx(500)
+    assert restored.shares == 0
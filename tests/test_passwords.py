@@ -0,0 +1,73 @@
+import hashlib
+
+import pytest
+
+import passwords
+from passwords import LegacySHA256Hasher, PasswordHasher, PasswordVerifier, ScryptHasher, verify_password
+from user_store import SimpleUserManager
+
+# 테스트는 낮은 비용으로 계산
+FAST = ScryptHasher(cost=4)
+
+
+def test_scrypt_hash_and_verify():
+    stored = FAST.hash('secret')
+    assert stored.startswith('scrypt$16$8$1$')
+    assert FAST.hash('secret') != stored
+    assert verify_password('secret', stored) and not verify_password('wrong', stored)
+    assert not verify_password('secret', 'scrypt$broken')
+    assert not FAST.needs_rehash(stored)
+
+
+def test_legacy_sha256_is_verified_and_rehashed():
+    stored = hashlib.sha256(b'secret').hexdigest()
+    assert LegacySHA256Hasher().identify(stored)
+    verifier = PasswordVerifier(FAST)
+    assert verifier.verify('admin', 'wrong', stored) == (False, None)
+    verified, new_hash = verifier.verify('admin', 'secret', stored)
+    assert verified and new_hash.startswith('scrypt$16$')
+    assert verify_password('secret', new_hash)
+
+
+def test_cost_change_triggers_rehash():
+    old = ScryptHasher(cost=3).hash('secret')
+    assert FAST.needs_rehash(old)
+    verified, new_hash = PasswordVerifier(FAST).verify('admin', 'secret', old)
+    assert verified and new_hash.split('$')[1] == '16'
+    assert PasswordVerifier(FAST).verify('admin', 'secret', new_hash) == (True, None)
+
+
+def test_verified_cache_skips_hashing_until_expiry(monkeypatch):
+    calls = []
+    monkeypatch.setattr(passwords, 'verify_password', lambda *args: calls.append(args) or verify_password(*args))
+    now = [0.0]
+    verifier = PasswordVerifier(FAST, ttl=300, clock=lambda: now[0])
+    stored = FAST.hash('secret')
+    assert verifier.verify('admin', 'secret', stored) == (True, None)
+    assert verifier.verify('admin', 'secret', stored) == (True, None)
+    assert len(calls) == 1
+    assert verifier.verify('admin', 'wrong', stored) == (False, None)
+    now[0] = 301
+    assert verifier.verify('admin', 'secret', stored) == (True, None)
+    assert len(calls) == 3
+
+
+def test_login_replaces_legacy_hash_in_store(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    manager = SimpleUserManager(hasher=FAST)
+    manager.users['admin']['password'] = hashlib.sha256(b'admin').hexdigest()
+    manager.save_config()
+    assert manager.verify_user('admin', 'admin')
+    assert SimpleUserManager(hasher=FAST).users['admin']['password'].startswith('scrypt$16$')
+    assert not manager.verify_user('admin', 'wrong')
+
+
+def test_hasher_must_implement_interface():
+    class HashOnly(PasswordHasher):
+        def hash(self, password):
+            return password
+
+    with pytest.raises(TypeError):
+        PasswordHasher()
+    with pytest.raises(TypeError):
+        HashOnly()
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from portfolio import Portfolio
+from stock_schema import MONTHS
+
+
+def random_stocks(count, seed=0):
+    rng = np.random.default_rng(seed)
+    stocks = []
+    for i in range(count):
+        dividends = np.round(rng.uniform(0, 5, 12) * (rng.random(12) < 0.4), 2)
+        stocks.append({'종목명': f'T{i}', '보유 수량': float(rng.integers(1, 500)),
+                       '매수 단가': round(float(rng.uniform(1, 500)), 2), '현재 주가': round(float(rng.uniform(1, 500)), 2),
+                       '월별 배당금': dict(zip(MONTHS, dividends.tolist()))})
+    return stocks
+
+
+def legacy_derived(stock):
+    # 이전 app_simple.py가 종목을 추가할 때 딕셔너리에 저장하던 파생 값
+    total_investment = stock['보유 수량'] * stock['매수 단가']
+    current_value = stock['보유 수량'] * stock['현재 주가']
+    total_dividend = sum(stock['월별 배당금'].values())
+    actual_profit_loss = current_value + total_dividend - total_investment
+    profit_rate = (actual_profit_loss / total_investment * 100) if total_investment > 0 else 0
+    return dict(stock, **{'총 투자금': total_investment, '현재 평가금': current_value, '누적 배당금': total_dividend,
+                          '실제 손익': actual_profit_loss, '수익률 (%)': profit_rate})
+
+
+@pytest.mark.parametrize('count', [0, 1, 257])
+def test_totals_match_per_dict_math(count):
+    stocks = [legacy_derived(stock) for stock in random_stocks(count)]
+    portfolio = Portfolio.from_stocks(stocks)
+
+    total_investment = sum(stock['총 투자금'] for stock in stocks)
+    total_current_value = sum(stock['현재 평가금'] for stock in stocks)
+    total_dividend = sum(stock['누적 배당금'] for stock in stocks)
+    total_profit_loss = sum(stock['실제 손익'] for stock in stocks)
+    total_profit_rate = (total_profit_loss / total_investment * 100) if total_investment > 0 else 0
+    assert list(portfolio.totals().values()) == pytest.approx(
+        [total_investment, total_current_value, total_dividend, total_profit_loss, total_profit_rate])
+
+    frame = portfolio.frame()
+    for column in ['총 투자금', '현재 평가금', '누적 배당금', '실제 손익', '수익률 (%)']:
+        assert frame[column].tolist() == pytest.approx([stock[column] for stock in stocks])
+
+    invest_pct, value_pct = portfolio.weights()
+    assert invest_pct.tolist() == pytest.approx([stock['총 투자금'] / total_investment * 100 for stock in stocks])
+    assert value_pct.tolist() == pytest.approx([stock['현재 평가금'] / total_current_value * 100 for stock in stocks])
+    assert portfolio.monthly_totals().tolist() == pytest.approx(
+        [sum(stock['월별 배당금'][month] for stock in stocks) for month in MONTHS])
+
+
+def test_zero_investment_rate_is_zero():
+    portfolio = Portfolio.from_stocks([{'종목명': 'A', '보유 수량': 0.0, '매수 단가': 10.0, '현재 주가': 12.0,
+                                        '월별 배당금': {month: 0.0 for month in MONTHS}}])
+    assert portfolio.profit_rate.tolist() == [0.0]
+    assert portfolio.totals()['수익률 (%)'] == 0
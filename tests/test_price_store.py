@@ -0,0 +1,61 @@
+import os
+
+import numpy as np
+
+import price_store
+from passwords import ScryptHasher
+from price_store import PriceStore, refresh_all_prices
+from user_store import SimpleUserManager
+
+
+def test_ingest_dedups_and_overwrites(tmp_path):
+    store = PriceStore(str(tmp_path))
+    store.ingest(['o', 'O ', 'MSFT'], ['2024-01-02', '2024-01-02', '2024-01-03'], [10.0, 11.0, 300.0])
+    # 한 번에 넣은 같은 티커/날짜는 마지막 값, 다시 넣으면 새 값으로 바뀜
+    assert len(store) == 2 and store.tickers == ['MSFT', 'O']
+    store.ingest(['O', 'O'], ['2024-01-02', '2024-01-05'], [12.0, 13.0])
+    assert len(store) == 3 and store.version == 2
+    days, closes = store.history('o')
+    assert days.astype(str).tolist() == ['2024-01-02', '2024-01-05']
+    assert closes.tolist() == [12.0, 13.0]
+    # 다른 인스턴스(프로세스)도 같은 버전을 봄
+    assert PriceStore(str(tmp_path)).latest(['O']).tolist() == [13.0]
+
+
+def test_latest_as_of(tmp_path):
+    store = PriceStore(str(tmp_path))
+    store.ingest(['O', 'O', 'MSFT'], ['2024-01-02', '2024-01-10', '2024-01-05'], [10.0, 11.0, 300.0])
+    prices = store.latest(['O', 'msft', 'NONE', 'O'], as_of='2024-01-05')
+    np.testing.assert_array_equal(prices, [10.0, 300.0, np.nan, 10.0])
+    # 첫 시세보다 이른 기준일은 (앞 티커의 시세를 쓰지 않고) NaN
+    assert np.isnan(store.latest(['MSFT', 'O'], as_of='2024-01-01')).all()
+    assert store.latest(['O']).tolist() == [11.0]
+    assert np.isnan(PriceStore(str(tmp_path / 'empty')).latest(['O'])).all()
+
+
+def test_old_versions_removed_and_locked_files_ignored(tmp_path, monkeypatch):
+    store = PriceStore(str(tmp_path))
+    for day in range(1, 4):
+        store.ingest(['O'], [f'2024-01-0{day}'], [float(day)])
+    assert sorted(os.listdir(tmp_path)) == ['close-2.npy', 'close-3.npy', 'keys-2.npy', 'keys-3.npy', 'manifest.json',
+                                            'manifest.json.lock', 'tickers-2.json', 'tickers-3.json']
+
+    def locked(path):
+        raise PermissionError(path)
+    monkeypatch.setattr(price_store.os, 'remove', locked)
+    store.ingest(['O'], ['2024-01-04'], [4.0])
+    assert store.latest(['O']).tolist() == [4.0]
+
+
+def test_refresh_all_prices(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    manager = SimpleUserManager(hasher=ScryptHasher(cost=4))
+    manager.save_user_stocks('admin', [
+        {'종목명': 'o', '보유 수량': 1.0, '매수 단가': 10.0, '현재 주가': 10.0},
+        {'종목명': 'NONE', '보유 수량': 1.0, '매수 단가': 10.0, '현재 주가': 10.0}])
+    store = PriceStore(str(tmp_path / 'prices'))
+    store.ingest(['O'], ['2024-01-02'], [12.5])
+    assert refresh_all_prices(manager, store) == 1
+    assert [stock['현재 주가'] for stock in manager.get_user_stocks('admin')] == [12.5, 10.0]
+    # 바뀐 값이 없으면 0
+    assert refresh_all_prices(manager, store) == 0
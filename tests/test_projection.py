@@ -0,0 +1,20 @@
+import numpy as np
+import pytest
+
+from projection import BLOCK_ELEMENTS, DRIP_MAX_BLOCKS, max_scenarios, project_income, scenario_choices
+
+
+def test_drip_scenarios_capped_by_block_budget():
+    assert max_scenarios(200, 30, True) == DRIP_MAX_BLOCKS * BLOCK_ELEMENTS // (200 * 360)
+    assert max_scenarios(200, 30, False) == 10000
+    assert scenario_choices(10, 10, True) == [1000, 5000, 10000]
+    assert scenario_choices(50, 30, True) == [1000]
+    assert scenario_choices(200, 30, True) == [600]
+
+
+def test_project_income_rejects_too_many_drip_scenarios():
+    quantity, price, monthly_dps = np.ones(200), np.full(200, 100.0), np.full((200, 12), 0.5)
+    with pytest.raises(ValueError):
+        project_income(quantity, price, monthly_dps, years=30, drip=True, scenarios=1000, price_volatility=0.2)
+    result = project_income(quantity, price, monthly_dps, years=30, drip=False, scenarios=1000, price_volatility=0.2)
+    assert result.scenarios == 1000
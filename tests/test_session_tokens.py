@@ -0,0 +1,96 @@
+import os
+
+import pytest
+
+import session_tokens
+from session_tokens import QUERY_PARAM, SessionTokens, restore_session
+from sharded_store import ShardedUserManager
+from sqlite_store import SQLiteUserManager
+from user_store import SimpleUserManager
+
+
+class Clock:
+    def __init__(self, now=1_700_000_000):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_verify_rejects_tampered_and_expired_tokens():
+    clock = Clock()
+    tokens = SessionTokens([('k1', b'secret')], ttl=3600, clock=clock)
+    token = tokens.issue('admin', '관리자', 3)
+    claims = tokens.verify(token)
+    assert (claims['u'], claims['n'], claims['g'], claims['kid']) == ('admin', '관리자', 3, 'k1')
+    key_id, payload, signature = token.split('.')
+    assert tokens.verify(f"{key_id}.{payload}.{signature[::-1]}") is None
+    assert SessionTokens([('k1', b'other')], clock=clock).verify(token) is None
+    assert tokens.verify('not-a-token') is None
+    clock.now += 3600
+    assert tokens.verify(token) is None
+
+
+def test_key_rotation_keeps_old_tokens_until_dropped():
+    clock = Clock()
+    old = SessionTokens([('k1', b'one')], ttl=3600, clock=clock)
+    token = old.issue('admin', '관리자')
+    rotated = SessionTokens([('k2', b'two'), ('k1', b'one')], ttl=3600, clock=clock)
+    claims = rotated.verify(token)
+    assert claims is not None and rotated.needs_refresh(claims)
+    assert not rotated.needs_refresh(rotated.verify(rotated.issue('admin', '관리자')))
+    assert SessionTokens([('k3', b'three'), ('k2', b'two')], clock=clock).verify(token) is None
+
+
+def test_needs_refresh_after_half_ttl():
+    clock = Clock()
+    tokens = SessionTokens([('k1', b'secret')], ttl=3600, clock=clock)
+    token = tokens.issue('admin', '관리자')
+    clock.now += 1799
+    assert not tokens.needs_refresh(tokens.verify(token))
+    clock.now += 2
+    assert tokens.needs_refresh(tokens.verify(token))
+
+
+@pytest.fixture(params=['json', 'sharded', 'sqlite'])
+def user_manager(request, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    if request.param == 'sharded':
+        return ShardedUserManager()
+    if request.param == 'sqlite':
+        return SQLiteUserManager()
+    return SimpleUserManager()
+
+
+def test_logout_generation_invalidates_issued_tokens(user_manager, monkeypatch):
+    tokens = SessionTokens([('k1', b'secret')])
+    query = {}
+    monkeypatch.setattr(session_tokens.st, 'query_params', query)
+    assert user_manager.get_session_generation('admin') == 0
+    assert user_manager.get_session_generation('nobody') is None
+
+    query[QUERY_PARAM] = tokens.issue('admin', '관리자', user_manager.get_session_generation('admin'))
+    assert restore_session(tokens, user_manager.get_session_generation)['u'] == 'admin'
+    copied = query[QUERY_PARAM]
+
+    assert user_manager.bump_session_generation('admin')
+    assert user_manager.get_session_generation('admin') == 1
+    query[QUERY_PARAM] = copied
+    assert restore_session(tokens, user_manager.get_session_generation) is None
+    assert QUERY_PARAM not in query
+
+    query[QUERY_PARAM] = tokens.issue('admin', '관리자', 1)
+    assert restore_session(tokens, user_manager.get_session_generation) is not None
+    assert not user_manager.bump_session_generation('nobody')
+
+
+def test_json_logout_writes_only_sidecar(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    manager = SimpleUserManager()
+    before = os.stat('users.json').st_mtime_ns
+    snapshots = len(manager.backup_store._load_catalog())
+    assert manager.bump_session_generation('admin')
+    assert os.stat('users.json').st_mtime_ns == before
+    assert len(manager.backup_store._load_catalog()) == snapshots
+    # 다른 프로세스(인스턴스)도 올라간 세대를 봄
+    assert SimpleUserManager().get_session_generation('admin') == 1
@@ -0,0 +1,77 @@
+import json
+import os
+
+import numpy as np
+
+from passwords import ScryptHasher
+from sharded_store import MIGRATED_MARKER, ShardedUserManager, migrate_from_json
+from stock_schema import MONTHS
+
+FAST = ScryptHasher(cost=4)
+
+
+def make_stock(name, price=100.0):
+    return {'종목명': name, '보유 수량': 10.0, '매수 단가': 90.0, '현재 주가': price,
+            '월별 배당금': {month: 1.0 if month == '3월' else 0.0 for month in MONTHS}}
+
+
+def write_legacy(path, count):
+    users = {f'user{i}': {'name': f'사용자{i}', 'email': '', 'password': FAST.hash('pw'),
+                          'stocks': [dict(make_stock(f'T{i}'), **{'총 투자금': 900.0})]} for i in range(count)}
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(users, file, ensure_ascii=False)
+
+
+def test_round_trip(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    manager = ShardedUserManager(hasher=FAST)
+    assert manager.list_usernames() == ['admin']
+    assert manager.register_user('김철수', '철수', 'a@example.com', 'pw') == (True, "등록이 완료되었습니다.")
+    assert manager.register_user('김철수', '철수', 'a@example.com', 'pw')[0] is False
+    assert manager.save_user_stocks('김철수', [make_stock('O')])
+
+    reopened = ShardedUserManager(hasher=FAST)
+    assert sorted(reopened.list_usernames()) == ['admin', '김철수']
+    assert reopened.verify_user('김철수', 'pw') and not reopened.verify_user('김철수', 'wrong')
+    assert reopened.get_user_name('김철수') == '철수'
+    assert reopened.get_user_stocks('김철수') == [make_stock('O')]
+    assert reopened.get_user_stocks('nobody') == []
+
+
+def test_migration_from_json_keeps_input_fields(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    write_legacy('users.json', 3)
+    manager = ShardedUserManager(hasher=FAST)
+    assert sorted(manager.list_usernames()) == ['user0', 'user1', 'user2']
+    assert manager.get_user_stocks('user1') == [make_stock('T1')]
+    assert manager.verify_user('user2', 'pw')
+    assert os.path.exists(os.path.join('users', MIGRATED_MARKER))
+
+
+def test_interrupted_migration_resumes(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    write_legacy('users.json', 3)
+    # 중간에 중단된 이전: user0만 옮겨졌고 완료 표시가 없음 (옮겨진 파일은 그 뒤 바뀌었을 수 있음)
+    os.makedirs('users')
+    with open(os.path.join('users', 'user0.json'), 'w', encoding='utf-8') as file:
+        json.dump({'name': '바뀐 이름', 'email': '', 'password': FAST.hash('pw'), 'stocks': []}, file)
+    manager = ShardedUserManager(hasher=FAST)
+    assert sorted(manager.list_usernames()) == ['user0', 'user1', 'user2']
+    assert manager.get_user_name('user0') == '바뀐 이름'
+    # 이미 옮긴 사용자는 다시 쓰지 않고, 완료 표시 뒤에는 관리자를 새로 만들어도 다시 옮기지 않음
+    assert migrate_from_json('users.json', 'users') == 0
+    os.remove(os.path.join('users', 'user2.json'))
+    assert sorted(ShardedUserManager(hasher=FAST).list_usernames()) == ['user0', 'user1']
+
+
+def test_update_current_prices_counts_only_saved_users(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    write_legacy('users.json', 3)
+    manager = ShardedUserManager(hasher=FAST)
+    save_user = manager._save_user
+    monkeypatch.setattr(manager, '_save_user',
+                        lambda username, record, create=False: username != 'user1' and save_user(username, record))
+    prices = {'T0': 110.0, 'T1': 120.0, 'T2': np.nan}
+    assert manager.update_current_prices(lambda names: np.array([prices[name] for name in names])) == 1
+    assert manager.get_user_stocks('user0')[0]['현재 주가'] == 110.0
+    assert manager.get_user_stocks('user1')[0]['현재 주가'] == 100.0
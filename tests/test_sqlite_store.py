@@ -0,0 +1,75 @@
+import json
+import threading
+
+import numpy as np
+
+from passwords import ScryptHasher
+from sqlite_store import SQLiteUserManager, get_connection_lock
+from stock_schema import MONTHS
+
+FAST = ScryptHasher(cost=4)
+
+
+def make_stock(name, price=100.0, **optional):
+    stock = {'종목명': name, '보유 수량': 10.0, '매수 단가': 90.0, '현재 주가': price,
+             '월별 배당금': {month: 1.5 if month == '3월' else 0.0 for month in MONTHS}}
+    stock.update(optional)
+    return stock
+
+
+def test_round_trip_keeps_optional_fields(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    manager = SQLiteUserManager(hasher=FAST)
+    assert manager.list_usernames() == ['admin']
+    assert manager.register_user('kim', '철수', 'a@example.com', 'pw')[0]
+    assert manager.register_user('kim', '철수', 'a@example.com', 'pw') == (False, "이미 존재하는 사용자명입니다.")
+    stocks = [make_stock('O'), make_stock('삼성전자', 70000.0, **{'통화': 'KRW', '매수일': '2024-01-02'}),
+              make_stock('T', 20.0, **{'배당 일정': {'주당 배당금': 0.25, '주기': '분기', '배당락일': '2024-03-15',
+                                                 '지급일 간격': 30}})]
+    assert manager.save_user_stocks('kim', stocks)
+    assert not manager.save_user_stocks('nobody', stocks)
+
+    reopened = SQLiteUserManager(hasher=FAST)
+    assert reopened.get_user_stocks('kim') == stocks
+    assert reopened.get_user_name('kim') == '철수'
+    assert reopened.verify_user('kim', 'pw') and not reopened.verify_user('kim', 'wrong')
+    totals = reopened.get_portfolio_totals('kim')
+    assert totals['총 투자금'] == 2700.0 and totals['누적 배당금'] == 4.5
+
+
+def test_migration_from_json(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    users = {'user0': {'name': '사용자', 'email': '', 'password': FAST.hash('pw'), 'created_at': '2024-01-01 00:00:00',
+                       'stocks': [dict(make_stock('O'), **{'총 투자금': 900.0})]}}
+    with open('users.json', 'w', encoding='utf-8') as file:
+        json.dump(users, file, ensure_ascii=False)
+    manager = SQLiteUserManager(hasher=FAST)
+    assert manager.list_usernames() == ['user0']
+    assert manager.get_user_stocks('user0') == [make_stock('O')]
+    assert manager.verify_user('user0', 'pw')
+
+
+def test_update_current_prices_and_backup(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    manager = SQLiteUserManager(hasher=FAST)
+    manager.save_user_stocks('admin', [make_stock('O'), make_stock('T')])
+    prices = {'O': 105.0, 'T': np.nan}
+    assert manager.update_current_prices(lambda names: np.array([prices[name] for name in names])) == 1
+    assert [stock['현재 주가'] for stock in manager.get_user_stocks('admin')] == [105.0, 100.0]
+    assert manager.backup()
+    assert (tmp_path / 'backup' / 'yieldnote_latest.db').exists()
+
+
+def test_managers_on_one_connection_share_lock(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    first, second = SQLiteUserManager(hasher=FAST), SQLiteUserManager(hasher=FAST)
+    assert first._lock is second._lock is get_connection_lock('./yieldnote.db')
+    # 쓰기 트랜잭션 중에는 다른 스레드의 읽기가 잠금을 기다림
+    results = []
+    with first._lock:
+        reader = threading.Thread(target=lambda: results.append(second.list_usernames()))
+        reader.start()
+        reader.join(0.2)
+        assert reader.is_alive() and not results
+    reader.join()
+    assert results == [['admin']]
@@ -0,0 +1,31 @@
+from portfolio import Portfolio
+from stock_schema import MONTHS
+from view_model import TABLE_CACHE_SIZE, PortfolioView
+
+
+def make_view():
+    stocks = [{'종목명': 'AAA', '보유 수량': 10.0, '매수 단가': 90.0, '현재 주가': 100.0,
+               '월별 배당금': {month: 1.0 for month in MONTHS}},
+              {'종목명': 'BBB', '보유 수량': 5.0, '매수 단가': 200.0, '현재 주가': 150.0,
+               '월별 배당금': {month: 0.0 for month in MONTHS}}]
+    return PortfolioView(Portfolio.from_stocks(stocks), 1300.0)
+
+
+def test_money_columns_use_explicit_currency():
+    view = make_view()
+    table = view.detail_table()
+    assert list(table['총 투자금 (USD)']) == ['$900.00', '$1,000.00']
+    assert list(table['총 투자금 (KRW)']) == ['₩1,170,000', '₩1,300,000']
+    assert list(view.detail_table("KRW만 표시")['총 투자금']) == ['₩1,170,000', '₩1,300,000']
+    assert list(view.profit_table()['종목명']) == ['AAA', 'BBB']
+
+
+def test_table_cache_is_bounded():
+    view = make_view()
+    first = view.summary_table()
+    assert view.summary_table() is first
+    for growth in range(TABLE_CACHE_SIZE + 5):
+        view.projection_frame('2025-01', 'USD', years=2, price_growth=growth / 100)
+    assert len(view._tables) == TABLE_CACHE_SIZE
+    # 오래 쓰지 않은 표는 버리고 다시 만듦
+    assert view.summary_table() is not first
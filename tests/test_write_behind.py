@@ -0,0 +1,103 @@
+import threading
+import time
+
+from write_behind import WriteBehindQueue
+
+
+class FakeManager:
+    def __init__(self, succeed=True):
+        self.succeed = succeed
+        self.saved = {}
+        self.calls = 0
+
+    def save_user_stocks(self, username, stocks):
+        self.calls += 1
+        if self.succeed:
+            self.saved[username] = stocks
+        return self.succeed
+
+    def get_user_stocks(self, username):
+        return self.saved.get(username, [])
+
+
+def test_coalesces_and_flushes():
+    manager = FakeManager()
+    queue = WriteBehindQueue(manager, idle_seconds=60)
+    queue.save_user_stocks('kim', [{'종목명': 'A'}])
+    queue.save_user_stocks('kim', [{'종목명': 'B'}])
+    assert queue.get_user_stocks('kim') == [{'종목명': 'B'}]
+    assert queue.flush('kim')
+    assert manager.calls == 1 and manager.saved['kim'] == [{'종목명': 'B'}]
+    queue.close()
+
+
+def test_failed_save_is_retried_then_abandoned():
+    manager = FakeManager(succeed=False)
+    queue = WriteBehindQueue(manager, idle_seconds=0.005, max_retries=3)
+    queue.save_user_stocks('kim', [{'종목명': 'A'}])
+    deadline = time.monotonic() + 5
+    while queue.has_pending('kim') and time.monotonic() < deadline:
+        time.sleep(0.01)
+    # 처음 한 번 + 재시도 3번 뒤에는 더 시도하지 않음
+    assert not queue.has_pending('kim')
+    assert manager.calls == 4
+    assert queue.metrics()['abandoned'] == 1
+    # 버린 요청은 다음 flush에서 한 번 실패로 알림
+    assert not queue.flush('kim')
+    assert queue.flush('kim')
+    queue.close()
+
+
+def test_flush_failure_keeps_request_for_retry():
+    manager = FakeManager(succeed=False)
+    queue = WriteBehindQueue(manager, idle_seconds=60)
+    queue.save_user_stocks('kim', [{'종목명': 'A'}])
+    assert not queue.flush('kim')
+    assert queue.has_pending('kim')
+    manager.succeed = True
+    queue.save_user_stocks('kim', [{'종목명': 'B'}])
+    assert queue.flush('kim') and manager.saved['kim'] == [{'종목명': 'B'}]
+    queue.close()
+
+
+def test_max_delay_flushes_during_continuous_edits():
+    manager = FakeManager()
+    queue = WriteBehindQueue(manager, idle_seconds=0.2, max_delay=0.3)
+    start = time.monotonic()
+    # idle_seconds보다 짧은 간격으로 계속 저장 요청
+    while 'kim' not in manager.saved and time.monotonic() - start < 3:
+        queue.save_user_stocks('kim', [{'종목명': 'A'}])
+        time.sleep(0.02)
+    assert manager.saved['kim'] == [{'종목명': 'A'}]
+    assert time.monotonic() - start < 1
+    queue.close()
+
+
+class BlockingManager(FakeManager):
+    def __init__(self, succeed):
+        super().__init__(succeed)
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def save_user_stocks(self, username, stocks):
+        self.started.set()
+        self.release.wait(5)
+        return super().save_user_stocks(username, stocks)
+
+
+def test_pending_visible_until_save_finishes():
+    manager = BlockingManager(succeed=False)
+    queue = WriteBehindQueue(manager, idle_seconds=60)
+    queue.save_user_stocks('kim', [{'종목명': 'A'}])
+    flusher = threading.Thread(target=queue.flush, args=('kim',))
+    flusher.start()
+    assert manager.started.wait(5)
+    # 저장 중에도 대기 중인 내용이 보임
+    assert queue.get_user_stocks('kim') == [{'종목명': 'A'}]
+    assert queue.has_pending('kim')
+    manager.release.set()
+    flusher.join(5)
+    # 실패하면 다시 대기열로
+    assert queue.get_user_stocks('kim') == [{'종목명': 'A'}]
+    assert queue.has_pending('kim')
+    queue.close()
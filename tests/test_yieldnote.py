@@ -0,0 +1,54 @@
+import json
+
+import pytest
+
+import yieldnote
+from passwords import ScryptHasher
+from stock_schema import MONTHS
+from user_store import SimpleUserManager
+
+
+def make_stock(name, quantity, purchase_price, current_price, dividend):
+    return {'종목명': name, '보유 수량': quantity, '매수 단가': purchase_price, '현재 주가': current_price,
+            '월별 배당금': {month: dividend if month == '3월' else 0.0 for month in MONTHS}}
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for name in ('YIELDNOTE_STORAGE', 'YIELDNOTE_FX_SOURCE', 'YIELDNOTE_PRICE_STORE'):
+        monkeypatch.delenv(name, raising=False)
+    manager = SimpleUserManager(hasher=ScryptHasher(cost=4))
+    manager.save_user_stocks('admin', [make_stock('AAA', 10.0, 90.0, 100.0, 5.0),
+                                       make_stock('BBB', 5.0, 200.0, 150.0, 0.0)])
+    return tmp_path
+
+
+def test_summary(workdir, capsys):
+    assert yieldnote.main(['--krw-rate', '1300', 'summary', 'admin']) == 0
+    out = capsys.readouterr().out
+    assert 'admin: 종목 2개' in out
+    assert '$1,900.00' in out and '₩2,470,000' in out
+    assert '$-145.00' in out and '-7.63%' in out
+    assert yieldnote.main(['summary', 'nobody']) == 1
+
+
+def test_export(workdir):
+    assert yieldnote.main(['--krw-rate', '1300', 'export', 'admin', '-o', 'admin.json', '--currency', 'KRW']) == 0
+    with open(workdir / 'admin.json', encoding='utf-8') as file:
+        rows = json.load(file)
+    assert [row['종목명'] for row in rows] == ['AAA', 'BBB']
+    assert rows[0]['총 투자금 (KRW)'] == pytest.approx(1_170_000)
+    assert rows[1]['실제 손익 (KRW)'] == pytest.approx(-325_000)
+
+
+def test_revalue_with_prices(workdir, capsys):
+    (workdir / 'prices.csv').write_text('date,ticker,close\n2024-01-02,aaa,120\n2024-02-01,AAA,130\n',
+                                        encoding='utf-8')
+    assert yieldnote.main(['revalue', '--prices', 'prices.csv', '--as-of', '2024-01-31', '-o', 'report.csv']) == 0
+    assert '현재 주가 1건을 갱신했습니다.' in capsys.readouterr().out
+    stocks = SimpleUserManager(hasher=ScryptHasher(cost=4)).get_user_stocks('admin')
+    assert [stock['현재 주가'] for stock in stocks] == [120.0, 150.0]
+    report = (workdir / 'report.csv').read_text(encoding='utf-8-sig').splitlines()
+    assert report[0] == '사용자,종목 수,총 투자금,현재 평가금,누적 배당금,실제 손익,수익률 (%)'
+    assert report[1].startswith('admin,2,1900.0,1950.0,5.0,55.0,')
@@ -0,0 +1,294 @@
+import os
+import json
+import threading
+from datetime import datetime
+from backup_store import BackupStore
+from atomic_io import atomic_write_json, file_lock
+from passwords import PasswordVerifier
+from session_store import SessionGenerations, sidecar_path
+from stock_schema import compact_stocks, has_derived_fields
+
+# 사용자 정보 저장소 (Streamlit 없이 앱, CLI, 일괄 작업에서 함께 사용)
+
+class SimpleUserManager:
+    def __init__(self, config_path='./users.json', hasher=None):
+        self.config_path = config_path
+        # 비밀번호 해싱/검증 (기본 scrypt, 이전 SHA-256 해시는 로그인 시 교체)
+        self.passwords = PasswordVerifier(hasher)
+        # 여러 세션이 하나의 인스턴스를 공유하므로 변경 작업은 잠금으로 보호
+        self._lock = threading.RLock()
+        # 백업 저장소 준비 (기본 설정 생성 시 백업이 바로 만들어지므로 먼저 생성)
+        self.backup_store = BackupStore('backup')
+        # 로그아웃마다 바뀌는 세션 세대는 사용자 정보와 분리된 작은 파일에 보관
+        self.sessions = SessionGenerations(sidecar_path(config_path))
+        # 설정 파일이 없는 경우 기본 설정으로 생성
+        if not os.path.exists(config_path):
+            self._create_default_config()
+        self.users = self._load_config()
+        self._file_signature = self._stat_signature()
+        # 파생 값까지 저장된 이전 형식이면 한 번만 입력 값만 남기도록 변환
+        if any(has_derived_fields(user.get('stocks', [])) for user in self.users.values()):
+            self.migrate_compact_schema()
+        
+    def migrate_compact_schema(self):
+        """모든 사용자의 종목에서 파생 값(총 투자금, 손익 등)을 제거하고 저장합니다."""
+        with self._lock:
+            for user in self.users.values():
+                user['stocks'] = compact_stocks(user.get('stocks', []))
+            return self.save_config(usernames=list(self.users))
+    
+    def _stat_signature(self):
+        """설정 파일의 변경 여부를 판단하기 위한 (inode, 수정 시각, 크기) 값을 반환합니다."""
+        try:
+            stat = os.stat(self.config_path)
+        except OSError:
+            return None
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    
+    def reload_if_changed(self):
+        """파일이 외부에서 변경된 경우에만 다시 읽어들입니다. (변경 없으면 stat 한 번으로 끝)"""
+        signature = self._stat_signature()
+        if signature is not None and signature == self._file_signature:
+            return False
+        with self._lock:
+            self.users = self._load_config()
+            self._file_signature = self._stat_signature()
+        return True
+    
+    def _create_default_config(self):
+        # 기본 설정 파일 생성 (admin/admin 계정)
+        default_config = {
+            "admin": {
+                "name": "관리자",
+                "password": self._hash_password("admin"),
+                "email": "admin@example.com",
+                "stocks": []
+            }
+        }
+        
+        atomic_write_json(self.config_path, default_config)
+        
+        # 처음 생성할 때 백업도 함께 만들기
+        self._backup_config(default_config)
+    
+    def _load_config(self):
+        try:
+            # 설정 파일 로드 시도
+            with open(self.config_path, 'r', encoding='utf-8') as file:
+                return json.load(file)
+        except (json.JSONDecodeError, FileNotFoundError) as e:
+            # 파일이 손상되었거나 없는 경우 백업에서 복원 시도
+            return self._restore_from_backup()
+    
+    def _backup_config(self, users=None, changed=None):
+        """현재 사용자 정보를 백업합니다. (changed의 사용자 레코드만 새로 해시, None이면 전체)"""
+        try:
+            self.backup_store.snapshot(users if users is not None else self.users, changed=changed)
+            return True
+        except Exception as e:
+            print(f"백업 중 오류 발생: {e}")
+            return False
+    
+    def backup(self):
+        """현재 사용자 정보의 스냅샷을 만듭니다. (수동 백업)"""
+        return self._backup_config()
+    
+    def _write_restored(self, data):
+        # 복원한 데이터를 현재 설정 파일에 기록
+        atomic_write_json(self.config_path, data)
+        return data
+    
+    def _restore_from_backup(self):
+        """백업에서 사용자 정보를 복원합니다."""
+        # 먼저 스냅샷 백업 저장소에서 최신 스냅샷 시도
+        data = self.backup_store.restore()
+        if data is not None:
+            return self._write_restored(data)
+        
+        # 이전 방식(users_*.json 전체 복사본) 백업이 남아 있으면 최신 파일부터 시도
+        latest_backup_path = 'backup/users_latest.json'
+        if os.path.exists(latest_backup_path):
+            try:
+                with open(latest_backup_path, 'r', encoding='utf-8') as file:
+                    return self._write_restored(json.load(file))
+            except:
+                pass
+        
+        # 최신 백업 실패 시 다른 백업 파일들을 시간 역순으로 시도
+        backup_dir = 'backup'
+        if os.path.exists(backup_dir):
+            backup_files = [f for f in os.listdir(backup_dir) if f.startswith('users_') and f.endswith('.json')]
+            # 날짜순으로 정렬 (최신이 먼저)
+            backup_files.sort(reverse=True)
+            
+            for backup_file in backup_files:
+                try:
+                    backup_path = os.path.join(backup_dir, backup_file)
+                    with open(backup_path, 'r', encoding='utf-8') as file:
+                        return self._write_restored(json.load(file))
+                except:
+                    continue
+        
+        # 모든 복원 시도 실패 시 새로운 기본 설정 생성
+        self._create_default_config()
+        with open(self.config_path, 'r', encoding='utf-8') as file:
+            return json.load(file)
+    
+    def restore_point_in_time(self, at):
+        """at 시점의 스냅샷으로 전체 사용자 정보를 되돌립니다."""
+        data = self.backup_store.restore(at)
+        if data is None:
+            return False
+        with self._lock:
+            self.users = data
+            return self.save_config()
+    
+    def save_config(self, usernames=None, created=()):
+        """설정 파일을 저장합니다.
+
+        usernames를 지정하면 그 사이 다른 프로세스가 파일을 바꾼 경우 디스크의 최신 내용에
+        해당 사용자 레코드만 반영하여 저장합니다. created의 사용자가 이미 디스크에 있으면
+        (다른 프로세스가 먼저 등록한 경우) 저장하지 않고 False를 반환합니다.
+        """
+        try:
+            changed = usernames
+            with self._lock, file_lock(self.config_path):
+                if usernames is not None and self._stat_signature() != self._file_signature:
+                    # 다른 프로세스가 저장한 최신 내용에 내 변경만 병합
+                    try:
+                        with open(self.config_path, 'r', encoding='utf-8') as file:
+                            disk_users = json.load(file)
+                    except (json.JSONDecodeError, FileNotFoundError):
+                        disk_users = None
+                    if disk_users is not None:
+                        conflicts = [username for username in created if username in disk_users]
+                        for username in usernames:
+                            if username not in conflicts:
+                                disk_users[username] = self.users[username]
+                        self.users = disk_users
+                        # 다른 프로세스의 변경도 함께 들어왔으므로 백업은 전체를 다시 해시
+                        changed = None
+                        if conflicts:
+                            self._file_signature = self._stat_signature()
+                            return False
+                atomic_write_json(self.config_path, self.users)
+                # 자신이 쓴 변경은 다시 읽지 않도록 시그니처 갱신
+                self._file_signature = self._stat_signature()
+            # 저장 성공 시 백업 생성
+            self._backup_config(changed=changed)
+            return True
+        except Exception as e:
+            print(f"설정 저장 중 오류 발생: {e}")
+            return False
+    
+    def _hash_password(self, password):
+        # 비밀번호 해싱 (솔트를 넣은 scrypt 등 설정된 해셔 사용)
+        return self.passwords.hash(password)
+    
+    def register_user(self, username, name, email, password):
+        # 사용자 등록
+        with self._lock:
+            if username in self.users:
+                return False, "이미 존재하는 사용자명입니다."
+            
+            record = {
+                'name': name,
+                'email': email,
+                'password': self._hash_password(password),
+                'stocks': [],
+                'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            }
+            self.users[username] = record
+            
+            # 저장 및 백업
+            success = self.save_config(usernames=[username], created=[username])
+            if not success and self.users.get(username) is not record:
+                # 다른 프로세스가 같은 사용자명을 먼저 등록함
+                return False, "이미 존재하는 사용자명입니다."
+        if not success:
+            return False, "사용자 등록 중 오류가 발생했습니다. 다시 시도해주세요."
+            
+        return True, "등록이 완료되었습니다."
+    
+    def verify_user(self, username, password):
+        # 사용자 인증
+        if username not in self.users:
+            return False
+        
+        verified, new_hash = self.passwords.verify(username, password, self.users[username]['password'])
+        if new_hash is not None:
+            # 이전 형식(SHA-256) 또는 이전 비용의 해시는 로그인에 성공한 김에 새 해시로 교체
+            with self._lock:
+                if username in self.users:
+                    self.users[username]['password'] = new_hash
+                    self.save_config(usernames=[username])
+        return verified
+    
+    def list_usernames(self):
+        return list(self.users)
+    
+    def get_user_name(self, username):
+        # 사용자 이름 가져오기
+        if username in self.users:
+            return self.users[username]['name']
+        return None
+    
+    def get_session_generation(self, username):
+        # 세션 토큰 복원 시 조회 (다른 프로세스의 로그아웃도 보이도록 파일 변경 확인 후 조회, 없는 사용자는 None)
+        self.reload_if_changed()
+        return self.sessions.get(username) if username in self.users else None
+    
+    def bump_session_generation(self, username):
+        # 로그아웃 시 세션 세대를 올려 그 전에 발급한 세션 토큰을 무효로 만듦 (세대 파일만 다시 씀)
+        self.reload_if_changed()
+        if username not in self.users:
+            return False
+        self.sessions.bump(username)
+        return True
+    
+    def save_user_stocks(self, username, stocks):
+        # 사용자의 주식 정보 저장
+        with self._lock:
+            if username in self.users:
+                # 입력 값만 새 딕셔너리로 보관 (세션 쪽 리스트와 공유 데이터가 섞이지 않음)
+                self.users[username]['stocks'] = compact_stocks(stocks)
+                self.users[username]['last_updated'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                success = self.save_config(usernames=[username])
+                return success
+        return False
+    
+    def update_current_prices(self, price_lookup):
+        """모든 사용자 종목의 현재 주가를 price_lookup(종목명 목록 -> 주가 배열, NaN은 유지)으로 갱신합니다.
+
+        전체 종목을 한 번에 조회하고, 바뀐 사용자만 한 번의 파일 저장으로 반영합니다. (바뀐 종목 수 반환)
+        """
+        with self._lock:
+            owned = [(username, stock) for username, user in self.users.items() for stock in user.get('stocks', [])]
+            prices = price_lookup([stock['종목명'] for _, stock in owned])
+            changed_users, changed = set(), 0
+            for (username, stock), price in zip(owned, prices.tolist()):
+                if price == price and price != stock['현재 주가']:
+                    stock['현재 주가'] = price
+                    changed_users.add(username)
+                    changed += 1
+            if changed_users and not self.save_config(usernames=sorted(changed_users)):
+                return 0
+            return changed
+    
+    def get_user_stocks(self, username):
+        # 사용자의 주식 정보 조회 (공유 인스턴스이므로 세션별 복사본 반환)
+        if username in self.users:
+            return compact_stocks(self.users[username].get('stocks', []))
+        return []
+
+def make_user_manager(storage, config_path='./users.json'):
+    """저장 방식(json/sharded/sqlite)에 맞는 사용자 관리자를 새로 만듭니다. (앱 밖의 일괄 작업에서 사용)"""
+    if storage == 'sharded':
+        # 사용자별 파일 저장소 (users.json이 있으면 처음 한 번 자동 이전)
+        from sharded_store import ShardedUserManager
+        return ShardedUserManager(legacy_path=config_path)
+    if storage == 'sqlite':
+        # SQLite 저장소 (DB가 비어 있으면 users.json에서 처음 한 번 자동 이전)
+        from sqlite_store import SQLiteUserManager
+        return SQLiteUserManager(legacy_path=config_path)
+    return SimpleUserManager(config_path)
\ No newline at end of file
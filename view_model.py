@@ -0,0 +1,304 @@
+import numpy as np
+import pandas as pd
+
+from currency import CrossRates, format_money
+from portfolio import MONTHS, MONEY_COLUMNS
+from projection import portfolio_projection_inputs, project_income
+from render_cache import RenderCache
+
+# 기본 표시 통화 (기준 통화, 보조 통화)
+DEFAULT_CURRENCIES = ('USD', 'KRW')
+
+# 통화 표시 방식 (기본 표시 통화 기준)
+CURRENCY_VIEWS = ["모두 표시", "USD만 표시", "KRW만 표시"]
+
+# 대시보드 표 열 이름 -> 포트폴리오 금액 열
+DASHBOARD_COLUMNS = {'투자금': '총 투자금', '평가금': '현재 평가금', '배당금': '누적 배당금', '수익/손실': '실제 손익'}
+
+# 뷰 하나가 보관하는 표 수 (예측 가정을 바꿀 때마다 키가 늘어나므로 오래 쓰지 않은 표부터 버림)
+TABLE_CACHE_SIZE = 32
+
+
+# 표시용 비율 문자열 변환
+def format_pct(values):
+    return [f"{value:,.2f}%" for value in values]
+
+def format_weight(values):
+    return [f"{value:.2f}%" for value in values]
+
+
+def currency_views(currencies=DEFAULT_CURRENCIES):
+    """표시 통화에 맞는 통화 표시 방식 목록"""
+    return ["모두 표시"] + [f"{code}만 표시" for code in currencies]
+
+
+def view_currencies(currency_view, currencies=DEFAULT_CURRENCIES):
+    """통화 표시 방식에서 실제로 표시할 통화 목록"""
+    for code in currencies:
+        if currency_view == f"{code}만 표시":
+            return [code]
+    return list(currencies)
+
+
+class PortfolioView:
+    """포트폴리오와 환율로 화면에 표시할 값을 계산해 두는 뷰 모델
+
+    종목 통화 기준 금액 열을 하나의 행렬로 모아 두고, 표시 통화마다 교차 환율 행렬에서 고른
+    종목별 환산 계수를 한 번 곱해 그 통화의 열을 만듭니다. 통화별 환산 결과와 문자열 변환은
+    처음 필요할 때 한 번만 하므로 통화 표시 방식이나 보조 통화를 바꿔도 다시 계산하지 않습니다.
+
+    - rates: CrossRates (숫자를 주면 달러-원 환율로 보고 나머지 통화는 기본 환율 사용)
+    - totals: 단일 통화 포트폴리오의 합계 (총 투자금, 총 평가금, 총 배당금, 총 손익, 총 수익률),
+      없으면 포트폴리오에서 계산
+    - trade_rates: 표시 통화 -> 종목별 매수일 환산 계수(없는 종목은 NaN)를 돌려주는 함수.
+      주면 매수 단가와 투자금은 매수일 환율로, 평가금과 배당금은 현재 환율로 환산합니다.
+    """
+
+    def __init__(self, portfolio, rates, totals=None, trade_rates=None):
+        if not isinstance(rates, CrossRates):
+            rates = CrossRates({'KRW': rates})
+        self.portfolio = portfolio
+        self.rates = rates
+        self.totals = totals
+        self.trade_rates = trade_rates
+        self.names = np.array(portfolio.names, dtype=object)
+
+        # 종목 통화 기준 금액 행렬 (종목 수 × 금액 열)
+        self.native = np.column_stack([
+            portfolio.purchase_price, portfolio.current_price, portfolio.total_investment,
+            portfolio.current_value, portfolio.total_dividend, portfolio.profit_loss
+        ]) if len(portfolio) else np.zeros((0, len(MONEY_COLUMNS)))
+        self.values = {'종목명': self.names, '통화': np.array(portfolio.currencies, dtype=object),
+                       '보유 수량': portfolio.quantity, '수익률 (%)': portfolio.profit_rate}
+
+        self._blocks = {}
+        self._strings = {}
+        self._tables = RenderCache(maxsize=TABLE_CACHE_SIZE)
+
+    def block(self, currency):
+        """currency로 환산한 종목별 금액 행렬, 합계, 월별 배당금 합계 (처음 요청할 때 한 번 계산)"""
+        block = self._blocks.get(currency)
+        if block is not None:
+            return block
+
+        portfolio = self.portfolio
+        factors = self.rates.factors(portfolio.currency_codes, currency)
+        money = self.native * factors[:, None]
+        trade = self.trade_rates(currency) if self.trade_rates is not None and len(portfolio) else None
+        if trade is not None:
+            # 매수 단가/투자금은 매수일 환율 (매수일 환율이 없으면 현재 환율), 손익은 이 통화 기준으로 다시 계산
+            trade = np.where(np.isnan(trade), factors, trade)
+            money[:, [0, 2]] = self.native[:, [0, 2]] * trade[:, None]
+            money[:, 5] = money[:, 3] + money[:, 4] - money[:, 2]
+
+        single = portfolio.single_currency
+        if single is not None and trade is None:
+            # 단일 통화: 합계를 한 번 환산 (SQL 집계 합계도 그대로 사용)
+            totals = self.totals if self.totals is not None else tuple(portfolio.totals().values())
+            rate = self.rates.rate(single, currency)
+            amounts = np.array(totals[:4], dtype=float) * rate
+            profit_rate = totals[4]
+            monthly_sums = portfolio.monthly_totals() * rate
+        else:
+            investment, current_value, dividend = money[:, 2].sum(), money[:, 3].sum(), money[:, 4].sum()
+            profit_loss = current_value + dividend - investment
+            amounts = np.array([investment, current_value, dividend, profit_loss])
+            profit_rate = (profit_loss / investment * 100) if investment > 0 else 0
+            monthly_sums = (portfolio.dividends * factors[:, None]).sum(axis=0)
+
+        block = self._blocks[currency] = {'money': money, 'totals': amounts, 'profit_rate': profit_rate,
+                                          'monthly_sums': monthly_sums}
+        return block
+
+    def weights(self, currency):
+        """currency 기준 투자금/평가금 비중(%)"""
+        money = self.block(currency)['money']
+        total_investment = money[:, 2].sum()
+        total_value = money[:, 3].sum()
+        count = len(money)
+        invest_pct = money[:, 2] / total_investment * 100 if total_investment > 0 else np.zeros(count)
+        value_pct = money[:, 3] / total_value * 100 if total_value > 0 else np.zeros(count)
+        return invest_pct, value_pct
+
+    def _column(self, column, currency=None):
+        # 열 문자열 변환 (처음 요청할 때 한 번만), currency를 주면 그 통화로 환산한 금액 열
+        strings = self._strings.get((column, currency))
+        if strings is None:
+            if currency is None:
+                values = self.values[column]
+                strings = format_pct(values) if column == '수익률 (%)' else values
+            else:
+                strings = format_money(self.block(currency)['money'][:, MONEY_COLUMNS.index(column)], currency)
+            strings = np.array(strings, dtype=object) if not isinstance(strings, np.ndarray) else strings
+            self._strings[(column, currency)] = strings
+        return strings
+
+    def _table(self, key, build):
+        return self._tables.get_or_build(key, build)
+
+    def summary_table(self, currency_view="모두 표시", detail=False, currencies=DEFAULT_CURRENCIES):
+        """포트폴리오 합계 표 (상세 정보 탭은 한 통화만 표시할 때 '금액' 열 하나로 표시)"""
+        def build():
+            labels = ['총 투자금', '총 평가금', '총 누적 배당금' if detail else '총 배당금', '총 손익', '총 수익률']
+            shown = view_currencies(currency_view, currencies) if detail else currencies
+            data = {'항목': labels}
+            for code in shown:
+                block = self.block(code)
+                column = code if len(shown) > 1 else '금액'
+                data[column] = format_money(block['totals'], code) + [f"{block['profit_rate']:,.2f}%"]
+            return pd.DataFrame(data)
+        key = ('summary', currency_view if detail else None, detail, currencies)
+        return self._table(key, build)
+
+    def profit_table(self, currency_view="모두 표시", currencies=DEFAULT_CURRENCIES):
+        """종목별 수익률 비교 표 (종목 통화 기준 수익률 내림차순)"""
+        def build():
+            order = np.argsort(-self.portfolio.profit_rate, kind='stable')
+            data = {'종목명': self._column('종목명')[order]}
+            for label, column in DASHBOARD_COLUMNS.items():
+                for code in view_currencies(currency_view, currencies):
+                    data[f'{label} ({code})'] = self._column(column, code)[order]
+            data['수익률'] = self._column('수익률 (%)')[order]
+            return pd.DataFrame(data, index=order)
+        return self._table(('profit', currency_view, currencies), build)
+
+    def composition_table(self, currency_view="모두 표시", currencies=DEFAULT_CURRENCIES):
+        """포트폴리오 구성 비중 표 (기준 통화 투자 비중 내림차순)"""
+        def build():
+            invest_pct, value_pct = self.weights(currencies[0])
+            order = np.argsort(-invest_pct, kind='stable')
+            data = {'종목명': self._column('종목명')[order]}
+            for label, column, weight, pct in (('투자금', '총 투자금', '투자 비중', invest_pct),
+                                               ('평가금', '현재 평가금', '평가 비중', value_pct)):
+                for code in view_currencies(currency_view, currencies):
+                    data[f'{label} ({code})'] = self._column(column, code)[order]
+                data[weight] = format_weight(pct[order])
+            return pd.DataFrame(data, index=order)
+        return self._table(('composition', currency_view, currencies), build)
+
+    def dividend_months(self, currencies=DEFAULT_CURRENCIES):
+        """배당금이 있는 월의 인덱스 배열"""
+        return np.flatnonzero(self.block(currencies[0])['monthly_sums'] > 0)
+
+    def monthly_table(self, currency_view="모두 표시", currencies=DEFAULT_CURRENCIES):
+        """월별 배당금 합계 표 (배당금이 있는 월만, 없으면 None)"""
+        months = self.dividend_months(currencies)
+        if not len(months):
+            return None
+
+        def build():
+            data = {'월': [MONTHS[i] for i in months]}
+            for code in view_currencies(currency_view, currencies):
+                data[f'배당금 ({code})'] = format_money(self.block(code)['monthly_sums'][months], code)
+            return pd.DataFrame(data, index=months)
+        return self._table(('monthly', currency_view, currencies), build)
+
+    def monthly_summary(self, currencies=DEFAULT_CURRENCIES):
+        """월별 배당금 요약 문구 (기준 통화, 괄호 안은 보조 통화)"""
+        primary, secondary = currencies
+        rate = self.rates.rate(primary, secondary)
+
+        def money(amount, code):
+            return format_money([amount], code)[0]
+
+        monthly_sums = self.block(primary)['monthly_sums']
+        max_month = MONTHS[int(monthly_sums.argmax())]
+        max_amount = monthly_sums.max()
+        annual_dividend = monthly_sums.sum()
+        return [
+            f"**배당금 요약:**",
+            f"- 연간 총 배당금: **{money(annual_dividend, primary)}** ({money(annual_dividend * rate, secondary)})",
+            f"- 배당금이 가장 많은 달: **{max_month}** "
+            f"({money(max_amount, primary)} / {money(max_amount * rate, secondary)})",
+            f"- 월 평균 배당금: **{money(annual_dividend/12, primary)}** "
+            f"({money((annual_dividend/12) * rate, secondary)})"
+        ]
+
+    def detail_table(self, currency_view="모두 표시", currencies=DEFAULT_CURRENCIES):
+        """종목별 손익 현황 표 (한 통화만 표시할 때는 열 이름에서 통화 표시를 뺌)"""
+        def build():
+            data = {'종목명': self._column('종목명')}
+            if self.portfolio.single_currency != 'USD':
+                # USD가 아닌 종목이 있으면 종목 통화 표시
+                data['통화'] = self._column('통화')
+            data['보유 수량'] = self._column('보유 수량')
+            single_view = len(view_currencies(currency_view, currencies)) == 1
+            for column in MONEY_COLUMNS:
+                for code in view_currencies(currency_view, currencies):
+                    data[column if single_view else f'{column} ({code})'] = self._column(column, code)
+            data['수익률 (%)'] = self._column('수익률 (%)')
+            return pd.DataFrame(data)
+        return self._table(('detail', currency_view, currencies), build)
+
+    def schedule_income_table(self, today, years=3, currencies=DEFAULT_CURRENCIES):
+        """배당 일정 기준 연도별(최근 years년 + 내년)/최근 12개월 배당 수입 표 (배당 일정이 없으면 None)"""
+        if not any(self.portfolio.schedules):
+            return None
+
+        def build():
+            first, last = today.year - years + 1, today.year + 1
+            # 1월 지급분은 전년도 12월 배당락일이므로 한 해 앞부터 펼침
+            calendar = self.portfolio.dividend_calendar(f'{first - 1}-01-01', f'{last + 1}-01-01')
+            data = {'기간': [f'{year}년' + (' (예정)' if year > today.year else '') for year in range(first, last + 1)]
+                    + ['최근 12개월']}
+            for code in currencies:
+                # 종목 통화 금액을 표시 통화로 환산하도록 보유 수량에 환산 계수를 곱해서 조회
+                shares = self.portfolio.quantity * self.rates.factors(self.portfolio.currency_codes, code)
+                values = calendar.yearly_income(shares, first, last).tolist() + [calendar.trailing_income(shares, today)]
+                data[f'배당 수입 ({code})'] = format_money(values, code)
+            return pd.DataFrame(data)
+        return self._table(('schedule', today, years, currencies), build)
+
+    def projection(self, start_month, currency, **assumptions):
+        """start_month('YYYY-MM')부터의 배당 수입 예측 (project_income 참고)
+
+        시나리오별 월 수입 배열은 크므로 보관하지 않고, 화면에는 projection_frame의 요약만 보관합니다.
+        """
+        quantity, price, monthly_dps = portfolio_projection_inputs(self.portfolio, self.rates, currency,
+                                                                   int(start_month[:4]))
+        return project_income(quantity, price, monthly_dps, start_month=start_month, **assumptions)
+
+    def projection_frame(self, start_month, currency, **assumptions):
+        """연차별 예상 배당 수입/연말 평가금 DataFrame (몬테카를로면 하위 10%/중앙값/상위 10%)"""
+        def build():
+            result = self.projection(start_month, currency, **assumptions)
+            index = pd.Index([f'{year}년차' for year in range(1, result.years + 1)], name='연차')
+            if result.scenarios > 1:
+                low, mid, high = result.percentiles()
+                return pd.DataFrame({'배당 수입 하위 10%': low, '배당 수입 중앙값': mid, '배당 수입 상위 10%': high,
+                                     '연말 평가금 중앙값': np.median(result.value, axis=0)}, index=index)
+            return pd.DataFrame({'배당 수입': result.yearly_income()[0], '연말 평가금': result.value[0]}, index=index)
+        return self._table(('projection_frame', start_month, currency, tuple(sorted(assumptions.items()))), build)
+
+    def projection_table(self, start_month, currency, **assumptions):
+        """projection_frame의 금액을 통화 형식 문자열로 바꾼 표"""
+        def build():
+            frame = self.projection_frame(start_month, currency, **assumptions)
+            return pd.DataFrame({f'{column} ({currency})': format_money(frame[column], currency)
+                                 for column in frame.columns}, index=frame.index)
+        return self._table(('projection_table', start_month, currency, tuple(sorted(assumptions.items()))), build)
+
+    def stock_dividends(self, i, currency_view="모두 표시", currencies=DEFAULT_CURRENCIES):
+        """i번째 종목의 월별 배당금 표와 요약 문구 (배당금이 없으면 표는 None)"""
+        def build():
+            name = self.names[i]
+            amounts = self.portfolio.dividends[i]
+            months = np.flatnonzero(amounts > 0)
+            if not len(months):
+                return None, [f"{name}의 배당금 데이터가 없습니다."]
+
+            shown = view_currencies(currency_view, currencies)
+            data = {'월': [MONTHS[m] for m in months]}
+            for code in shown:
+                factor = self.rates.factors(self.portfolio.currency_codes[i], code)
+                data[f'배당금 ({code})'] = format_money(amounts[months] * factor, code)
+
+            totals = [format_money([self.block(code)['money'][i, 4]], code)[0] for code in shown]
+            total_investment = self.portfolio.total_investment[i]
+            dividend_yield = (self.portfolio.total_dividend[i] / total_investment * 100) if total_investment > 0 else 0
+            if len(totals) == 1:
+                dividend_line = f"- 연간 총 배당금: **{totals[0]}**"
+            else:
+                dividend_line = f"- 연간 총 배당금: **{totals[0]}** ({totals[1]})"
+            return pd.DataFrame(data), [dividend_line, f"- 배당 수익률: **{dividend_yield:,.2f}%** (배당금 ÷ 투자금)"]
+        return self._table(('stock', i, currency_view, currencies), build)
\ No newline at end of file
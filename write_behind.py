@@ -0,0 +1,171 @@
+import copy
+import time
+import atexit
+import threading
+from collections import deque
+
+# 저장에 실패한 요청을 다시 시도하는 최대 횟수 (넘으면 버리고 실패로 기록)
+MAX_RETRIES = 5
+
+
+class WriteBehindQueue:
+    """종목 저장 요청을 사용자별로 모아 두었다가 백그라운드에서 한 번에 저장하는 큐
+
+    같은 사용자의 저장 요청이 idle_seconds 동안 더 들어오지 않으면 마지막 요청 하나만
+    실제 저장소(user_manager)에 기록합니다. 계속 편집하더라도 첫 요청 후 max_delay가 지나면
+    저장합니다. 저장이 끝날 때까지는 대기 중인 내용을 get_user_stocks()로 계속 보여 주고,
+    실패하면 다시 대기열에 넣습니다. 로그아웃 시에는 flush()로 즉시 저장하고,
+    프로세스 종료 시에도 남은 요청을 모두 저장합니다. 저장에 실패한 요청은 간격을 두 배씩 늘리며
+    max_retries번까지 다시 시도하고, 그래도 실패하면 버린 뒤 다음 flush(username)에서 False로 알립니다.
+    """
+
+    def __init__(self, user_manager, idle_seconds=2.0, max_retries=MAX_RETRIES, max_delay=10.0):
+        self.user_manager = user_manager
+        self.idle_seconds = idle_seconds
+        self.max_retries = max_retries
+        self.max_delay = max_delay
+        # username -> [stocks, 저장할 수 있는 시각 기준(마지막 요청 시각), 실패 횟수, 첫 요청 시각]
+        self._pending = {}
+        # 저장 중인 요청 (저장이 끝날 때까지 get_user_stocks가 이 내용을 반환)
+        self._saving = {}
+        # 재시도를 모두 실패해 버린 사용자 (flush로 알릴 때까지 보관)
+        self._abandoned = set()
+        self._condition = threading.Condition()
+        # 같은 사용자의 저장이 동시에 두 번 실행되지 않도록 보호
+        self._flush_lock = threading.Lock()
+        self._closed = False
+        self._enqueued = 0
+        self._flushed = 0
+        self._failed = 0
+        self._flush_times = deque(maxlen=1000)
+        self._thread = threading.Thread(target=self._run, name='write-behind', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def save_user_stocks(self, username, stocks):
+        """저장 요청을 큐에 넣고 True를 반환합니다. 실제 저장은 백그라운드에서 이뤄집니다.
+
+        큐가 닫힌 뒤에는 바로 저장하고 저장 결과를 반환합니다.
+        """
+        with self._condition:
+            if self._closed:
+                return self.user_manager.save_user_stocks(username, stocks)
+            now = time.monotonic()
+            # 계속 편집 중이어도 첫 요청 시각은 유지 (max_delay 기준)
+            first = self._pending[username][3] if username in self._pending else now
+            self._pending[username] = [copy.deepcopy(stocks), now, 0, first]
+            self._abandoned.discard(username)
+            self._enqueued += 1
+            self._condition.notify()
+        return True
+
+    def get_user_stocks(self, username):
+        # 아직 저장되지 않은 요청이 있으면 그 내용을 우선 반환
+        with self._condition:
+            pending = self._pending.get(username) or self._saving.get(username)
+            if pending is not None:
+                return copy.deepcopy(pending[0])
+        return self.user_manager.get_user_stocks(username)
+
+    def has_pending(self, username=None):
+        # 저장 중인 요청도 아직 저장소에 반영되지 않았으므로 포함
+        with self._condition:
+            if username is None:
+                return bool(self._pending or self._saving)
+            return username in self._pending or username in self._saving
+
+    def flush(self, username=None):
+        """대기 중인 요청을 즉시 저장합니다. (username 지정 시 해당 사용자만)
+
+        저장에 실패했거나, 그 전에 재시도를 모두 실패해 버린 요청이 있었으면 False를 반환합니다.
+        """
+        with self._condition:
+            if username is None:
+                usernames = list(self._pending)
+                abandoned = bool(self._abandoned)
+                self._abandoned.clear()
+            else:
+                usernames = [username] if username in self._pending else []
+                abandoned = username in self._abandoned
+                self._abandoned.discard(username)
+        return all([self._flush_user(name) for name in usernames]) and not abandoned
+
+    def _flush_user(self, username):
+        with self._flush_lock:
+            with self._condition:
+                pending = self._pending.pop(username, None)
+                if pending is None:
+                    return True
+                self._saving[username] = pending
+            start = time.perf_counter()
+            try:
+                success = self.user_manager.save_user_stocks(username, pending[0])
+            except Exception as e:
+                print(f"종목 저장 중 오류 발생: {e}")
+                success = False
+            elapsed = time.perf_counter() - start
+            with self._condition:
+                del self._saving[username]
+                if success:
+                    self._flushed += 1
+                    self._flush_times.append(elapsed)
+                else:
+                    self._failed += 1
+                    attempts = pending[2] + 1
+                    # 그 사이 새 요청이 들어왔으면 새 요청만 저장하고, 없으면 간격을 두 배씩 늘려 다시 시도
+                    if username not in self._pending and attempts <= self.max_retries:
+                        delay = self.idle_seconds * (2 ** attempts - 1)
+                        retry_at = time.monotonic() + delay
+                        self._pending[username] = [pending[0], retry_at, attempts, retry_at]
+                    elif username not in self._pending:
+                        print(f"종목 저장을 {attempts}번 실패해 요청을 버립니다: {username}")
+                        self._abandoned.add(username)
+            return success
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._closed:
+                    now = time.monotonic()
+                    due = [name for name, pending in self._pending.items() if self._due_at(pending) <= now]
+                    if due:
+                        break
+                    if self._pending:
+                        next_due = min(self._due_at(pending) for pending in self._pending.values())
+                        self._condition.wait(max(next_due - now, 0.01))
+                    else:
+                        self._condition.wait()
+                if self._closed:
+                    return
+            for username in due:
+                self._flush_user(username)
+
+    def _due_at(self, pending):
+        # 마지막 요청 후 idle_seconds 또는 첫 요청 후 max_delay 중 먼저 오는 시각
+        _, last, _, first = pending
+        return min(last + self.idle_seconds, first + self.max_delay)
+
+    def close(self):
+        """백그라운드 스레드를 멈추고 남은 요청을 모두 저장합니다."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join(timeout=5)
+        return self.flush()
+
+    def metrics(self):
+        """저장 지연 시간과 병합 비율 지표를 반환합니다."""
+        with self._condition:
+            flush_times = sorted(self._flush_times)
+            return {
+                'enqueued': self._enqueued,
+                'flushed': self._flushed,
+                'failed': self._failed,
+                'abandoned': len(self._abandoned),
+                'pending': len(self._pending) + len(self._saving),
+                # 저장 요청 수 ÷ 실제 저장 횟수 (클수록 많이 병합됨)
+                'coalescing_ratio': (self._enqueued / self._flushed) if self._flushed else 0.0,
+                'avg_flush_ms': (sum(flush_times) / len(flush_times) * 1000) if flush_times else 0.0,
+                'p95_flush_ms': (flush_times[int(len(flush_times) * 0.95)] * 1000) if flush_times else 0.0,
+                'max_flush_ms': (flush_times[-1] * 1000) if flush_times else 0.0
+            }
@@ -0,0 +1,136 @@
+import os
+import sys
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from currency import CURRENCIES, CrossRates, format_money
+from fx import make_provider, trade_date_rates
+from portfolio import MONEY_COLUMNS, Portfolio
+from user_store import make_user_manager
+from view_model import DEFAULT_CURRENCIES, PortfolioView, format_pct
+
+# 명령줄 도구: Streamlit 없이 사용자 포트폴리오 요약, 보고서 내보내기, 전체 사용자 일괄 재평가
+#   python yieldnote.py summary admin
+#   python yieldnote.py export admin -o admin.csv --currency KRW
+#   python yieldnote.py revalue --prices prices.csv -o report.csv
+
+# 전체 사용자 재평가 보고서의 합계 열
+TOTAL_COLUMNS = ['총 투자금', '현재 평가금', '누적 배당금', '실제 손익']
+
+
+def load_rates(usd_krw=None):
+    """(환율 제공자, 교차 환율) - YIELDNOTE_FX_SOURCE가 있으면 그 환율, 없으면 기본 환율"""
+    source = os.environ.get('YIELDNOTE_FX_SOURCE')
+    provider = make_provider(source) if source else None
+    return provider, CrossRates.from_provider(provider, usd_krw)
+
+
+def portfolio_view(stocks, provider, rates):
+    """저장된 종목 목록의 뷰 모델 (매수일이 있고 환율 데이터가 있으면 투자금은 매수일 환율로 환산)"""
+    portfolio = Portfolio.from_stocks(stocks)
+    trade_rates = None
+    if provider is not None and not np.isnat(portfolio.purchase_dates).all():
+        trade_rates = lambda target: trade_date_rates(provider, portfolio.currencies, portfolio.purchase_dates, target)
+    return PortfolioView(portfolio, rates, trade_rates=trade_rates)
+
+
+def holdings_report(view, currency):
+    """종목별 입력 값과 currency로 환산한 파생 값 DataFrame (숫자 그대로)"""
+    portfolio = view.portfolio
+    money = view.block(currency)['money']
+    data = {'종목명': portfolio.names, '통화': portfolio.currencies, '보유 수량': portfolio.quantity}
+    for i, column in enumerate(MONEY_COLUMNS):
+        data[f'{column} ({currency})'] = money[:, i]
+    data['수익률 (%)'] = portfolio.profit_rate
+    return pd.DataFrame(data)
+
+
+def revalue_report(user_manager, provider, rates, currency):
+    """모든 사용자의 종목 수와 currency 기준 합계 DataFrame"""
+    rows = []
+    for username in sorted(user_manager.list_usernames()):
+        view = portfolio_view(user_manager.get_user_stocks(username), provider, rates)
+        block = view.block(currency)
+        rows.append([username, len(view.portfolio), *block['totals'].tolist(), block['profit_rate']])
+    return pd.DataFrame(rows, columns=['사용자', '종목 수', *TOTAL_COLUMNS, '수익률 (%)'])
+
+
+def write_report(frame, path):
+    # 확장자로 형식 선택 (.json: 레코드 목록, 그 외: 엑셀에서 바로 열리는 UTF-8 CSV)
+    if path.endswith('.json'):
+        frame.to_json(path, orient='records', force_ascii=False, indent=2)
+    else:
+        frame.to_csv(path, index=False, encoding='utf-8-sig')
+
+
+def refresh_prices(user_manager, price_file, directory, as_of):
+    # 시세 파일을 시세 저장소에 넣고 모든 사용자의 현재 주가를 갱신 (시세 저장소를 쓸 때만 불러옴)
+    from price_store import PriceStore, load_price_file, refresh_all_prices
+    store = PriceStore(directory)
+    if price_file:
+        store.ingest(*load_price_file(price_file))
+    return refresh_all_prices(user_manager, store, as_of)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="배당 손익 계산 명령줄 도구 (Streamlit 없이 실행)")
+    parser.add_argument('--storage', default=os.environ.get('YIELDNOTE_STORAGE', 'json'),
+                        choices=['json', 'sharded', 'sqlite'], help="저장 방식 (기본: YIELDNOTE_STORAGE 또는 json)")
+    parser.add_argument('--config', default='./users.json', help="사용자 정보 파일 (기본: ./users.json)")
+    parser.add_argument('--krw-rate', type=float, help="달러-원 환율 (기본: 환율 데이터 또는 기본 환율)")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    summary_parser = subparsers.add_parser('summary', help="사용자 포트폴리오 합계 보기")
+    summary_parser.add_argument('username')
+    summary_parser.add_argument('--currency', action='append', choices=CURRENCIES,
+                                help="표시 통화 (여러 번 지정 가능, 기본: USD, KRW)")
+    export_parser = subparsers.add_parser('export', help="종목별 손익 보고서 내보내기 (.csv/.json)")
+    export_parser.add_argument('username')
+    export_parser.add_argument('-o', '--output', required=True, help="보고서 파일 경로")
+    export_parser.add_argument('--currency', default='USD', choices=CURRENCIES, help="환산 통화 (기본: USD)")
+    revalue_parser = subparsers.add_parser('revalue', help="모든 사용자 포트폴리오 재평가")
+    revalue_parser.add_argument('--prices', help="date,ticker,close 시세 CSV (시세 저장소에 넣은 뒤 현재 주가 갱신)")
+    revalue_parser.add_argument('--price-store', default=os.environ.get('YIELDNOTE_PRICE_STORE'),
+                                help="시세 저장소 디렉토리 (기본: YIELDNOTE_PRICE_STORE, --prices만 주면 ./prices)")
+    revalue_parser.add_argument('--as-of', help="이 날짜 이전(당일 포함) 최근 종가로 갱신 (YYYY-MM-DD)")
+    revalue_parser.add_argument('--currency', default='USD', choices=CURRENCIES, help="합계 통화 (기본: USD)")
+    revalue_parser.add_argument('-o', '--output', help="보고서 파일 경로 (.csv/.json, 없으면 화면에 표시)")
+    args = parser.parse_args(argv)
+
+    user_manager = make_user_manager(args.storage, args.config)
+    provider, rates = load_rates(args.krw_rate)
+
+    if args.command in ('summary', 'export'):
+        if args.username not in user_manager.list_usernames():
+            print(f"사용자를 찾을 수 없습니다: {args.username}")
+            return 1
+        view = portfolio_view(user_manager.get_user_stocks(args.username), provider, rates)
+        if args.command == 'summary':
+            currencies = tuple(args.currency) if args.currency else DEFAULT_CURRENCIES
+            print(f"{args.username}: 종목 {len(view.portfolio)}개")
+            print(view.summary_table(currencies=currencies).to_string(index=False))
+        else:
+            write_report(holdings_report(view, args.currency), args.output)
+            print(f"종목 {len(view.portfolio)}개의 보고서를 {args.output}에 저장했습니다.")
+        return 0
+
+    directory = args.price_store or ('./prices' if args.prices else None)
+    if directory:
+        changed = refresh_prices(user_manager, args.prices, directory, args.as_of)
+        print(f"현재 주가 {changed:,}건을 갱신했습니다.")
+    report = revalue_report(user_manager, provider, rates, args.currency)
+    if args.output:
+        write_report(report, args.output)
+        print(f"사용자 {len(report):,}명의 보고서를 {args.output}에 저장했습니다.")
+    else:
+        shown = report.copy()
+        for column in TOTAL_COLUMNS:
+            shown[column] = format_money(report[column], args.currency)
+        shown['수익률 (%)'] = format_pct(report['수익률 (%)'])
+        print(shown.to_string(index=False))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
\ No newline at end of file